@@ -1,3 +1,9 @@
+import os
+import sys
+
+# Make the shared src package (repo root) importable when run from frontend/API/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
 from utils import callAPI
 if __name__ == '__main__':
     print("Enter your name: ")
@@ -1,17 +1,48 @@
-import boto3
 import json
 
 from botocore.exceptions import ClientError
 
+from src.aws_clients import get_client
+from src.config import PARSER_MIN_CONFIDENCE
+from src.metrics import get_metrics
+from src.response_parser import format_recommendations, parse_recommendations
+from src.utils import (
+    local_fallback,
+    retrieve_and_generate_stream,
+    solve_local_schedule,
+    stream_recommendation_lines,
+)
+
+kb_id = "IIPMMYP0DR"
+
 # Calls the API connected to scheduling knowledge base
 # Parameter: student- contains the students name and previously taken courses
 def callAPI(student):
-    kb_id = "IIPMMYP0DR"
+    # Call to API
+    response = retrieveAndGenerate(buildPrompt(student), kb_id)
+    return response
 
-    # Prompt to input into LLM
+# Streams the recommendation one course line at a time as the model generates it
+# Falls back to the locally solved schedule when Bedrock returns nothing
+# Parameter: student- contains the students name and previously taken courses
+# Parameter: deadline- src.resilience.Deadline that sets the client timeout and closes the stream once it runs out
+def streamAPI(student, deadline=None):
+    with get_metrics().span("prompt"):
+        prompt = buildPrompt(student)
+    chunks = retrieve_and_generate_stream(prompt, kb_id, deadline=deadline)
+    shown = False
+    for line in stream_recommendation_lines(chunks, deadline=deadline):
+        shown = True
+        yield line
+    if not shown:
+        yield from local_fallback(solve_local_schedule(student)) or []
+
+# Prompt to input into LLM
+def buildPrompt(student):
     input_text = (f"I am currently planning my class schedule for the next semester. Here is a list of courses I have "
                   f"already completed. Use this to create a list of classes I should take next semester:\n\n"
-                  f"**Completed Courses: {student.get("completed_courses")}\n\n"
+                  f"**Completed Courses: {student.get('completed_courses')}\n\n"
+                  f"**Eligible Courses (prerequisites already checked): {', '.join(student.get('eligible_courses') or []) or 'None'}\n\n"
                   f"**Task:** Based on the courses I have already completed, "
                   f"create a class schedule for me. Please make sure to:\n"
                   f"1. Recommend only those courses for which I meet the prerequisites.\n"
@@ -22,10 +53,7 @@ def callAPI(student):
                   f"6. If a course has prerequisites, only recommend it if I have already completed the prerequisites.\n"
                   f"7. Include class times and dates"
                   )
-
-    # Call to API
-    response = retrieveAndGenerate(input_text, kb_id)
-    return response
+    return input_text
 
 def retrieveAndGenerate(input_text, kb_id):
     session_id = None
@@ -33,7 +61,7 @@ def retrieveAndGenerate(input_text, kb_id):
     region_id = "us-west-2"
 
     # Initialize AWS Bedrock Agent Runtime client
-    bedrock_agent_client = boto3.client("bedrock-agent-runtime", region_name=region_id)
+    bedrock_agent_client = get_client("bedrock-agent-runtime", region_id)
 
     request_payload = {
         "input": {"text": input_text},
@@ -61,7 +89,15 @@ def retrieveAndGenerate(input_text, kb_id):
 
 # Call to Llama 3.2 3B to help with output formatting
 def createList(response):
-    client = boto3.client("bedrock-runtime", region_name="us-west-2")
+    # Parse locally first; only fall back to the formatting model when unsure
+    try:
+        records, confidence = parse_recommendations(response or "")
+    except FileNotFoundError:
+        records, confidence = [], 0.0
+    if records and confidence >= PARSER_MIN_CONFIDENCE:
+        return "\n".join(format_recommendations(records))
+
+    client = get_client("bedrock-runtime", "us-west-2")
     model_id = "arn:aws:bedrock:us-west-2:363793501045:inference-profile/us.meta.llama3-2-1b-instruct-v1:0"
     prompt = f"Create a list from this data providing the class numbers and class times with each class's data on a separate line: {response}"
     formatted_prompt = f"""
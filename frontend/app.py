@@ -1,46 +1,125 @@
-from flask import Flask, render_template, request
+from flask import Flask, Response, jsonify, render_template, request, stream_with_context, url_for
 import os
+import sys
 import json
-from API.utils import callAPI
+
+# Make the shared src package (repo root) importable when run from frontend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from API.utils import streamAPI
+from src.catalog_index import get_catalog_index
+from src.config import SUBMISSIONS_DB_PATH
+from src.job_queue import JobQueue, QueueFullError
+from src.metrics import JOBS, get_metrics
+from src.submission_store import SubmissionStore
 
 app = Flask(__name__)
 data_file = "submitted_data.json"
 
-#Saving submitted data to a JSON File
+#Submissions are appended to a SQLite log so concurrent threads never overwrite each other
+#The log is multi-process safe, but jobs below are not: run a single process (see below)
+store = SubmissionStore(SUBMISSIONS_DB_PATH)
+#One-time import of submissions saved by the old JSON format
+store.migrate_json(os.path.join(os.path.dirname(os.path.abspath(__file__)), data_file))
+
+#Recommendations run on background workers so a slow model call never holds a web worker
+#Jobs live in this process, so serve with one process and several threads (gunicorn -w 1 --threads 8)
+jobs = JobQueue()
+
+#Saving submitted data
 def collect_data(name, courses):
-    if os.path.exists(data_file):
-        #Adds data if the file exists
-        with open(data_file, "r") as file:
-            allData = json.load(file)
-    else:
-        allData = {"Name":{}, "Classes": {} }
-
-    allData["Name"][name] = name
-    allData["Classes"][name] = courses
-
-    with open(data_file, "w") as file:
-        json.dump(allData, file, indent = 4)
+    with get_metrics().span("collect_data"):
+        store.add(name, courses)
+
+#Builds the student dictionary the API helpers expect
+def buildStudent(name, courses):
+    completed_courses = courses.split(",")
+    return {
+        "name": name,
+        "completed_courses": completed_courses,
+        "eligible_courses": get_catalog_index().eligible(completed_courses),
+    }
+
+#Runs on a job worker and yields the recommended course lines as they stream in
+#The job queue publishes each line for polling and stops the stream at the job's deadline
+def recommend(student, deadline=None):
+    with get_metrics().span("recommend"):
+        yield from streamAPI(student, deadline)
+
 @app.route("/", methods = ["GET", "POST"])
 def home():
     #Taking in the data necessary to get the AI response
     submitted_name = None
     submitted_courses = None
-    recommendation = None
+    eligible_courses = None
+    job_url = None
+    stream_url = None
+    error = None
+    status = 200
     if request.method == "POST":
         submitted_name = request.form.get("user_name")
         submitted_courses = request.form.get("user_classes")
         if submitted_name and submitted_courses:
             collect_data(submitted_name, submitted_courses)
-            student = {
-                "name": submitted_name,
-                "completed_courses": submitted_courses.split(","),
-            }
-            recommendation = callAPI(student)
-        
+            student = buildStudent(submitted_name, submitted_courses)
+            #Prerequisite eligibility is computed locally, not by the model
+            eligible_courses = student["eligible_courses"]
+            #The page reads this job's lines over Server-Sent Events, or polls it if SSE is unavailable
+            try:
+                job_id = jobs.submit(recommend, student)
+                job_url = url_for("job", job_id=job_id)
+                stream_url = url_for("stream", job_id=job_id)
+            except QueueFullError:
+                error = "AI Advisor is busy right now. Please try again in a moment."
+                status = 503
+
         return render_template("index.html", submitted_name=submitted_name,
-                               submitted_courses=submitted_courses, recommendation=recommendation)
+                               submitted_courses=submitted_courses, eligible_courses=eligible_courses,
+                               job_url=job_url, stream_url=stream_url, error=error), status
     return render_template("index.html", submitted_name=submitted_name,
-                           submitted_courses=submitted_courses, recommendation=recommendation)
+                           submitted_courses=submitted_courses)
+
+#Reports a recommendation job's status and the course lines received so far
+@app.route("/jobs/<job_id>")
+def job(job_id):
+    info = jobs.status(job_id)
+    if info is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+    return jsonify(info)
+
+#Streams a recommendation job's course lines over Server-Sent Events as the worker publishes them
+#The model runs on the job worker under its deadline; this only relays lines, then a final "done" event with the job status
+@app.route("/stream/<job_id>")
+def stream(job_id):
+    def events():
+        sent = 0
+        while True:
+            info = jobs.wait(job_id, sent, timeout=15)
+            if info is None:
+                yield f"event: done\ndata: {json.dumps({'status': 'expired'})}\n\n"
+                return
+            lines = info["result"] if isinstance(info["result"], list) else []
+            new_lines = lines[sent:]
+            for line in new_lines:
+                yield f"data: {json.dumps(line)}\n\n"
+            sent += len(new_lines)
+            if info["status"] not in ("queued", "running"):
+                yield f"event: done\ndata: {json.dumps({'status': info['status']})}\n\n"
+                return
+            if not new_lines:
+                #Keeps proxies from closing an idle connection while the model thinks
+                yield ": keep-alive\n\n"
+
+    return Response(stream_with_context(events()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+#Prometheus scrape endpoint: stage latencies, Bedrock and cache counters, job counts
+@app.route("/metrics")
+def metrics():
+    registry = get_metrics()
+    for state, count in jobs.stats().items():
+        registry.set_gauge(JOBS, count, state=state)
+    return Response(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
 
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,174 @@
+"""asyncio interface to the Bedrock recommendation pipeline.
+
+boto3 is blocking, so Bedrock calls (and the whole call_api pipeline) run
+on a dedicated thread pool while the event loop stays free. A single
+process can therefore keep many recommendation requests in flight, each
+with its own deadline.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from src.config import ASYNC_MAX_WORKERS, AWS_REGION, CALL_API_DEADLINE_SECONDS
+from src.resilience import Deadline
+from src.utils import call_api, create_list, retrieve_and_generate
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool that runs blocking Bedrock calls.
+
+    Returns:
+        Shared ThreadPoolExecutor sized by ASYNC_MAX_WORKERS
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=ASYNC_MAX_WORKERS, thread_name_prefix="bedrock"
+            )
+        return _executor
+
+
+async def _run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking function on the Bedrock executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+async def retrieve_and_generate_async(
+    input_text: str,
+    kb_id: str,
+    region: str = AWS_REGION,
+    timeout: Optional[float] = None,
+) -> Optional[str]:
+    """
+    Async variant of src.utils.retrieve_and_generate.
+
+    The timeout is also passed on as the call's deadline, so the client
+    timeout and retries fit in it and the executor thread is freed soon
+    after the awaiting coroutine gives up.
+
+    Args:
+        input_text: The prompt text for the knowledge base query
+        kb_id: Knowledge base ID
+        region: AWS region name
+        timeout: Seconds to wait before giving up (None waits indefinitely
+            with the default client timeouts)
+
+    Returns:
+        Generated text response or None on failure
+
+    Raises:
+        asyncio.TimeoutError: If the timeout expires
+    """
+    deadline = Deadline(timeout) if timeout is not None else None
+    return await asyncio.wait_for(
+        _run_blocking(
+            retrieve_and_generate, input_text, kb_id, region, deadline=deadline
+        ),
+        timeout,
+    )
+
+
+async def create_list_async(
+    response: str,
+    region: str = AWS_REGION,
+    timeout: Optional[float] = None,
+) -> Optional[List[str]]:
+    """
+    Async variant of src.utils.create_list.
+
+    The timeout is also passed on as the formatting model's deadline (see
+    retrieve_and_generate_async).
+
+    Args:
+        response: Raw text response from Bedrock
+        region: AWS region name
+        timeout: Seconds to wait before giving up (None waits indefinitely
+            with the default client timeouts)
+
+    Returns:
+        List of formatted class entries (one per line) or None on failure
+
+    Raises:
+        asyncio.TimeoutError: If the timeout expires
+        DeadlineExceeded: If the formatting model was needed but did not fit
+            in the timeout
+    """
+    deadline = Deadline(timeout) if timeout is not None else None
+    return await asyncio.wait_for(
+        _run_blocking(create_list, response, region, deadline=deadline), timeout
+    )
+
+
+async def call_api_async(
+    student: Dict[str, Any],
+    use_model: bool = True,
+    timeout: Optional[float] = None,
+) -> Optional[List[str]]:
+    """
+    Async variant of src.utils.call_api.
+
+    The whole call_api pipeline runs on the executor, with the timeout as
+    its deadline, so it shares the cache, fallback and deadline handling of
+    the blocking version. On timeout or cancellation the awaiting coroutine
+    stops immediately; the pipeline finishes in the background within its
+    deadline and its result is discarded.
+
+    Args:
+        student: Student dictionary (see src.utils.call_api)
+        use_model: Whether to call Bedrock or return the local schedule
+        timeout: Total seconds allowed for the whole pipeline (None uses
+            CALL_API_DEADLINE_SECONDS as the pipeline deadline and waits
+            for it)
+
+    Returns:
+        List of recommended classes with scheduling info, or None on failure
+
+    Raises:
+        asyncio.TimeoutError: If the timeout expires
+        asyncio.CancelledError: If the calling task is cancelled
+    """
+    deadline = CALL_API_DEADLINE_SECONDS if timeout is None else timeout
+    return await asyncio.wait_for(
+        _run_blocking(call_api, student, use_model, deadline), timeout
+    )
+
+
+async def call_api_many(
+    students: List[Dict[str, Any]],
+    timeout: Optional[float] = None,
+) -> List[Optional[List[str]]]:
+    """
+    Generate recommendations for several students concurrently.
+
+    A student whose request fails or times out gets None.
+
+    Args:
+        students: Student dictionaries
+        timeout: Per-student deadline in seconds
+
+    Returns:
+        Recommendations in the same order as ``students``
+    """
+    results = await asyncio.gather(
+        *(call_api_async(student, timeout=timeout) for student in students),
+        return_exceptions=True,
+    )
+    return [None if isinstance(r, BaseException) else r for r in results]
@@ -0,0 +1,195 @@
+"""Shared, long-lived boto3 clients for AI Advisor.
+
+Creating a boto3 client re-resolves credentials and endpoints and builds a
+fresh HTTP connection pool. This module keeps one client per
+(service, region) for the life of the process so every request reuses it.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional, Set, Tuple
+
+import boto3
+from botocore.config import Config
+
+from src.config import (
+    AWS_CONNECT_TIMEOUT,
+    AWS_MAX_POOL_CONNECTIONS,
+    AWS_READ_TIMEOUT,
+    AWS_REGION,
+    AWS_RETRY_MODE,
+    AWS_TCP_KEEPALIVE,
+    AWS_TIMEOUT_BUCKETS,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_session = None
+_clients: Dict[Tuple[str, str, Optional[float]], Any] = {}
+_stats: Dict[Tuple[str, str, Optional[float]], Dict[str, int]] = {}
+_installed: Set[Tuple[str, str]] = set()
+
+
+def client_config(**overrides: Any) -> Config:
+    """
+    Build the botocore Config shared by all pooled clients.
+
+    Args:
+        overrides: Config keyword arguments replacing the defaults
+
+    Returns:
+        botocore Config with pool size, keep-alive, timeouts and retry mode
+        applied
+    """
+    options = {
+        "max_pool_connections": AWS_MAX_POOL_CONNECTIONS,
+        "connect_timeout": AWS_CONNECT_TIMEOUT,
+        "read_timeout": AWS_READ_TIMEOUT,
+        "tcp_keepalive": AWS_TCP_KEEPALIVE,
+        "retries": {"mode": AWS_RETRY_MODE, "total_max_attempts": 1},
+    }
+    options.update(overrides)
+    return Config(**options)
+
+
+def timeout_bucket(budget: float) -> Optional[float]:
+    """
+    Pick the client timeout for a time budget.
+
+    Args:
+        budget: Seconds left for a call
+
+    Returns:
+        Largest AWS_TIMEOUT_BUCKETS value not above the budget, or None if
+        even the smallest does not fit
+    """
+    fitting = [bucket for bucket in AWS_TIMEOUT_BUCKETS if bucket <= budget]
+    return max(fitting) if fitting else None
+
+
+def get_client(
+    service: str,
+    region: str = AWS_REGION,
+    timeout: Optional[float] = None,
+) -> Any:
+    """
+    Get the shared client for a service and region, creating it once.
+
+    boto3 clients are thread-safe, so the returned client may be used from
+    any thread; only creation is serialized. Timeouts are fixed per client,
+    so each timeout (normally a timeout_bucket value) gets its own pooled
+    client.
+
+    Args:
+        service: boto3 service name (e.g. "bedrock-runtime")
+        region: AWS region name
+        timeout: Connect and read timeout in seconds, or None for the
+            AWS_CONNECT_TIMEOUT/AWS_READ_TIMEOUT defaults
+
+    Returns:
+        boto3 client
+    """
+    global _session
+
+    if (service, region) in _installed:
+        timeout = None
+    key = (service, region, timeout)
+    client = _clients.get(key)
+    if client is not None:
+        _count(key, "lookups")
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            if _session is None:
+                _session = boto3.session.Session()
+            overrides = (
+                {}
+                if timeout is None
+                else {
+                    "connect_timeout": min(AWS_CONNECT_TIMEOUT, timeout),
+                    "read_timeout": timeout,
+                }
+            )
+            client = _session.client(
+                service, region_name=region, config=client_config(**overrides)
+            )
+            client.meta.events.register("before-send", _make_call_counter(key))
+            with _stats_lock:
+                _stats[key] = {"created": 1, "lookups": 0, "api_calls": 0}
+            _clients[key] = client
+            logger.info("Created pooled %s client for %s", service, region)
+    _count(key, "lookups")
+
+    return client
+
+
+def set_client(service: str, client: Any, region: str = AWS_REGION) -> None:
+    """
+    Install a client for a service and region in place of a pooled one.
+
+    Used to run the pipeline against a botocore Stubber or a fake client
+    (see src.benchmark); it is returned for every timeout, and
+    reset_clients removes it again.
+
+    Args:
+        service: boto3 service name (e.g. "bedrock-runtime")
+        client: Client object to return from get_client
+        region: AWS region name
+    """
+    key = (service, region, None)
+    with _lock:
+        _clients[key] = client
+        with _stats_lock:
+            _stats[key] = {"created": 0, "lookups": 0, "api_calls": 0}
+        _installed.add((service, region))
+
+
+def _count(key: Tuple[str, str, Optional[float]], name: str) -> None:
+    """Increment one of a client's statistics."""
+    with _stats_lock:
+        counts = _stats.get(key)
+        if counts is not None:
+            counts[name] += 1
+
+
+def _make_call_counter(key: Tuple[str, str, Optional[float]]) -> Any:
+    """Build a botocore event handler counting HTTP sends for a client."""
+
+    def count_call(**kwargs: Any) -> None:
+        _count(key, "api_calls")
+
+    return count_call
+
+
+def client_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Report pool reuse per client.
+
+    Returns:
+        Dictionary keyed by "service@region" (with a "/<timeout>s" suffix for
+        clients with a custom timeout) with counts of clients created,
+        lookups served and HTTP requests sent. A high lookups-to-created ratio
+        means the pooled client (and its connections) is being reused.
+    """
+    with _lock, _stats_lock:
+        return {
+            f"{service}@{region}"
+            + (f"/{timeout:g}s" if timeout is not None else ""): dict(counts)
+            for (service, region, timeout), counts in _stats.items()
+        }
+
+
+def reset_clients() -> None:
+    """Drop all pooled clients and their statistics (e.g. after forking)."""
+    global _session
+
+    with _lock, _stats_lock:
+        _clients.clear()
+        _stats.clear()
+        _installed.clear()
+        _session = None
@@ -0,0 +1,225 @@
+"""Non-interactive batch processing of many student profiles.
+
+Reads students from a JSONL file, runs call_api for each with bounded
+concurrency and a request rate limit, and appends one JSON result per line
+as soon as it is ready. Students already present in the output file are
+skipped, so an interrupted run can simply be restarted; failed students and
+partial results (unformatted text returned at call_api's deadline) are
+retried on the next run.
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from pathlib import Path
+from typing import Any, Dict, Iterator, Set, Tuple
+
+from src.config import BATCH_MAX_WORKERS, BATCH_RATE_LIMIT_PER_SECOND
+from src.utils import call_api
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls at most ``rate`` per second."""
+
+    def __init__(self, rate: float) -> None:
+        """
+        Create the limiter.
+
+        Args:
+            rate: Maximum calls per second (0 or less disables limiting)
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_time = time.monotonic()
+
+    def acquire(self) -> None:
+        """Block until the next call is allowed."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+def read_students(input_path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Stream students from a JSONL file.
+
+    Each student is identified by its "id" field, or by its line number when
+    it has none.
+
+    Args:
+        input_path: Path to the JSONL input file
+
+    Yields:
+        Tuples of (student id, student dictionary)
+    """
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                student = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.error("Skipping malformed line %d: %s", line_number, e)
+                continue
+            if not isinstance(student, dict):
+                logger.error("Skipping line %d: not a JSON object", line_number)
+                continue
+            yield str(student.get("id", f"line-{line_number}")), student
+
+
+def completed_ids(output_path: str) -> Set[str]:
+    """
+    Collect the ids already written to an output file.
+
+    A trailing partial line left by a crash and results recorded with an
+    error or marked partial are ignored, so those students are processed
+    again.
+
+    Args:
+        output_path: Path to the JSONL output file
+
+    Returns:
+        Set of student ids with a successful result
+    """
+    done: Set[str] = set()
+    path = Path(output_path)
+    if not path.exists():
+        return done
+
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+                if not result.get("error") and not result.get("partial"):
+                    done.add(str(result["id"]))
+            except (json.JSONDecodeError, AttributeError, KeyError, TypeError):
+                continue
+    return done
+
+
+def _process(
+    student_id: str,
+    student: Dict[str, Any],
+    limiter: RateLimiter,
+) -> Dict[str, Any]:
+    """Run call_api for one student and build its result record."""
+    limiter.acquire()
+    started = time.perf_counter()
+    try:
+        recommendations = call_api(student)
+        error = None if recommendations else "No recommendations generated"
+    except Exception as e:
+        logger.exception("Batch request %s failed: %s", student_id, e)
+        recommendations, error = None, str(e)
+
+    return {
+        "id": student_id,
+        "name": student.get("name"),
+        "recommendations": recommendations,
+        "partial": bool(getattr(recommendations, "partial", False)),
+        "error": error,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def run_batch(
+    input_path: str,
+    output_path: str,
+    max_workers: int = BATCH_MAX_WORKERS,
+    rate_limit: float = BATCH_RATE_LIMIT_PER_SECOND,
+) -> Dict[str, int]:
+    """
+    Process every student in a JSONL file and append results to another.
+
+    At most ``2 * max_workers`` students are held in memory at once, and each
+    result is flushed to disk as soon as it completes (in completion order).
+
+    Args:
+        input_path: JSONL file with one student dictionary per line
+        output_path: JSONL file results are appended to
+        max_workers: Number of concurrent call_api requests
+        rate_limit: Maximum call_api starts per second
+
+    Returns:
+        Counts of "processed", "failed", "partial" and "skipped" students
+
+    Raises:
+        ValueError: If max_workers is less than 1
+    """
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+
+    done = completed_ids(output_path)
+    limiter = RateLimiter(rate_limit)
+    counts = {"processed": 0, "failed": 0, "partial": 0, "skipped": 0}
+    if done:
+        logger.info("Resuming batch: %d students already processed", len(done))
+
+    output_file = Path(output_path)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    needs_newline = False
+    if output_file.exists() and output_file.stat().st_size:
+        with output_file.open("rb") as f:
+            f.seek(-1, 2)
+            needs_newline = f.read(1) != b"\n"
+
+    with output_file.open("a", encoding="utf-8") as out, ThreadPoolExecutor(
+        max_workers=max_workers
+    ) as executor:
+        if needs_newline:
+            # Terminate the partial line left by an interrupted run
+            out.write("\n")
+
+        pending: Set[Future] = set()
+
+        def drain(return_when: str) -> None:
+            nonlocal pending
+            finished, pending = wait(pending, return_when=return_when)
+            for future in finished:
+                result = future.result()
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+                counts["processed"] += 1
+                if result["error"]:
+                    counts["failed"] += 1
+                elif result["partial"]:
+                    counts["partial"] += 1
+
+        for student_id, student in read_students(input_path):
+            if student_id in done:
+                counts["skipped"] += 1
+                continue
+            done.add(student_id)
+
+            pending.add(executor.submit(_process, student_id, student, limiter))
+            if len(pending) >= 2 * max_workers:
+                drain(FIRST_COMPLETED)
+
+        if pending:
+            drain(ALL_COMPLETED)
+
+    logger.info(
+        "Batch complete: %d processed (%d failed, %d partial), %d skipped",
+        counts["processed"],
+        counts["failed"],
+        counts["partial"],
+        counts["skipped"],
+    )
+    return counts
@@ -0,0 +1,611 @@
+"""Offline benchmark of the recommendation pipeline.
+
+Runs the real pipeline (local solver, prompt building, response parsing,
+schedule generation) against a fake Bedrock backend with configurable
+latency, throttling and formatting-fallback rates, so no AWS account is
+needed. Reports p50/p95/p99 latency per stage, end-to-end throughput at a
+given concurrency and per-stage memory allocations, and writes them to a
+JSON file that can be compared against an earlier run:
+
+    python -m src.benchmark --students 100 --concurrency 16
+    python -m src.benchmark --compare data/benchmark_results.json
+"""
+
+import argparse
+import io
+import json
+import logging
+import math
+import platform
+import random
+import subprocess
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+import src.utils
+from src.aws_clients import reset_clients, set_client
+from src.catalog_index import get_catalog_index
+from src.class_timings import generate_schedule_with_times
+from src.config import (
+    AWS_REGION,
+    BENCHMARK_CONCURRENCY,
+    BENCHMARK_FORMAT_LATENCY_MS,
+    BENCHMARK_RESULTS_PATH,
+    BENCHMARK_RETRIEVE_LATENCY_MS,
+    BENCHMARK_SEED,
+    BENCHMARK_STUDENTS,
+    KNOWLEDGE_BASE_ID,
+)
+from src.preprocess import create_course_structure
+from src.response_parser import format_recommendations
+from src.utils import (
+    build_student_prompt,
+    call_api,
+    create_structured_list,
+    format_with_model,
+    retrieve_and_generate,
+    solve_local_schedule,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 95, 99)
+CANDIDATE_HEADER = "**Pre-checked Conflict-Free Schedule:**"
+TIME_CONSTRAINTS = (
+    None,
+    "No classes before 10am",
+    "No classes after 3pm",
+    "No classes on Friday",
+)
+
+
+class FakeBedrockClient:
+    """
+    Stand-in for the bedrock-agent-runtime and bedrock-runtime clients.
+
+    retrieve_and_generate answers with the conflict-free schedule offered in
+    the prompt, as a well-behaved model would; invoke_model returns the
+    lines of the text it was asked to format. Each call sleeps for the
+    configured latency (with +/-50% uniform jitter) and may raise a
+    ThrottlingException ClientError.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float,
+        throttle_rate: float = 0.0,
+        fallback_rate: float = 0.0,
+        seed: int = BENCHMARK_SEED,
+    ) -> None:
+        """
+        Create the fake client.
+
+        Args:
+            latency_ms: Mean simulated latency per call in milliseconds
+            throttle_rate: Probability that a call is throttled
+            fallback_rate: Probability that a generated response is prose
+                the local parser rejects, forcing the formatting model
+            seed: Random seed for jitter, throttling and fallbacks
+        """
+        self.latency_ms = latency_ms
+        self.throttle_rate = throttle_rate
+        self.fallback_rate = fallback_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.throttled = 0
+
+    def _simulate(self, operation: str) -> None:
+        """Sleep for one call's latency and raise if it is throttled."""
+        with self._lock:
+            self.calls += 1
+            delay = self.latency_ms * self._random.uniform(0.5, 1.5) / 1000.0
+            throttled = self._random.random() < self.throttle_rate
+            if throttled:
+                self.throttled += 1
+        time.sleep(delay)
+        if throttled:
+            raise ClientError(
+                {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+                operation,
+            )
+
+    def retrieve_and_generate(self, **kwargs: Any) -> Dict[str, Any]:
+        """Answer with the candidate schedule from the prompt."""
+        self._simulate("RetrieveAndGenerate")
+        prompt = kwargs["input"]["text"]
+        with self._lock:
+            prose = self._random.random() < self.fallback_rate
+
+        lines = []
+        if CANDIDATE_HEADER in prompt:
+            block = prompt.split(CANDIDATE_HEADER, 1)[1].split("\n\n", 1)[0]
+            lines = [ln[2:] for ln in block.splitlines() if ln.startswith("- ")]
+        if prose or not lines:
+            text = "A balanced schedule would include your remaining core courses."
+        else:
+            text = "Here is your recommended schedule:\n" + "\n".join(
+                f"{i}. {line}" for i, line in enumerate(lines, 1)
+            )
+        return {"output": {"text": text}}
+
+    def invoke_model(self, **kwargs: Any) -> Dict[str, Any]:
+        """Return the lines of the text embedded in the formatting prompt."""
+        self._simulate("InvokeModel")
+        prompt = json.loads(kwargs["body"])["prompt"]
+        generation = prompt.split("separate line: ", 1)[-1].split("\n<|eot_id|>")[0]
+        body = json.dumps({"generation": generation}).encode("utf-8")
+        return {"body": io.BytesIO(body)}
+
+
+def make_students(count: int, seed: int = BENCHMARK_SEED) -> List[Dict[str, Any]]:
+    """
+    Generate varied, consistent student profiles.
+
+    Each student has completed a random set of courses together with all of
+    their prerequisites, so profiles cover the whole degree.
+
+    Args:
+        count: Number of students
+        seed: Random seed
+
+    Returns:
+        Student dictionaries as accepted by call_api
+    """
+    rng = random.Random(seed)
+    index = get_catalog_index()
+    codes = index.codes
+
+    students = []
+    for i in range(count):
+        taken = set()
+        for code in rng.sample(codes, rng.randint(0, len(codes) // 2)):
+            taken.add(code)
+            taken.update(index.prerequisites(code, transitive=True))
+        completed = [code for code in codes if code in taken]
+        students.append(
+            {
+                "name": f"Student {i + 1}",
+                "completed_courses": completed,
+                "current_courses": [],
+                "time_constraints": rng.choice(TIME_CONSTRAINTS),
+            }
+        )
+    return students
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values: Samples
+        q: Percentile between 0 and 100
+
+    Returns:
+        The smallest sample with at least q% of samples at or below it,
+        or 0.0 without samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Summarize latency samples in seconds as millisecond statistics."""
+    ms = [s * 1000.0 for s in samples]
+    summary: Dict[str, float] = {"count": len(ms)}
+    for q in PERCENTILES:
+        summary[f"p{q}_ms"] = round(percentile(ms, q), 3)
+    summary["mean_ms"] = round(sum(ms) / len(ms), 3) if ms else 0.0
+    summary["max_ms"] = round(max(ms), 3) if ms else 0.0
+    return summary
+
+
+def _timed(samples: List[float], func: Callable[..., Any], *args: Any) -> Any:
+    """Call func, appending its wall time to samples."""
+    start = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        samples.append(time.perf_counter() - start)
+
+
+def parse_locally(response: str) -> Optional[List[str]]:
+    """The local half of create_list: parse and format without a model call."""
+    records = create_structured_list(response)
+    return format_recommendations(records) if records else None
+
+
+def format_response(
+    response: str,
+    stage: Callable[[str, Callable[..., Any], str], Any],
+) -> Optional[List[str]]:
+    """
+    Format a response the way create_list does, one stage at a time.
+
+    Args:
+        response: Generated response text
+        stage: Runs a stage as stage(name, func, response) and returns its result
+
+    Returns:
+        Formatted lines, or None if neither stage produced any
+    """
+    return stage("parse", parse_locally, response) or stage(
+        "format_model", format_with_model, response
+    )
+
+
+def run_stages(
+    students: List[Dict[str, Any]],
+) -> Tuple[Dict[str, List[float]], int]:
+    """
+    Run each call_api stage separately for every student, one at a time.
+
+    "parse" is the local parser; "format_model" is the formatting model
+    call made only for responses the parser rejects.
+
+    Args:
+        students: Student profiles
+
+    Returns:
+        Tuple of (latency samples in seconds by stage, failed students)
+    """
+    stages: Dict[str, List[float]] = {
+        "solve": [],
+        "prompt": [],
+        "retrieve": [],
+        "parse": [],
+        "format_model": [],
+        "class_timings": [],
+    }
+    structure = create_course_structure()
+    failures = 0
+
+    def timed(stage: str, func: Callable[..., Any], *args: Any) -> Any:
+        return _timed(stages[stage], func, *args)
+
+    for i, student in enumerate(students):
+        local_schedule = _timed(stages["solve"], solve_local_schedule, student)
+        prompt = _timed(
+            stages["prompt"], build_student_prompt, student, local_schedule
+        )
+        response = _timed(
+            stages["retrieve"], retrieve_and_generate, prompt, KNOWLEDGE_BASE_ID
+        )
+        if not response or not format_response(response, timed):
+            failures += 1
+        _timed(stages["class_timings"], generate_schedule_with_times, structure, 3, i)
+
+    return stages, failures
+
+
+def run_throughput(
+    students: List[Dict[str, Any]],
+    concurrency: int,
+) -> Dict[str, Any]:
+    """
+    Run call_api end to end for all students with bounded concurrency.
+
+    Args:
+        students: Student profiles
+        concurrency: Number of students processed at once
+
+    Returns:
+        Throughput statistics and end-to-end latency summary
+    """
+    samples: List[float] = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(
+            executor.map(lambda student: _timed(samples, call_api, student), students)
+        )
+    elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "students": len(students),
+        "seconds": round(elapsed, 3),
+        "students_per_second": round(len(students) / elapsed, 3) if elapsed else 0.0,
+        "failures": sum(1 for result in results if not result),
+        "latency": summarize(samples),
+    }
+
+
+def measure_allocations(
+    students: List[Dict[str, Any]],
+    clients: List[FakeBedrockClient],
+) -> Dict[str, Dict[str, float]]:
+    """
+    Measure memory allocated per stage with tracemalloc.
+
+    Simulated latency is switched off for this pass, which only runs a few
+    students because tracing slows everything down considerably.
+
+    Args:
+        students: Student profiles
+        clients: Fake clients whose latency to suspend
+
+    Returns:
+        Mean peak and retained KiB per call, by stage
+    """
+    latencies = [client.latency_ms for client in clients]
+    for client in clients:
+        client.latency_ms = 0.0
+
+    totals: Dict[str, List[float]] = {}
+
+    def traced(stage: str, func: Callable[..., Any], *args: Any) -> Any:
+        tracemalloc.clear_traces()
+        result = func(*args)
+        retained, peak = tracemalloc.get_traced_memory()
+        stage_totals = totals.setdefault(stage, [0.0, 0.0, 0])
+        stage_totals[0] += peak
+        stage_totals[1] += retained
+        stage_totals[2] += 1
+        return result
+
+    structure = create_course_structure()
+    tracemalloc.start()
+    try:
+        for i, student in enumerate(students):
+            local_schedule = traced("solve", solve_local_schedule, student)
+            prompt = traced("prompt", build_student_prompt, student, local_schedule)
+            response = traced(
+                "retrieve", retrieve_and_generate, prompt, KNOWLEDGE_BASE_ID
+            )
+            if response:
+                format_response(response, traced)
+            traced("class_timings", generate_schedule_with_times, structure, 3, i)
+    finally:
+        tracemalloc.stop()
+        for client, latency in zip(clients, latencies):
+            client.latency_ms = latency
+
+    return {
+        stage: {
+            "peak_kib": round(peak / count / 1024.0, 1),
+            "retained_kib": round(retained / count / 1024.0, 1),
+        }
+        for stage, (peak, retained, count) in totals.items()
+    }
+
+
+def _git_commit() -> Optional[str]:
+    """Current git commit, or None outside a git checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_benchmark(
+    students: int = BENCHMARK_STUDENTS,
+    concurrency: int = BENCHMARK_CONCURRENCY,
+    retrieve_latency_ms: float = BENCHMARK_RETRIEVE_LATENCY_MS,
+    format_latency_ms: float = BENCHMARK_FORMAT_LATENCY_MS,
+    throttle_rate: float = 0.0,
+    fallback_rate: float = 0.0,
+    alloc_samples: int = 5,
+    seed: int = BENCHMARK_SEED,
+) -> Dict[str, Any]:
+    """
+    Benchmark the pipeline against fake Bedrock clients.
+
+    The response cache is bypassed so every student exercises every stage.
+
+    Args:
+        students: Number of student profiles
+        concurrency: Students processed at once in the throughput pass
+        retrieve_latency_ms: Simulated retrieve_and_generate latency
+        format_latency_ms: Simulated formatting model latency
+        throttle_rate: Probability that a Bedrock call is throttled
+        fallback_rate: Probability that a response needs the formatting model
+        alloc_samples: Students traced in the allocation pass (0 to skip)
+        seed: Random seed for profiles and the fake clients
+
+    Returns:
+        Results dictionary (see main for the JSON layout)
+    """
+    profiles = make_students(students, seed)
+    retrieve_client = FakeBedrockClient(
+        retrieve_latency_ms, throttle_rate, fallback_rate, seed
+    )
+    format_client = FakeBedrockClient(format_latency_ms, throttle_rate, 0.0, seed + 1)
+    clients = [retrieve_client, format_client]
+
+    cache_enabled = src.utils.RESPONSE_CACHE_ENABLED
+    src.utils.RESPONSE_CACHE_ENABLED = False
+    reset_clients()
+    set_client("bedrock-agent-runtime", retrieve_client, AWS_REGION)
+    set_client("bedrock-runtime", format_client, AWS_REGION)
+    try:
+        # Warm the catalog, index and schedule caches outside the timings
+        if profiles:
+            build_student_prompt(profiles[0], solve_local_schedule(profiles[0]))
+
+        stages, failures = run_stages(profiles)
+        throughput = run_throughput(profiles, concurrency)
+        allocations = (
+            measure_allocations(profiles[:alloc_samples], clients)
+            if alloc_samples
+            else {}
+        )
+    finally:
+        src.utils.RESPONSE_CACHE_ENABLED = cache_enabled
+        reset_clients()
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "config": {
+            "students": students,
+            "concurrency": concurrency,
+            "retrieve_latency_ms": retrieve_latency_ms,
+            "format_latency_ms": format_latency_ms,
+            "throttle_rate": throttle_rate,
+            "fallback_rate": fallback_rate,
+            "seed": seed,
+        },
+        "stages": {name: summarize(samples) for name, samples in stages.items()},
+        "stage_failures": failures,
+        "throughput": throughput,
+        "allocations": allocations,
+        "bedrock_calls": {
+            "retrieve": retrieve_client.calls,
+            "format": format_client.calls,
+            "throttled": retrieve_client.throttled + format_client.throttled,
+        },
+    }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Describe latency and throughput changes relative to a baseline run.
+
+    Args:
+        current: Results of this run
+        baseline: Results loaded from an earlier run
+
+    Returns:
+        One line per stage and one for throughput, with percent changes
+    """
+
+    def change(new: float, old: float) -> str:
+        return f"{(new - old) / old * 100.0:+.1f}%" if old else "n/a"
+
+    lines = [f"Compared with {baseline.get('git_commit') or 'baseline'}:"]
+    for stage, stats in current["stages"].items():
+        old = baseline.get("stages", {}).get(stage)
+        if not old:
+            continue
+        lines.append(
+            f"  {stage:<14} p50 {change(stats['p50_ms'], old['p50_ms']):>8}"
+            f"  p95 {change(stats['p95_ms'], old['p95_ms']):>8}"
+            f"  p99 {change(stats['p99_ms'], old['p99_ms']):>8}"
+        )
+    old_throughput = baseline.get("throughput", {}).get("students_per_second")
+    if old_throughput:
+        new_throughput = current["throughput"]["students_per_second"]
+        lines.append(f"  throughput     {change(new_throughput, old_throughput):>8}")
+    return lines
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command-line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the recommendation pipeline against a fake Bedrock."
+    )
+    parser.add_argument("--students", type=int, default=BENCHMARK_STUDENTS)
+    parser.add_argument("--concurrency", type=int, default=BENCHMARK_CONCURRENCY)
+    parser.add_argument(
+        "--retrieve-latency-ms", type=float, default=BENCHMARK_RETRIEVE_LATENCY_MS
+    )
+    parser.add_argument(
+        "--format-latency-ms", type=float, default=BENCHMARK_FORMAT_LATENCY_MS
+    )
+    parser.add_argument(
+        "--throttle-rate",
+        type=float,
+        default=0.0,
+        help="Probability that a simulated Bedrock call is throttled",
+    )
+    parser.add_argument(
+        "--fallback-rate",
+        type=float,
+        default=0.0,
+        help="Probability that a response needs the formatting model",
+    )
+    parser.add_argument(
+        "--alloc-samples",
+        type=int,
+        default=5,
+        help="Students traced with tracemalloc (0 skips the allocation pass)",
+    )
+    parser.add_argument("--seed", type=int, default=BENCHMARK_SEED)
+    parser.add_argument(
+        "--out",
+        default=BENCHMARK_RESULTS_PATH,
+        help=f"Results JSON file (default: {BENCHMARK_RESULTS_PATH})",
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="RESULTS_JSON",
+        help="Earlier results file to compare against",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark, print a summary and write the results file."""
+    logging.basicConfig(level=logging.WARNING)
+    # Simulated throttles would otherwise be logged with full tracebacks
+    logging.getLogger("src.utils").setLevel(logging.CRITICAL)
+    logging.getLogger("src.resilience").setLevel(logging.CRITICAL)
+    args = parse_args(argv)
+
+    # Read the baseline first: it is often the file about to be overwritten
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = run_benchmark(
+        students=args.students,
+        concurrency=args.concurrency,
+        retrieve_latency_ms=args.retrieve_latency_ms,
+        format_latency_ms=args.format_latency_ms,
+        throttle_rate=args.throttle_rate,
+        fallback_rate=args.fallback_rate,
+        alloc_samples=args.alloc_samples,
+        seed=args.seed,
+    )
+
+    output_file = Path(args.out)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with output_file.open("w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    for stage, stats in results["stages"].items():
+        print(
+            f"{stage:<14} p50 {stats['p50_ms']:>9.2f} ms  "
+            f"p95 {stats['p95_ms']:>9.2f} ms  p99 {stats['p99_ms']:>9.2f} ms"
+        )
+    throughput = results["throughput"]
+    print(
+        f"call_api       {throughput['students_per_second']:.2f} students/s at "
+        f"concurrency {throughput['concurrency']} "
+        f"({throughput['failures']} failed)"
+    )
+    if baseline is not None:
+        print("\n".join(compare_results(results, baseline)))
+    print(f"✅ Results saved to: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
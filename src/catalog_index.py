@@ -0,0 +1,332 @@
+"""Prerequisite graph index over the course catalog.
+
+Builds the prerequisite DAG once, orders it topologically and precomputes
+each course's transitive prerequisites as integer bitsets, so eligibility
+queries are a handful of bitwise operations per course.
+"""
+
+import logging
+from collections import deque
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Sequence, Set, Tuple
+
+from src.catalog_walker import course_code, walk_catalog
+
+if TYPE_CHECKING:
+    from src.catalog_model import Catalog
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def build_course_catalog(
+    course_structure: Dict[str, Any],
+) -> Tuple[Dict[str, int], Dict[str, List[str]]]:
+    """
+    Collect credits and prerequisites for every coded course in a structure.
+
+    Args:
+        course_structure: Course structure as produced by create_course_structure
+
+    Returns:
+        Tuple of (credits by course code, prerequisite codes by course code)
+    """
+    credits: Dict[str, int] = {}
+    prereqs: Dict[str, List[str]] = {}
+
+    for record in walk_catalog(course_structure):
+        code, node = record["code"], record["course"]
+        if not code:
+            continue
+        if "credits" in node:
+            credits.setdefault(code, node["credits"])
+        if node.get("prereq"):
+            prereqs.setdefault(code, [])
+            for prereq in node["prereq"]:
+                prereq_code = course_code(prereq)
+                if prereq_code and prereq_code not in prereqs[code]:
+                    prereqs[code].append(prereq_code)
+
+    return credits, prereqs
+
+
+def build_or_paths(
+    course_structure: Dict[str, Any],
+) -> Tuple[List[List[List[str]]], Set[str]]:
+    """
+    Collect the degree-path OR groups of a course structure.
+
+    Args:
+        course_structure: Course structure as produced by create_course_structure
+
+    Returns:
+        Tuple of (OR groups, each a list of alternative paths' course codes;
+        codes listed only inside OR groups and nowhere else)
+    """
+    # Alternatives by requirement, then by path index, in walk order
+    groups: Dict[Tuple[Any, ...], Dict[int, List[str]]] = {}
+    in_paths: Set[str] = set()
+    outside_paths: Set[str] = set()
+
+    for record in walk_catalog(course_structure):
+        code = record["code"]
+        if not code:
+            continue
+        if record["parent"] is None:
+            outside_paths.add(code)
+            continue
+        in_paths.add(code)
+        key = (record["category"], record["group"], record["requirement"])
+        groups.setdefault(key, {}).setdefault(record["option"], []).append(code)
+
+    or_paths = [list(options.values()) for options in groups.values()]
+    return or_paths, in_paths - outside_paths
+
+
+class CatalogIndex:
+    """
+    Topologically ordered prerequisite graph with precomputed closures.
+
+    Every course code gets an integer id (its position in topological
+    order); sets of courses are represented as integer bitsets over those ids.
+    """
+
+    def __init__(
+        self,
+        credits: Dict[str, int],
+        prereqs: Dict[str, List[str]],
+        or_paths: Iterable[Sequence[Sequence[str]]] = (),
+        path_only: Iterable[str] = (),
+    ) -> None:
+        """
+        Build the index.
+
+        Args:
+            credits: Credits by course code
+            prereqs: Direct prerequisite codes by course code
+            or_paths: Degree-path OR groups, each a list of alternative
+                paths' course codes
+            path_only: Codes listed only inside OR groups; only these are
+                dropped once another path of their group is satisfied
+
+        Raises:
+            ValueError: If the prerequisite graph contains a cycle
+        """
+        self.credits = dict(credits)
+
+        codes = set(credits)
+        for code, required in prereqs.items():
+            codes.add(code)
+            codes.update(required)
+
+        self.codes = _topological_order(sorted(codes), prereqs)
+        self.ids = {code: i for i, code in enumerate(self.codes)}
+
+        # Direct and transitive prerequisite bitsets, filled in topological
+        # order so every prerequisite's closure is already final
+        self._direct = [0] * len(self.codes)
+        self._closure = [0] * len(self.codes)
+        for i, code in enumerate(self.codes):
+            for prereq in prereqs.get(code, []):
+                j = self.ids[prereq]
+                self._direct[i] |= 1 << j
+                self._closure[i] |= (1 << j) | self._closure[j]
+
+        # Each OR group as the bitsets of its alternative paths
+        self._or_paths = [[self.mask(option) for option in group] for group in or_paths]
+        self._path_only = self.mask(path_only)
+
+        logger.debug("Built catalog index over %d courses", len(self.codes))
+
+    @classmethod
+    def from_catalog(cls, catalog: "Catalog") -> "CatalogIndex":
+        """
+        Build an index from a compact catalog model.
+
+        Args:
+            catalog: Catalog from src.catalog_model
+
+        Returns:
+            CatalogIndex over every course in the catalog
+        """
+        return cls(
+            catalog.credits(),
+            catalog.prereqs(),
+            catalog.or_paths(),
+            catalog.path_only_codes(),
+        )
+
+    @classmethod
+    def from_structure(cls, course_structure: Dict[str, Any]) -> "CatalogIndex":
+        """
+        Build an index from a course structure dictionary.
+
+        Args:
+            course_structure: Course structure as produced by create_course_structure
+
+        Returns:
+            CatalogIndex over every coded course in the structure
+        """
+        return cls(
+            *build_course_catalog(course_structure),
+            *build_or_paths(course_structure),
+        )
+
+    def mask(self, courses: Iterable[str]) -> int:
+        """
+        Convert course references to a bitset, ignoring unknown courses.
+
+        Args:
+            courses: Course codes or titles
+
+        Returns:
+            Integer bitset over course ids
+        """
+        result = 0
+        for course in courses:
+            i = self.ids.get(course_code(course) or "")
+            if i is not None:
+                result |= 1 << i
+        return result
+
+    def _codes_in(self, bits: int) -> List[str]:
+        """List the course codes set in a bitset, in topological order."""
+        return [code for i, code in enumerate(self.codes) if bits >> i & 1]
+
+    def prerequisites(self, code: str, transitive: bool = False) -> List[str]:
+        """
+        Get a course's prerequisites.
+
+        Args:
+            code: Course code
+            transitive: Include prerequisites of prerequisites
+
+        Returns:
+            Prerequisite codes in topological order (empty for unknown courses)
+        """
+        i = self.ids.get(course_code(code) or "")
+        if i is None:
+            return []
+        return self._codes_in(self._closure[i] if transitive else self._direct[i])
+
+    def eligible(
+        self,
+        completed: Iterable[str],
+        current: Iterable[str] = (),
+    ) -> List[str]:
+        """
+        List the courses a student may take next semester.
+
+        A course is eligible when it is neither completed nor in progress,
+        each direct prerequisite is completed or in progress, and it is not
+        an alternative of a degree-path OR group another path already
+        satisfies.
+
+        Args:
+            completed: Completed course references
+            current: Currently enrolled course references
+
+        Returns:
+            Eligible course codes in topological order
+        """
+        taken = self.mask(completed) | self.mask(current)
+        taken_or_dropped = taken | self._satisfied_alternatives(taken)
+        return [
+            code
+            for i, code in enumerate(self.codes)
+            if not taken_or_dropped >> i & 1 and not self._direct[i] & ~taken
+        ]
+
+    def _satisfied_alternatives(self, taken: int) -> int:
+        """
+        Bitset of path-only courses whose OR group is already satisfied.
+
+        A course shared with a group that is still open stays eligible.
+        """
+        satisfied = still_open = 0
+        for group in self._or_paths:
+            union = 0
+            for option in group:
+                union |= option
+            if any(option and not option & ~taken for option in group):
+                satisfied |= union
+            else:
+                still_open |= union
+        return satisfied & ~still_open & self._path_only
+
+    def missing_prerequisites(
+        self,
+        code: str,
+        completed: Iterable[str],
+        current: Iterable[str] = (),
+    ) -> List[str]:
+        """
+        List every prerequisite still needed before a course can be taken.
+
+        Args:
+            code: Course code
+            completed: Completed course references
+            current: Currently enrolled course references
+
+        Returns:
+            Missing transitive prerequisite codes in the order they can be taken
+        """
+        i = self.ids.get(course_code(code) or "")
+        if i is None:
+            return []
+        taken = self.mask(completed) | self.mask(current)
+        return self._codes_in(self._closure[i] & ~taken)
+
+
+def _topological_order(codes: List[str], prereqs: Dict[str, List[str]]) -> List[str]:
+    """
+    Order course codes so every prerequisite precedes its dependents.
+
+    Uses Kahn's algorithm; ties keep the incoming (sorted) order.
+
+    Raises:
+        ValueError: If the prerequisite graph contains a cycle
+    """
+    indegree = {code: len(prereqs.get(code, [])) for code in codes}
+    dependents: Dict[str, List[str]] = {code: [] for code in codes}
+    for code in codes:
+        for required in prereqs.get(code, []):
+            dependents[required].append(code)
+
+    ready = deque(code for code in codes if indegree[code] == 0)
+    order = []
+    while ready:
+        code = ready.popleft()
+        order.append(code)
+        for dependent in dependents[code]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                ready.append(dependent)
+
+    if len(order) != len(codes):
+        cyclic = sorted(code for code in codes if indegree[code] > 0)
+        raise ValueError(f"Prerequisite cycle among: {', '.join(cyclic)}")
+
+    return order
+
+
+def get_catalog_index() -> CatalogIndex:
+    """
+    Get the shared index built from the catalog model.
+
+    Returns:
+        CatalogIndex, built on first use and rebuilt when the catalog
+        sources change
+    """
+    # Imported here because the catalog model itself depends on this module
+    from src.catalog_model import catalog_fingerprint
+
+    return _shared_index(catalog_fingerprint())
+
+
+@lru_cache(maxsize=1)
+def _shared_index(fingerprint: str) -> CatalogIndex:
+    """Build one version of the index (fingerprint keys the cache)."""
+    from src.catalog_model import get_catalog
+
+    return CatalogIndex.from_catalog(get_catalog())
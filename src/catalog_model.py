@@ -0,0 +1,466 @@
+"""Compact, typed in-memory model of the course catalog.
+
+Courses, sections and requirements are small ``__slots__`` objects with
+interned codes and integer ids instead of nested dicts of lists. A built
+catalog is pickled next to the data files and reloaded directly on later
+process starts until the catalog sources change.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import sys
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+
+import src.preprocess
+from src.catalog_walker import course_code, walk_catalog
+from src.config import CATALOG_SNAPSHOT_PATH, CLASS_SCHEDULE_PATH
+from src.preprocess import create_course_structure
+from src.response_cache import data_fingerprint
+from src.scheduler import load_class_schedule
+from src.structure_loader import load_structure
+from src.time_slots import section_mask
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 3
+
+
+class Section:
+    """One meeting section of a course."""
+
+    __slots__ = ("course_id", "section_id", "day_type", "time_slot", "mask")
+
+    def __init__(
+        self,
+        course_id: int,
+        section_id: int,
+        day_type: str,
+        time_slot: str,
+    ) -> None:
+        self.course_id = course_id
+        self.section_id = section_id
+        self.day_type = sys.intern(day_type)
+        self.time_slot = sys.intern(time_slot)
+        try:
+            self.mask = section_mask(day_type, time_slot)
+        except ValueError:
+            self.mask = 0
+
+    def __repr__(self) -> str:
+        return f"Section({self.section_id}, {self.day_type} {self.time_slot})"
+
+
+class Course:
+    """A coded catalog course with its prerequisites and sections."""
+
+    __slots__ = ("id", "code", "title", "credits", "prereq_ids", "sections")
+
+    def __init__(
+        self,
+        course_id: int,
+        code: str,
+        title: str,
+        credits: Optional[int] = None,
+    ) -> None:
+        self.id = course_id
+        self.code = sys.intern(code)
+        self.title = title
+        self.credits = credits
+        self.prereq_ids: Tuple[int, ...] = ()
+        self.sections: Tuple[Section, ...] = ()
+
+    def __repr__(self) -> str:
+        return f"Course({self.code!r}, credits={self.credits})"
+
+
+class Requirement:
+    """
+    A degree requirement satisfied by one of several course groups.
+
+    ``options`` holds the alternatives as tuples of course ids; a
+    requirement such as "Natural Science Requirement" with no listed
+    courses has no options. ``is_path`` marks degree-path OR groups (such
+    as "CPSC 1010/1020 OR CPSC 1060/1070"), as opposed to option lists.
+    """
+
+    __slots__ = ("name", "credits", "semester", "options", "is_path")
+
+    def __init__(
+        self,
+        name: str,
+        credits: Optional[int] = None,
+        semester: Optional[str] = None,
+        options: Tuple[Tuple[int, ...], ...] = (),
+        is_path: bool = False,
+    ) -> None:
+        self.name = name
+        self.credits = credits
+        self.semester = semester
+        self.options = options
+        self.is_path = is_path
+
+    def __repr__(self) -> str:
+        return f"Requirement({self.name!r}, {len(self.options)} options)"
+
+
+class Catalog:
+    """Indexed collection of courses and requirements."""
+
+    __slots__ = ("courses", "ids", "requirements", "path_only")
+
+    def __init__(
+        self,
+        courses: List[Course],
+        requirements: List[Requirement],
+        path_only: FrozenSet[int] = frozenset(),
+    ) -> None:
+        """
+        Create the catalog.
+
+        Args:
+            courses: Courses, where ``courses[i].id == i``
+            requirements: Degree requirements
+            path_only: Ids of courses listed only as degree-path alternatives
+        """
+        self.courses = courses
+        self.ids = {course.code: course.id for course in courses}
+        self.requirements = requirements
+        self.path_only = path_only
+
+    def __len__(self) -> int:
+        return len(self.courses)
+
+    def __iter__(self) -> Iterator[Course]:
+        return iter(self.courses)
+
+    def get(self, code: str) -> Optional[Course]:
+        """
+        Look up a course by code or title.
+
+        Args:
+            code: Course code (e.g. "CPSC 2120") or a title containing one
+
+        Returns:
+            Course, or None if it is not in the catalog
+        """
+        course_id = self.ids.get(course_code(code) or "")
+        return None if course_id is None else self.courses[course_id]
+
+    def credits(self) -> Dict[str, int]:
+        """Credits by course code, for courses with known credits."""
+        return {c.code: c.credits for c in self.courses if c.credits is not None}
+
+    def prereqs(self) -> Dict[str, List[str]]:
+        """Direct prerequisite codes by course code."""
+        return {
+            c.code: [self.courses[i].code for i in c.prereq_ids]
+            for c in self.courses
+            if c.prereq_ids
+        }
+
+    def or_paths(self) -> List[List[List[str]]]:
+        """Degree-path OR groups, each a list of alternative paths' codes."""
+        return [
+            [[self.courses[i].code for i in option] for option in requirement.options]
+            for requirement in self.requirements
+            if requirement.is_path
+        ]
+
+    def path_only_codes(self) -> List[str]:
+        """Codes of courses listed only as degree-path alternatives."""
+        return [self.courses[i].code for i in sorted(self.path_only)]
+
+    @classmethod
+    def from_data(
+        cls,
+        course_structure: Dict[str, Any],
+        offerings: List[Dict[str, Any]],
+    ) -> "Catalog":
+        """
+        Build a catalog from a course structure and class schedule.
+
+        Args:
+            course_structure: Course structure as produced by
+                create_course_structure
+            offerings: Courses with sections from the class schedule
+
+        Returns:
+            Catalog covering every coded course in either source
+        """
+        builder = _CatalogBuilder()
+        builder.add_structure(course_structure)
+        builder.add_offerings(offerings)
+        return builder.build()
+
+
+class _CatalogBuilder:
+    """Accumulates courses and requirements while walking the raw data."""
+
+    def __init__(self) -> None:
+        self.courses: List[Course] = []
+        self.ids: Dict[str, int] = {}
+        self.prereqs: Dict[int, List[str]] = {}
+        self.requirements: List[Requirement] = []
+        # Courses listed in degree-path OR groups, and listed anywhere else
+        self.in_paths: Set[int] = set()
+        self.outside_paths: Set[int] = set()
+
+    def course_id(self, title: str, credits: Optional[int] = None) -> Optional[int]:
+        """Get or create the course id for a title, or None if it has no code."""
+        code = course_code(title)
+        if code is None:
+            return None
+        course_id = self.ids.get(code)
+        if course_id is None:
+            course_id = len(self.courses)
+            self.ids[code] = course_id
+            self.courses.append(Course(course_id, code, title, credits))
+        elif self.courses[course_id].credits is None:
+            self.courses[course_id].credits = credits
+        return course_id
+
+    def add_course(self, node: Dict[str, Any]) -> Optional[int]:
+        """Record a course node and its prerequisites."""
+        course_id = self.course_id(node.get("course", ""), node.get("credits"))
+        if course_id is not None and node.get("prereq"):
+            required = self.prereqs.setdefault(course_id, [])
+            for prereq in node["prereq"]:
+                code = course_code(prereq)
+                if code and code not in required:
+                    required.append(code)
+        return course_id
+
+    def add_structure(self, course_structure: Dict[str, Any]) -> None:
+        """Record every course and requirement of a course structure."""
+        # Alternatives by requirement, then by option index, in walk order
+        options: Dict[Tuple[Any, ...], Dict[int, List[int]]] = {}
+        positions: Dict[Tuple[Any, ...], int] = {}
+
+        for record in walk_catalog(course_structure):
+            node = record["course"]
+            course_id = self.add_course(node)
+            if course_id is not None:
+                listed = (
+                    self.outside_paths if record["parent"] is None else self.in_paths
+                )
+                listed.add(course_id)
+            if record["requirement"] is None:
+                if course_id is None:
+                    self.requirements.append(
+                        Requirement(
+                            node.get("course", ""),
+                            node.get("credits"),
+                            node.get("semester"),
+                        )
+                    )
+                continue
+
+            key = (record["category"], record["group"], record["requirement"])
+            if key not in options:
+                parent = record["parent"] or {}
+                options[key] = {}
+                positions[key] = len(self.requirements)
+                self.requirements.append(
+                    Requirement(
+                        record["requirement"],
+                        parent.get("credits"),
+                        parent.get("semester"),
+                        is_path=record["parent"] is not None,
+                    )
+                )
+            if course_id is not None:
+                options[key].setdefault(record["option"], []).append(course_id)
+
+        for key, groups in options.items():
+            self.requirements[positions[key]].options = tuple(
+                tuple(group) for group in groups.values()
+            )
+
+    def add_offerings(self, offerings: List[Dict[str, Any]]) -> None:
+        """Attach schedule sections, keeping the first offering of each code."""
+        seen = set()
+        for offering in offerings:
+            course_id = self.course_id(offering.get("course", ""))
+            if course_id is None or course_id in seen:
+                continue
+            seen.add(course_id)
+            self.courses[course_id].sections = tuple(
+                Section(
+                    course_id,
+                    section.get("section_id", i),
+                    section["day_type"],
+                    section["time_slot"],
+                )
+                for i, section in enumerate(offering.get("sections", []), 1)
+                if "day_type" in section and "time_slot" in section
+            )
+
+    def build(self) -> Catalog:
+        """Resolve prerequisite codes to ids and return the catalog."""
+        for course_id, codes in self.prereqs.items():
+            prereq_ids = (self.course_id(code) for code in codes)
+            self.courses[course_id].prereq_ids = tuple(
+                prereq_id for prereq_id in prereq_ids if prereq_id is not None
+            )
+        return Catalog(
+            self.courses,
+            self.requirements,
+            frozenset(self.in_paths - self.outside_paths),
+        )
+
+
+def save_snapshot(catalog: Catalog, snapshot_path: str, fingerprint: str) -> None:
+    """
+    Pickle a catalog for fast reloading.
+
+    The file is written to a temporary name and renamed into place, so
+    concurrent readers never see a partial snapshot.
+
+    Args:
+        catalog: Catalog to save
+        snapshot_path: Snapshot file path
+        fingerprint: Fingerprint of the sources the catalog was built from
+    """
+    os.makedirs(os.path.dirname(snapshot_path) or ".", exist_ok=True)
+    tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(
+            (SNAPSHOT_VERSION, fingerprint, catalog),
+            f,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    os.replace(tmp_path, snapshot_path)
+    logger.info("Saved catalog snapshot to: %s", snapshot_path)
+
+
+def load_snapshot(snapshot_path: str, fingerprint: str) -> Optional[Catalog]:
+    """
+    Load a pickled catalog if it matches the current sources.
+
+    Args:
+        snapshot_path: Snapshot file path
+        fingerprint: Fingerprint of the current catalog sources
+
+    Returns:
+        The catalog, or None if the snapshot is missing, stale or unreadable
+    """
+    try:
+        with open(snapshot_path, "rb") as f:
+            version, saved_fingerprint, catalog = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring unreadable catalog snapshot %s: %s", snapshot_path, e)
+        return None
+
+    if version != SNAPSHOT_VERSION or saved_fingerprint != fingerprint:
+        return None
+    return catalog
+
+
+def source_snapshot_path(snapshot_path: str, structure_path: str) -> str:
+    """
+    Name the snapshot of a catalog built from a structure file.
+
+    Args:
+        snapshot_path: Snapshot file path of the built-in structure
+        structure_path: Course structure JSON file
+
+    Returns:
+        Path such as "catalog_snapshot.course_structure1-1a2b3c4d.pickle"
+    """
+    root, ext = os.path.splitext(snapshot_path)
+    stem = os.path.splitext(os.path.basename(structure_path))[0]
+    key = hashlib.sha256(os.path.abspath(structure_path).encode("utf-8"))
+    return f"{root}.{stem}-{key.hexdigest()[:8]}{ext}"
+
+
+def load_catalog(
+    schedule_path: str = CLASS_SCHEDULE_PATH,
+    snapshot_path: Optional[str] = CATALOG_SNAPSHOT_PATH,
+    structure_path: Optional[str] = None,
+) -> Catalog:
+    """
+    Load the catalog, from the snapshot when it is current.
+
+    The course structure comes from structure_path (any variant understood
+    by load_structure) or, by default, from create_course_structure. Each
+    structure file gets its own snapshot next to snapshot_path, so
+    alternating sources do not overwrite each other's snapshot. A snapshot
+    is invalidated when its source, the class schedule or this module
+    (which defines the pickled classes) changes.
+    A missing class schedule yields a catalog without sections.
+
+    Args:
+        schedule_path: Path to the class schedule JSON file
+        snapshot_path: Snapshot file path, or None to always rebuild
+        structure_path: Course structure JSON file, or None for the
+            built-in structure
+
+    Returns:
+        Catalog of the configured degree
+    """
+    fingerprint = catalog_fingerprint(schedule_path, structure_path)
+    if snapshot_path and structure_path:
+        snapshot_path = source_snapshot_path(snapshot_path, structure_path)
+    if snapshot_path:
+        catalog = load_snapshot(snapshot_path, fingerprint)
+        if catalog is not None:
+            return catalog
+
+    try:
+        offerings = load_class_schedule(schedule_path)
+    except FileNotFoundError:
+        logger.warning("Class schedule not found; catalog has no sections")
+        offerings = []
+
+    if structure_path:
+        course_structure = load_structure(structure_path)
+    else:
+        course_structure = create_course_structure()
+    catalog = Catalog.from_data(course_structure, offerings)
+    if snapshot_path:
+        try:
+            save_snapshot(catalog, snapshot_path, fingerprint)
+        except OSError as e:
+            logger.warning("Could not save catalog snapshot: %s", e)
+    return catalog
+
+
+def catalog_fingerprint(
+    schedule_path: str = CLASS_SCHEDULE_PATH,
+    structure_path: Optional[str] = None,
+) -> str:
+    """
+    Fingerprint the sources of a catalog (see load_catalog).
+
+    Args:
+        schedule_path: Path to the class schedule JSON file
+        structure_path: Course structure JSON file, or None for the
+            built-in structure
+
+    Returns:
+        Short hex digest that changes whenever any source changes
+    """
+    structure_source = structure_path or src.preprocess.__file__
+    return data_fingerprint((structure_source, schedule_path, __file__))
+
+
+def get_catalog() -> Catalog:
+    """
+    Get the shared catalog.
+
+    Returns:
+        Catalog loaded on first use and reused until its sources change
+    """
+    return _shared_catalog(catalog_fingerprint())
+
+
+@lru_cache(maxsize=1)
+def _shared_catalog(fingerprint: str) -> Catalog:
+    """Load one version of the catalog (fingerprint keys the cache)."""
+    return load_catalog()
@@ -0,0 +1,385 @@
+"""Streaming parser for plain-text degree path listings.
+
+Turns catalog text in the format of ``data/cpscBs_degreepath.txt`` into
+course structure dictionaries that walk_catalog and the catalog builders
+understand. The text is read line by line and each degree is yielded as
+soon as its listing ends, so memory stays bounded by the largest single
+degree however many programs the catalog contains.
+
+Recognized lines:
+
+- ``Computer Science, BS`` or ``Degree: Computer Science BS`` starts a degree
+- ``Total Credits: 122`` sets the degree's credit total
+- ``Core Computing Classes:`` starts a requirement group; trailing text
+  such as ``2 classes`` records how many classes it needs, as the "count"
+  of a requirement holding the group's courses
+- ``CPSC 2070 - Discrete Structures (3)`` lists a course (title and
+  credits optional); ``CPSC 1010/11`` also lists the lab CPSC 1011
+- ``A + B OR`` / ``C + D`` lists alternatives, one OR-path per line
+- ``Prerequisite: CPSC 2120`` adds prerequisites to the previous course
+"""
+
+import argparse
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.config import DATA_DIR
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEGREE_PATTERN = re.compile(
+    r"^(?:Degree:\s*(?P<named>.+?)|(?P<title>[A-Z][^:]*?),?\s+"
+    r"(?P<kind>B\.?S\.?|B\.?A\.?|B\.?F\.?A\.?|M\.?S\.?|Ph\.?D\.?))\s*$"
+)
+TOTAL_CREDITS_PATTERN = re.compile(r"^Total Credits:\s*(\d+)", re.IGNORECASE)
+HEADER_PATTERN = re.compile(r"^(?P<name>[^:]+?)\s*:\s*(?P<rest>.*)$")
+CLASS_COUNT_PATTERN = re.compile(r"(\d+)\s+class(?:es)?\b", re.IGNORECASE)
+PREREQ_PATTERN = re.compile(r"^(?:Prerequisites?|Prereqs?):\s*(.+)$", re.IGNORECASE)
+COURSE_PATTERN = re.compile(
+    r"\b([A-Z]{2,4})\s*(\d{4})((?:\s*/\s*(?:[A-Z]{2,4}\s*)?\d{2,4})*)"
+)
+ALTERNATE_PATTERN = re.compile(r"/\s*(?:([A-Z]{2,4})\s*)?(\d{2,4})")
+TITLE_PATTERN = re.compile(r"^\s*[-–:]\s*([^()]+?)\s*(?:\((\d+)\)|$)")
+CREDITS_PATTERN = re.compile(r"\((\d+)(?:\s*cr(?:edits?)?)?\)|(\d+)\s+credits?\b")
+OR_PATTERN = re.compile(r"\s+OR(?:\s+|$)")
+TRAILING_OR_PATTERN = re.compile(r"\s+OR\s*$")
+
+
+def _slug(name: str) -> str:
+    """Turn a heading such as "Core Computing Classes" into a group key."""
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+def expand_course_codes(text: str) -> List[str]:
+    """
+    Expand shorthand course references into full course codes.
+
+    "CPSC 1010/11" is CPSC 1010 and its lab CPSC 1011 (a short number
+    replaces the trailing digits); "BIOL 1030/BIOL 1050" lists both. A
+    short number that would change more than the last digit, such as the
+    "51" in "COMM 1500/51", does not name a companion course and is
+    ignored, leaving only the base code.
+
+    Args:
+        text: Line or fragment containing course references
+
+    Returns:
+        Course codes in order of appearance
+    """
+    codes = []
+    for match in COURSE_PATTERN.finditer(text):
+        dept, number, alternates = match.groups()
+        codes.append(f"{dept} {number}")
+        for alt_dept, alt_number in ALTERNATE_PATTERN.findall(alternates):
+            full = _expand_number(number, alt_number)
+            if full is None:
+                logger.debug("Ignoring suffix /%s of %s %s", alt_number, dept, number)
+                continue
+            codes.append(f"{alt_dept or dept} {full}")
+    return codes
+
+
+def _expand_number(number: str, suffix: str) -> Optional[str]:
+    """
+    Complete a shortened course number from the one it follows.
+
+    Args:
+        number: Full course number, e.g. "1010"
+        suffix: Number after the slash, e.g. "11" or "1020"
+
+    Returns:
+        The full number, or None if the suffix changes more than the base
+        number's last digit
+    """
+    if len(suffix) >= len(number):
+        return suffix
+    replaced = number[len(number) - len(suffix) :]
+    if suffix[:-1] != replaced[:-1]:
+        return None
+    return number[: len(number) - len(suffix)] + suffix
+
+
+def _course_nodes(text: str) -> List[Dict[str, Any]]:
+    """Build course entries for every course referenced in a fragment."""
+    nodes = []
+    matches = list(COURSE_PATTERN.finditer(text))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        tail = text[match.end() : end]
+        codes = expand_course_codes(match.group(0))
+
+        title_match = TITLE_PATTERN.match(tail)
+        credits_match = CREDITS_PATTERN.search(tail)
+        for code in codes:
+            node: Dict[str, Any] = {"course": code}
+            if title_match and len(codes) == 1:
+                node["course"] = f"{code} - {title_match.group(1)}"
+            if credits_match and len(codes) == 1:
+                node["credits"] = int(credits_match.group(1) or credits_match.group(2))
+            nodes.append(node)
+    return nodes
+
+
+class _DegreeBuilder:
+    """Accumulates the groups of one degree while its lines stream past."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.total_credits: Optional[int] = None
+        self.groups: Dict[str, List[Dict[str, Any]]] = {}
+        self.group: Optional[str] = None
+        self.heading = ""
+        self.count: Optional[int] = None
+        self.paths: List[str] = []
+        self.last_course: Optional[Dict[str, Any]] = None
+
+    def start_group(self, heading: str, rest: str) -> str:
+        """Close the current group and open a new one, returning its key."""
+        self.finish_group()
+        self.heading = heading
+        group = self.group = _slug(heading)
+        count = CLASS_COUNT_PATTERN.search(rest)
+        self.count = int(count.group(1)) if count else None
+        self.groups.setdefault(group, [])
+        if COURSE_PATTERN.search(rest):
+            self.add_line(rest)
+        return group
+
+    def add_line(self, line: str) -> None:
+        """Add a course, OR-path or prerequisite line to the current group."""
+        prereq = PREREQ_PATTERN.match(line)
+        if prereq:
+            if self.last_course is not None:
+                required = self.last_course.setdefault("prereq", [])
+                for code in expand_course_codes(prereq.group(1)):
+                    if code not in required:
+                        required.append(code)
+            return
+
+        group = self.group
+        if group is None:
+            group = self.start_group("General", "")
+
+        parts = OR_PATTERN.split(line)
+        if len(parts) > 1 or self.paths:
+            # Alternatives: each OR-separated part (possibly across lines)
+            # is one path; a line not ending in OR closes the list
+            self.paths.extend(part.strip() for part in parts if part.strip())
+            if not TRAILING_OR_PATTERN.search(line):
+                self.finish_paths()
+            return
+
+        nodes = _course_nodes(line)
+        self.groups[group].extend(nodes)
+        if nodes:
+            self.last_course = nodes[-1]
+
+    def finish_paths(self) -> None:
+        """Turn the collected OR alternatives into one requirement."""
+        if not self.paths or self.group is None:
+            return
+        requirement = {
+            "course": f"{self.heading} Requirement",
+            "paths": [
+                {"path_name": path, "courses": _course_nodes(path)}
+                for path in self.paths
+            ],
+        }
+        self.groups[self.group].append(requirement)
+        self.paths = []
+        self.last_course = None
+
+    def finish_group(self) -> None:
+        """Close the current group, recording how many classes it needs."""
+        self.finish_paths()
+        if self.group is None:
+            return
+        entries = self.groups[self.group]
+        if self.count:
+            requirement: Dict[str, Any] = {
+                "course": f"{self.heading} Requirement",
+                "count": self.count,
+            }
+            if entries:
+                # e.g. "Departmental Natural Science: 2 classes" from a list
+                requirement["courses"] = entries
+            # Otherwise e.g. "LIT: 1 class" names no specific courses
+            self.groups[self.group] = [requirement]
+        elif not entries:
+            del self.groups[self.group]
+        self.group = None
+
+    def build(self) -> Dict[str, Any]:
+        """Return the degree as a course structure dictionary."""
+        self.finish_group()
+        structure: Dict[str, Any] = {"degree": self.name, "requirements": self.groups}
+        if self.total_credits is not None:
+            structure["credits"] = {"total_credits": self.total_credits}
+        return structure
+
+
+def parse_degree_paths(
+    lines: Iterable[str],
+    default_degree: str = "Degree",
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Parse streamed catalog text into one course structure per degree.
+
+    Args:
+        lines: Catalog text lines (e.g. an open file)
+        default_degree: Name for a listing that does not name its degree
+
+    Yields:
+        Tuples of (degree name, course structure dictionary)
+    """
+    builder: Optional[_DegreeBuilder] = None
+
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        degree = DEGREE_PATTERN.match(line)
+        if degree and not COURSE_PATTERN.search(line):
+            if builder is not None and builder.groups:
+                yield builder.name, builder.build()
+            name = degree.group("named") or " ".join(degree.group("title", "kind"))
+            builder = _DegreeBuilder(name.strip())
+            continue
+
+        if builder is None:
+            builder = _DegreeBuilder(default_degree)
+
+        total = TOTAL_CREDITS_PATTERN.match(line)
+        if total:
+            builder.total_credits = int(total.group(1))
+            continue
+
+        header = HEADER_PATTERN.match(line)
+        if header and not PREREQ_PATTERN.match(line) and not COURSE_PATTERN.search(
+            header.group("name")
+        ):
+            builder.start_group(header.group("name"), header.group("rest"))
+            continue
+
+        builder.add_line(line)
+
+    if builder is not None and (builder.groups or builder.paths):
+        yield builder.name, builder.build()
+
+
+def parse_degree_pages(
+    pages: Iterable[str],
+    default_degree: str = "Degree",
+) -> Iterator[Tuple[str, Dict[str, Any], Set[int]]]:
+    """
+    Parse catalog text page by page, noting the pages each degree spans.
+
+    A page shared by two listings counts for both, so the spanned pages can
+    be used to regenerate only the degrees on changed pages.
+
+    Args:
+        pages: Text of each page (e.g. from extract_text_from_pdf)
+        default_degree: Name for a listing that does not name its degree
+
+    Yields:
+        Tuples of (degree name, course structure dictionary, 0-based page
+        numbers the listing spans)
+    """
+    spanned: Set[int] = set()
+    current = 0
+
+    def lines() -> Iterator[str]:
+        nonlocal current
+        for number, text in enumerate(pages):
+            current = number
+            spanned.add(number)
+            yield from text.splitlines()
+
+    for name, structure in parse_degree_paths(lines(), default_degree):
+        yield name, structure, set(spanned)
+        # The line that ended this listing already belongs to the next one
+        spanned.clear()
+        spanned.add(current)
+
+
+def parse_catalog_file(file_path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Parse a catalog text file without loading it into memory.
+
+    Args:
+        file_path: Path to the catalog text file
+
+    Yields:
+        Tuples of (degree name, course structure dictionary)
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        yield from parse_degree_paths(f, default_degree=Path(file_path).stem)
+
+
+def structure_path(name: str, out_dir: str) -> Path:
+    """Path of the course_structure_<degree>.json file for a degree."""
+    return Path(out_dir) / f"course_structure_{_slug(name)}.json"
+
+
+def write_structure(name: str, structure: Dict[str, Any], out_dir: str) -> Path:
+    """
+    Save one degree's course structure.
+
+    Args:
+        name: Degree name
+        structure: Course structure dictionary
+        out_dir: Directory for the course_structure_<degree>.json files
+
+    Returns:
+        Path of the written file
+    """
+    output_file = structure_path(name, out_dir)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with output_file.open("w", encoding="utf-8") as f:
+        json.dump(structure, f, indent=2, ensure_ascii=False)
+    logger.info("Saved %s to: %s", name, output_file)
+    return output_file
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command-line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Convert catalog degree path text into course structures."
+    )
+    parser.add_argument("input", help="Catalog text file")
+    parser.add_argument(
+        "--out-dir",
+        default=DATA_DIR,
+        help="Directory for the course_structure_<degree>.json files",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Write one course structure file per degree found in the input."""
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+
+    count = 0
+    for name, structure in parse_catalog_file(args.input):
+        write_structure(name, structure, args.out_dir)
+        count += 1
+
+    print(f"✅ Parsed {count} degree(s) from {args.input}")
+
+
+if __name__ == "__main__":
+    main()
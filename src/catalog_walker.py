@@ -0,0 +1,140 @@
+"""Single-pass traversal of course structure dictionaries.
+
+Course structures nest courses under general-education option lists, year
+lists, OR-paths and top-level path requirements. ``walk_catalog`` flattens
+all of these into one lazy stream of course records with their context, so
+consumers never repeat the traversal or build intermediate lists.
+"""
+
+import re
+from typing import Any, Dict, Iterator, Optional
+
+COURSE_CODE_PATTERN = re.compile(r"\b([A-Z]{2,4})\s*(\d{4})\b")
+
+
+def course_code(text: str) -> Optional[str]:
+    """
+    Extract a normalized course code (e.g. "CPSC 1010") from text.
+
+    Args:
+        text: Course title or free-form course reference
+
+    Returns:
+        Normalized course code, or None if no code is present
+    """
+    match = COURSE_CODE_PATTERN.search(text.upper())
+    if not match:
+        return None
+    return f"{match.group(1)} {match.group(2)}"
+
+
+def walk_catalog(course_structure: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield every course entry of a course structure.
+
+    Entries without a course code (e.g. "Natural Science Requirement") are
+    yielded too, with "code" set to None. Both the flat layout written by
+    create_course_structure and the layout that wraps a category in a key of
+    the same name (as in frontend/API/preprocess.py) are understood.
+
+    Args:
+        course_structure: Course structure dictionary
+
+    Yields:
+        Records with keys:
+            "course": the raw course dictionary
+            "code": normalized course code, or None
+            "category": top-level key (e.g. "major_related_classes")
+            "group": option list or year key (e.g. "mathematics",
+                "sophomore_year"), or None
+            "year": the group when it names a year, else None
+            "requirement": name of the requirement the course is an
+                alternative for, or None
+            "option": index of the alternative within that requirement
+            "path": path name when the course belongs to an OR-path
+            "parent": the raw requirement dictionary owning the paths, if any
+    """
+    for category, details in course_structure.items():
+        if not isinstance(details, dict):
+            continue
+        if isinstance(details.get(category), dict) and len(details) == 1:
+            details = details[category]
+
+        if "class_options" in details:
+            # Each option list is a requirement met by any one of its entries
+            for group, options in details["class_options"].items():
+                for option, node in enumerate(options):
+                    yield from _walk_node(
+                        node, category, group, requirement=group, option=option
+                    )
+        elif "paths" in details:
+            yield from _walk_node(details, category, None)
+        else:
+            yield from _walk_groups(details, category)
+
+
+def _walk_groups(groups: Dict[str, Any], category: str) -> Iterator[Dict[str, Any]]:
+    """Walk a mapping of group names (e.g. years) to lists of course entries."""
+    for group, nodes in groups.items():
+        if isinstance(nodes, list):
+            for node in nodes:
+                if isinstance(node, dict):
+                    yield from _walk_node(node, category, group)
+        elif isinstance(nodes, dict):
+            if "course" in nodes or "paths" in nodes:
+                yield from _walk_node(nodes, category, group)
+            else:
+                yield from _walk_groups(nodes, category)
+
+
+def _walk_node(
+    node: Dict[str, Any],
+    category: str,
+    group: Optional[str],
+    requirement: Optional[str] = None,
+    option: Optional[int] = None,
+    path: Optional[str] = None,
+    parent: Optional[Dict[str, Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield the course records of one entry, expanding paths and groups."""
+    if "paths" in node:
+        for path_option, path_node in enumerate(node["paths"]):
+            yield from _walk_node(
+                path_node,
+                category,
+                group,
+                requirement=node.get("course"),
+                option=path_option,
+                path=path_node.get("path_name"),
+                parent=node,
+            )
+        return
+
+    if "courses" in node:
+        for sub_node in node["courses"]:
+            yield from _walk_node(
+                sub_node,
+                category,
+                group,
+                requirement,
+                option,
+                path or node.get("path_name"),
+                parent,
+            )
+        return
+
+    if "course" not in node:
+        return
+
+    name = node["course"]
+    yield {
+        "course": node,
+        "code": course_code(name) if isinstance(name, str) else None,
+        "category": category,
+        "group": group,
+        "year": group if group and group.endswith("_year") else None,
+        "requirement": requirement,
+        "option": option,
+        "path": path,
+        "parent": parent,
+    }
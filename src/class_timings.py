@@ -1,124 +1,412 @@
-"""Generate class schedules with randomized time slots."""
+"""Generate class schedules with randomized time slots.
 
+Section times are drawn from a counter-based generator (SplitMix64 over the
+section's position in the catalog), so a seed fully determines the output,
+with or without NumPy, and any slice of the catalog can be generated
+independently. NumPy, when installed, draws a whole chunk of sections in one
+vectorized operation.
+"""
+
+import argparse
 import json
 import logging
 import random
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List
-
-from src.config import MWF_TIME_SLOTS, TTH_TIME_SLOTS
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+from src.catalog_walker import walk_catalog
+from src.config import (
+    COURSE_STRUCTURE_PATH,
+    MWF_TIME_SLOTS,
+    SCHEDULE_CHUNK_COURSES,
+    SCHEDULE_SEED,
+    TIMETABLE_REPAIR_PASSES,
+    TIMETABLE_ROOMS_PER_SLOT,
+    TTH_TIME_SLOTS,
+)
+from src.structure_loader import load_structure
+from src.time_slots import COMPILED_SLOTS
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+_MASK64 = (1 << 64) - 1
+_GAMMA = 0x9E3779B97F4A7C15
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+
+# Balanced timetable penalties: same-year required sections in overlapping
+# slots, sections of one course in overlapping slots, and per-slot load
+_YEAR_WEIGHT = 10
+_COURSE_WEIGHT = 3
+_LOAD_WEIGHT = 1
+
 
 def generate_schedule_with_times(
     course_data: Dict[str, Any],
     num_sections: int = 3,
+    seed: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
     """
     Generate class schedules with randomized time slots.
 
+    Every coded course in the structure gets sections: general education
+    options, major courses by year, and the courses of each OR-path. A
+    course listed under several categories (e.g. ENGL 2120 under both
+    literature and global challenges) yields a single record with one
+    section set; its memberships are merged into a "categories" list.
+
     Args:
         course_data: Dictionary containing course information
         num_sections: Number of sections to generate per course
+        seed: Seed making the time slots reproducible; drawn from the
+            ``random`` module if omitted
 
     Returns:
-        List of courses with section information
+        List of courses with section information, one per course code
     """
-    schedule = []
+    return list(
+        iter_courses_with_sections(
+            merge_catalog_courses(course_data), num_sections, seed
+        )
+    )
 
-    for category, details in course_data.items():
-        if "class_options" in details:
-            # Process general education classes
-            for subcategory, courses in details["class_options"].items():
-                for course in courses:
-                    if "courses" in course:
-                        # Nested courses (e.g., labs with lectures)
-                        for sub_course in course["courses"]:
-                            schedule.append(
-                                _add_course_with_sections(
-                                    sub_course, num_sections
-                                )
-                            )
-                    else:
-                        schedule.append(
-                            _add_course_with_sections(course, num_sections)
-                        )
-
-        elif "major_related_classes" in details:
-            # Process major-specific classes
-            for year, courses in details["major_related_classes"].items():
-                for course in courses:
-                    if "paths" in course:
-                        # Handle course paths
-                        for path in course["paths"]:
-                            for sub_course in path["courses"]:
-                                schedule.append(
-                                    _add_course_with_sections(
-                                        sub_course, num_sections
-                                    )
-                                )
-                    else:
-                        schedule.append(
-                            _add_course_with_sections(course, num_sections)
-                        )
-
-        elif "major_related_paths" in details:
-            # Process major paths
-            for path in details["major_related_paths"]["paths"]:
-                for sub_course in path["courses"]:
-                    schedule.append(
-                        _add_course_with_sections(sub_course, num_sections)
-                    )
 
-    return schedule
+def iter_courses_with_sections(
+    courses: Iterable[Dict[str, Any]],
+    num_sections: int = 3,
+    seed: Optional[int] = None,
+    chunk_size: int = SCHEDULE_CHUNK_COURSES,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily attach randomized sections to courses.
+
+    Courses are consumed ``chunk_size`` at a time; the day patterns and time
+    slots for a whole chunk are drawn in one batch and records are built as
+    they are yielded. Section ``j`` of the ``i``-th course always gets the
+    same time for a given seed, whatever the chunk size or backend.
+
+    Args:
+        courses: Course dictionaries (not modified)
+        num_sections: Number of sections to generate per course
+        seed: Seed making the time slots reproducible; drawn from the
+            ``random`` module if omitted
+        chunk_size: Courses drawn per batch
+
+    Yields:
+        Copies of the courses with an added "sections" list
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    seed &= _MASK64
+
+    courses = iter(courses)
+    position = 0
+    while True:
+        chunk = list(islice(courses, chunk_size))
+        if not chunk:
+            return
+
+        days, slots = _draw_sections(seed, position, len(chunk) * num_sections)
+        for i, course in enumerate(chunk):
+            row = slice(i * num_sections, (i + 1) * num_sections)
+            yield _add_course_with_sections(course, days[row], slots[row])
+        position += len(chunk) * num_sections
+
+
+def _draw_sections(seed: int, start: int, count: int) -> Tuple[List[str], List[str]]:
+    """
+    Draw day patterns and time slots for ``count`` consecutive sections.
+
+    Each section's draw is SplitMix64 of its global position: the low bit
+    picks MWF or TTh and the remaining bits pick the slot.
+
+    Returns:
+        Tuple of (day types, time slots) lists
+    """
+    if np is not None:
+        with np.errstate(over="ignore"):
+            state = np.arange(start + 1, start + count + 1, dtype=np.uint64)
+            z = np.uint64(seed) + state * np.uint64(_GAMMA)
+            z = (z ^ (z >> np.uint64(30))) * np.uint64(_MIX1)
+            z = (z ^ (z >> np.uint64(27))) * np.uint64(_MIX2)
+            z = z ^ (z >> np.uint64(31))
+        is_mwf = (z & np.uint64(1)).astype(bool)
+        rest = z >> np.uint64(1)
+        mwf = np.array(MWF_TIME_SLOTS, dtype=object)
+        tth = np.array(TTH_TIME_SLOTS, dtype=object)
+        slots = np.where(
+            is_mwf,
+            mwf[(rest % np.uint64(len(mwf))).astype(np.intp)],
+            tth[(rest % np.uint64(len(tth))).astype(np.intp)],
+        )
+        days = np.where(is_mwf, "MWF", "TTh").tolist()
+        return days, slots.tolist()
+
+    days, slots = [], []
+    for position in range(start + 1, start + count + 1):
+        z = (seed + position * _GAMMA) & _MASK64
+        z = ((z ^ (z >> 30)) * _MIX1) & _MASK64
+        z = ((z ^ (z >> 27)) * _MIX2) & _MASK64
+        z ^= z >> 31
+        if z & 1:
+            days.append("MWF")
+            slots.append(MWF_TIME_SLOTS[(z >> 1) % len(MWF_TIME_SLOTS)])
+        else:
+            days.append("TTh")
+            slots.append(TTH_TIME_SLOTS[(z >> 1) % len(TTH_TIME_SLOTS)])
+    return days, slots
+
+
+def merge_catalog_courses(course_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Collect one record per course code from a course structure.
+
+    The first listing of a course provides its title and other fields;
+    later listings only fill in missing fields, add prerequisites and add
+    their group (or path) to "categories".
+
+    Args:
+        course_data: Dictionary containing course information
+
+    Returns:
+        Course dictionaries in first-listed order
+    """
+    courses: Dict[str, Dict[str, Any]] = {}
+
+    for record in walk_catalog(course_data):
+        code = record["code"]
+        if not code:
+            continue
+
+        node = record["course"]
+        merged = courses.get(code)
+        if merged is None:
+            merged = courses[code] = dict(node, categories=[])
+        else:
+            for key, value in node.items():
+                merged.setdefault(key, value)
+            if node.get("prereq"):
+                prereqs = merged["prereq"] + node["prereq"]
+                merged["prereq"] = list(dict.fromkeys(prereqs))
+
+        label = record["group"] or record["path"] or record["category"]
+        if label not in merged["categories"]:
+            merged["categories"].append(label)
+
+    return list(courses.values())
 
 
 def _add_course_with_sections(
     course: Dict[str, Any],
-    num_sections: int,
+    days: List[str],
+    slots: List[str],
 ) -> Dict[str, Any]:
     """
     Add section information to a course.
 
     Args:
         course: Course dictionary with 'course' and 'credits' keys
-        num_sections: Number of sections to generate
+        days: Day type of each section
+        slots: Time slot of each section
 
     Returns:
         Course dictionary with added 'sections' list
     """
-    sections = []
-
-    for section_id in range(1, num_sections + 1):
-        # Randomly choose between MWF and TTh schedules
-        if random.choice([True, False]):
-            time_slot = random.choice(MWF_TIME_SLOTS)
-            day_type = "MWF"
-        else:
-            time_slot = random.choice(TTH_TIME_SLOTS)
-            day_type = "TTh"
-
-        sections.append(
-            {
-                "section_id": section_id,
-                "day_type": day_type,
-                "time_slot": time_slot,
-            }
-        )
-
     # Create a copy to avoid modifying original
     course_with_sections = course.copy()
-    course_with_sections["sections"] = sections
+    course_with_sections["sections"] = [
+        {"section_id": section_id, "day_type": day_type, "time_slot": time_slot}
+        for section_id, (day_type, time_slot) in enumerate(zip(days, slots), 1)
+    ]
 
     return course_with_sections
 
 
+def generate_balanced_schedule(
+    course_data: Dict[str, Any],
+    num_sections: int = 3,
+    rooms_per_slot: Union[int, Dict[Tuple[str, str], int]] = TIMETABLE_ROOMS_PER_SLOT,
+    seed: Optional[int] = None,
+    max_repair_passes: int = TIMETABLE_REPAIR_PASSES,
+) -> List[Dict[str, Any]]:
+    """
+    Generate a room-limited, load-balanced timetable.
+
+    Sections are vertices of a conflict graph: sections of required courses
+    from the same year conflict when their slots overlap, and so do sections
+    of the same course. Sections are colored with slots greedily, most
+    constrained first, then repaired by local search that moves one section
+    at a time to a cheaper slot with a free room until nothing improves.
+    Conflicts are minimized but not forbidden, since a year can have more
+    required sections than there are slots.
+
+    Args:
+        course_data: Dictionary containing course information
+        num_sections: Number of sections to generate per course
+        rooms_per_slot: Rooms available in every slot, or rooms by
+            (day_type, time_slot); slots left out have no rooms
+        seed: Seed for tie-breaking; drawn from the ``random`` module if
+            omitted
+        max_repair_passes: Maximum local-search passes over all sections
+
+    Returns:
+        List of courses with section information, in the same format as
+        generate_schedule_with_times
+
+    Raises:
+        ValueError: If there are more sections than rooms
+    """
+    courses = merge_catalog_courses(course_data)
+    slots = list(COMPILED_SLOTS)
+    if isinstance(rooms_per_slot, int):
+        capacity = [rooms_per_slot] * len(slots)
+    else:
+        capacity = [rooms_per_slot.get(slot, 0) for slot in slots]
+
+    total = len(courses) * num_sections
+    if total > sum(capacity):
+        raise ValueError(
+            f"{total} sections do not fit in {sum(capacity)} rooms across all slots"
+        )
+
+    # Slots sharing at least one meeting minute, including the slot itself
+    masks = [COMPILED_SLOTS[slot] for slot in slots]
+    overlaps = [
+        [j for j, other in enumerate(masks) if mask & other] for mask in masks
+    ]
+
+    # Conflict groups with their weights: each course, and each year of
+    # required courses
+    group_ids: Dict[Tuple[str, str], int] = {}
+    weights: List[int] = []
+
+    def group(kind: str, name: str, weight: int) -> int:
+        key = (kind, name)
+        if key not in group_ids:
+            group_ids[key] = len(weights)
+            weights.append(weight)
+        return group_ids[key]
+
+    section_groups: List[List[int]] = []
+    for course in courses:
+        groups = [group("course", course["course"], _COURSE_WEIGHT)]
+        groups.extend(
+            group("year", category, _YEAR_WEIGHT)
+            for category in course.get("categories", [])
+            if category.endswith("_year")
+        )
+        section_groups.extend([groups] * num_sections)
+
+    load = [0] * len(slots)
+    counts: List[Dict[int, int]] = [{} for _ in slots]
+    assignment = [-1] * total
+
+    def cost(section: int, slot: int) -> int:
+        """Penalty of placing a section in a slot, given everyone else."""
+        penalty = _LOAD_WEIGHT * load[slot]
+        for g in section_groups[section]:
+            penalty += weights[g] * sum(counts[j].get(g, 0) for j in overlaps[slot])
+        return penalty
+
+    def place(section: int, slot: int, delta: int) -> None:
+        load[slot] += delta
+        for g in section_groups[section]:
+            counts[slot][g] = counts[slot].get(g, 0) + delta
+        assignment[section] = slot if delta > 0 else -1
+
+    def best_slot(section: int) -> int:
+        open_slots = [j for j in range(len(slots)) if load[j] < capacity[j]]
+        return min(open_slots, key=lambda j: (cost(section, j), tiebreak[j]))
+
+    rng = random.Random(seed if seed is not None else random.getrandbits(64))
+    tiebreak = list(range(len(slots)))
+
+    # Greedy coloring, sections in the most conflict groups first
+    order = list(range(total))
+    rng.shuffle(order)
+    order.sort(key=lambda s: -sum(weights[g] for g in section_groups[s]))
+    for section in order:
+        rng.shuffle(tiebreak)
+        place(section, best_slot(section), 1)
+    greedy_conflicts = _count_conflicts(section_groups, assignment, overlaps)
+
+    # Local search repair: move sections while that strictly lowers the cost
+    for _ in range(max_repair_passes):
+        moved = 0
+        for section in order:
+            current = assignment[section]
+            place(section, current, -1)
+            current_cost = cost(section, current)
+            target = best_slot(section)
+            if cost(section, target) < current_cost:
+                current = target
+                moved += 1
+            place(section, current, 1)
+        if not moved:
+            break
+
+    logger.info(
+        "Balanced timetable: %d sections in %d slots, "
+        "conflicting pairs %d after greedy, %d after repair",
+        total,
+        len(slots),
+        greedy_conflicts,
+        _count_conflicts(section_groups, assignment, overlaps),
+    )
+
+    schedule = []
+    for i, course in enumerate(courses):
+        chosen = sorted(assignment[i * num_sections : (i + 1) * num_sections])
+        schedule.append(
+            _add_course_with_sections(
+                course,
+                [slots[j][0] for j in chosen],
+                [slots[j][1] for j in chosen],
+            )
+        )
+    return schedule
+
+
+def _count_conflicts(
+    section_groups: List[List[int]],
+    assignment: List[int],
+    overlaps: List[List[int]],
+) -> int:
+    """Count section pairs that share a conflict group and overlapping slots."""
+    by_group: Dict[int, List[int]] = {}
+    for section, groups in enumerate(section_groups):
+        for g in groups:
+            by_group.setdefault(g, []).append(assignment[section])
+
+    conflicts = 0
+    for slots in by_group.values():
+        per_slot: Dict[int, int] = {}
+        for slot in slots:
+            per_slot[slot] = per_slot.get(slot, 0) + 1
+        for slot, count in per_slot.items():
+            conflicts += count * (count - 1) // 2
+            conflicts += sum(
+                count * per_slot.get(other, 0)
+                for other in overlaps[slot]
+                if other > slot
+            )
+    return conflicts
+
+
 def load_course_data(file_path: str) -> Dict[str, Any]:
     """
     Load course data from JSON file.
 
+    Every known course structure variant is accepted and normalized to the
+    layout of create_course_structure (see src.structure_loader).
+
     Args:
         file_path: Path to JSON file
 
@@ -128,15 +416,12 @@ def load_course_data(file_path: str) -> Dict[str, Any]:
     Raises:
         FileNotFoundError: If file doesn't exist
         json.JSONDecodeError: If file is not valid JSON
+        ValueError: If file is not a course structure
     """
-    path = Path(file_path)
-
-    if not path.exists():
+    if not Path(file_path).exists():
         raise FileNotFoundError(f"Course data file not found: {file_path}")
 
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-
+    data = load_structure(file_path)
     logger.info("Loaded course data from: %s", file_path)
     return data
 
@@ -161,13 +446,54 @@ def save_schedule(
     logger.info("Schedule saved to: %s (total courses: %d)", output_path, len(schedule))
 
 
-def main() -> None:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command-line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Generate class sections with time slots."
+    )
+    parser.add_argument(
+        "--structure",
+        default=COURSE_STRUCTURE_PATH,
+        help="Course structure JSON file, in any known layout "
+        f"(default: {COURSE_STRUCTURE_PATH})",
+    )
+    parser.add_argument(
+        "--balanced",
+        action="store_true",
+        help="Build a room-limited, load-balanced timetable instead of random slots",
+    )
+    parser.add_argument(
+        "--rooms",
+        type=int,
+        default=TIMETABLE_ROOMS_PER_SLOT,
+        help="Rooms per time slot in --balanced mode "
+        f"(default: {TIMETABLE_ROOMS_PER_SLOT})",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=SCHEDULE_SEED,
+        help=f"Random seed (default: {SCHEDULE_SEED})",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """Main entry point for class schedule generation."""
     logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
 
     # Load course structure
     try:
-        course_data = load_course_data("data/course_structure.json")
+        course_data = load_course_data(args.structure)
     except FileNotFoundError:
         logger.error(
             "Course structure file not found. "
@@ -177,7 +503,18 @@ def main() -> None:
 
     # Generate schedule with time slots
     logger.info("Generating class schedule with time slots...")
-    schedule = generate_schedule_with_times(course_data, num_sections=3)
+    if args.balanced:
+        try:
+            schedule = generate_balanced_schedule(
+                course_data, num_sections=3, rooms_per_slot=args.rooms, seed=args.seed
+            )
+        except ValueError as e:
+            logger.error("Cannot build timetable: %s", e)
+            return
+    else:
+        schedule = generate_schedule_with_times(
+            course_data, num_sections=3, seed=args.seed
+        )
 
     # Save to file
     save_schedule(schedule)
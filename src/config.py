@@ -1,9 +1,60 @@
 """Configuration constants for AI Advisor application."""
 
+import os
+
+# Project Paths
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+
 # AWS Bedrock Configuration
 AWS_REGION = "us-west-2"
 KNOWLEDGE_BASE_ID = "IIPMMYP0DR"
 
+# AWS Client Pooling
+AWS_MAX_POOL_CONNECTIONS = 50
+AWS_CONNECT_TIMEOUT = 5
+AWS_READ_TIMEOUT = 120
+AWS_TCP_KEEPALIVE = True
+# botocore's own retries are off; src.resilience retries instead. "adaptive"
+# mode still rate-limits sends client-side after throttling responses.
+AWS_RETRY_MODE = "adaptive"
+# Client timeouts (seconds) available to deadline-bound calls; a call gets the
+# largest one that fits in its remaining budget. Each bucket is a separate
+# pooled client per service, so keep the list short.
+AWS_TIMEOUT_BUCKETS = (10, 30, 60)
+
+# Bedrock Resilience (src.resilience)
+# Retries of throttling and transient errors with full-jitter backoff
+BEDROCK_MAX_ATTEMPTS = 4
+BEDROCK_BACKOFF_BASE_SECONDS = 0.5
+BEDROCK_BACKOFF_MAX_SECONDS = 8.0
+BEDROCK_RETRYABLE_ERRORS = (
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "InternalServerException",
+    "ModelNotReadyException",
+)
+# Send a duplicate request when one runs past the recent p95 latency; the
+# first answer wins. At most BEDROCK_HEDGE_MAX_WORKERS calls are hedged at
+# once (primary and hedge each take a pool worker); others run unhedged
+BEDROCK_HEDGE_ENABLED = False
+BEDROCK_HEDGE_MIN_SAMPLES = 20
+BEDROCK_HEDGE_MAX_WORKERS = 8
+BEDROCK_LATENCY_WINDOW = 200
+# Reject calls for a cooldown after this many consecutive failed calls
+# (each counted once, after its retries are exhausted)
+BEDROCK_BREAKER_FAILURE_THRESHOLD = 5
+BEDROCK_BREAKER_RESET_SECONDS = 30.0
+# Serve the locally solved schedule when Bedrock is unavailable
+BEDROCK_FALLBACK_TO_LOCAL = True
+
+# End-to-end deadline of call_api and stream_call_api (None waits for every
+# stage to finish) and the share of the remaining budget given to
+# retrieve_and_generate; the rest is kept for the formatting model
+CALL_API_DEADLINE_SECONDS = 90.0
+CALL_API_RETRIEVE_SHARE = 0.8
+
 # Model ARNs
 RETRIEVE_MODEL_ARN = (
     "arn:aws:bedrock:us-west-2::foundation-model/"
@@ -19,11 +70,84 @@ MAX_GENERATION_LENGTH = 512
 TEMPERATURE = 1.0
 TOP_P = 0.1
 
+# Prompt Building
+# Approximate token budget for the eligible class offerings in the prompt
+PROMPT_OFFERINGS_TOKEN_BUDGET = 800
+PROMPT_CHARS_PER_TOKEN = 4
+
+# Response Parsing
+# Minimum share of parsed courses matching a real section before the
+# FORMAT_MODEL_ID formatting call is skipped
+PARSER_MIN_CONFIDENCE = 0.6
+
 # Credit Requirements
 MIN_CREDITS = 12
 TARGET_MIN_CREDITS = 16
 TARGET_MAX_CREDITS = 18
 
+# Data Files
+COURSE_STRUCTURE_PATH = os.path.join(DATA_DIR, "course_structure.json")
+CLASS_SCHEDULE_PATH = os.path.join(DATA_DIR, "class_schedule.json")
+CATALOG_SNAPSHOT_PATH = os.path.join(DATA_DIR, "catalog_snapshot.pickle")
+STRUCTURE_CACHE_DIR = os.path.join(DATA_DIR, "structure_cache")
+
+# Response Cache
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_PATH = os.path.join(DATA_DIR, "response_cache.sqlite3")
+RESPONSE_CACHE_MAX_ENTRIES = 1024
+# Rows kept in the SQLite file; the oldest are deleted beyond this
+RESPONSE_CACHE_MAX_DISK_ENTRIES = 50000
+RESPONSE_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Metrics
+# Upper bounds (seconds) of the stage latency histogram buckets
+METRICS_LATENCY_BUCKETS = (
+    0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0
+)
+
+# Async Pipeline
+ASYNC_MAX_WORKERS = 32
+
+# Batch Processing
+BATCH_MAX_WORKERS = 8
+BATCH_RATE_LIMIT_PER_SECOND = 4.0
+
+# Web Form Submissions
+SUBMISSIONS_DB_PATH = os.path.join(DATA_DIR, "submissions.sqlite3")
+
+# Background Jobs
+JOB_MAX_WORKERS = 4
+JOB_QUEUE_DEPTH = 64
+JOB_TIMEOUT_SECONDS = 90
+JOB_RESULT_TTL_SECONDS = 600
+
+# Local Schedule Solver
+SOLVER_MAX_NODES = 50000
+
+# PDF Catalog Extraction
+# Worker processes (None uses every CPU) and pages per extraction task
+PDF_MAX_WORKERS = None
+PDF_CHUNK_PAGES = 16
+# Extracted page text keyed by page content hash
+PDF_PAGE_CACHE_PATH = os.path.join(DATA_DIR, "pdf_page_cache.sqlite3")
+
+# Class Schedule Generation
+# Seed used by `python -m src.class_timings` (None draws a fresh schedule)
+SCHEDULE_SEED = 2025
+SCHEDULE_CHUNK_COURSES = 4096
+# Balanced timetable mode (`python -m src.class_timings --balanced`)
+TIMETABLE_ROOMS_PER_SLOT = 12
+TIMETABLE_REPAIR_PASSES = 20
+
+# Offline Benchmark (`python -m src.benchmark`)
+BENCHMARK_RESULTS_PATH = os.path.join(DATA_DIR, "benchmark_results.json")
+BENCHMARK_STUDENTS = 50
+BENCHMARK_CONCURRENCY = 8
+BENCHMARK_SEED = 2025
+# Simulated Bedrock latency (milliseconds) for the two model hops
+BENCHMARK_RETRIEVE_LATENCY_MS = 250.0
+BENCHMARK_FORMAT_LATENCY_MS = 80.0
+
 # Time Slots
 MWF_TIME_SLOTS = [
     "8:00 AM - 8:50 AM",
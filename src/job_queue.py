@@ -0,0 +1,272 @@
+"""In-process background job queue for slow recommendation requests.
+
+Web requests enqueue a job and return its id immediately; a fixed pool of
+worker threads runs the jobs, and clients poll the job's status (or block
+in wait, e.g. to push Server-Sent Events) until the result is ready. A job
+that returns an iterator is consumed on the worker and its items are
+published as they arrive, so clients see partial results. Queue depth, worker count and per-job timeout are bounded so a
+burst of requests cannot exhaust the web server: each job gets a deadline
+for its own calls, and a streaming job is stopped once it expires, which
+frees the worker for the next job.
+
+Jobs live in the memory of one process, so the web app must run as a
+single process (with several threads) for clients to find them.
+"""
+
+import logging
+import queue
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from src.config import (
+    JOB_MAX_WORKERS,
+    JOB_QUEUE_DEPTH,
+    JOB_RESULT_TTL_SECONDS,
+    JOB_TIMEOUT_SECONDS,
+)
+from src.resilience import Deadline
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class JobQueue:
+    """Bounded queue of jobs run by a pool of daemon worker threads."""
+
+    def __init__(
+        self,
+        max_workers: int = JOB_MAX_WORKERS,
+        max_queued: int = JOB_QUEUE_DEPTH,
+        timeout: float = JOB_TIMEOUT_SECONDS,
+        result_ttl: float = JOB_RESULT_TTL_SECONDS,
+    ) -> None:
+        """
+        Create the queue and start its workers.
+
+        Args:
+            max_workers: Number of worker threads
+            max_queued: Jobs allowed to wait before submit is refused
+            timeout: Seconds a job may run; passed to it as its deadline
+            result_ttl: Seconds finished jobs are kept for polling
+        """
+        self.timeout = timeout
+        self.result_ttl = result_ttl
+
+        self._queue: "queue.Queue[str]" = queue.Queue(maxsize=max_queued)
+        self._lock = threading.Lock()
+        # Notified whenever a job publishes an item or finishes
+        self._changed = threading.Condition(self._lock)
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._funcs: Dict[str, Callable[[Deadline], Any]] = {}
+
+        for i in range(max_workers):
+            worker = threading.Thread(
+                target=self._work, name=f"job-worker-{i}", daemon=True
+            )
+            worker.start()
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> str:
+        """
+        Enqueue a job.
+
+        The job runs as ``func(*args, deadline=deadline)``, where deadline is
+        a src.resilience.Deadline expiring after the queue's timeout; func
+        should bound its blocking calls by it. If func returns an iterator,
+        its items are collected into the job's result as they arrive, and
+        iteration stops when the deadline expires.
+
+        Args:
+            func: Function to run on a worker thread
+            *args: Positional arguments passed to ``func``
+
+        Returns:
+            Job id for status polling
+
+        Raises:
+            QueueFullError: If the queue is at capacity
+        """
+        self._prune()
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = {
+                "id": job_id,
+                "status": "queued",
+                "result": None,
+                "error": None,
+                "created": time.time(),
+                "started": None,
+                "finished": None,
+            }
+            self._funcs[job_id] = lambda deadline: func(*args, deadline=deadline)
+
+        try:
+            self._queue.put_nowait(job_id)
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job_id]
+                del self._funcs[job_id]
+            raise QueueFullError("Job queue is full") from None
+        return job_id
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job's status.
+
+        Status is "queued", "running", "done", "failed" or "timeout". While a
+        streaming job runs, "result" holds the items received so far. A job
+        still running past the timeout is reported as "timeout"; it keeps
+        the items it published, and its eventual return value is discarded.
+
+        Args:
+            job_id: Id returned by submit
+
+        Returns:
+            Copy of the job record, or None if the id is unknown or expired
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            self._check_timeout(job, time.time())
+            return self._snapshot(job)
+
+    def wait(self, job_id: str, seen: int, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Wait until a job publishes more items or finishes.
+
+        Args:
+            job_id: Id returned by submit
+            seen: Number of result items the caller already has
+            timeout: Longest time to wait in seconds
+
+        Returns:
+            Copy of the job record (as from status) once its result holds
+            more than ``seen`` items, it is no longer queued or running, or
+            the timeout passes; None if the id is unknown or expired
+        """
+        stop = time.monotonic() + timeout
+        with self._changed:
+            while True:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return None
+                self._check_timeout(job, time.time())
+                result = job["result"]
+                count = len(result) if isinstance(result, list) else 0
+                remaining = stop - time.monotonic()
+                if (
+                    count > seen
+                    or job["status"] not in ("queued", "running")
+                    or remaining <= 0
+                ):
+                    return self._snapshot(job)
+                self._changed.wait(remaining)
+
+    @staticmethod
+    def _snapshot(job: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a job record so callers never see later updates (lock held)."""
+        info = dict(job)
+        if isinstance(info["result"], list):
+            info["result"] = list(info["result"])
+        return info
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Count jobs by status.
+
+        Returns:
+            Dictionary of status to job count, plus "queued_depth"
+        """
+        counts: Dict[str, int] = {}
+        now = time.time()
+        with self._lock:
+            for job in self._jobs.values():
+                self._check_timeout(job, now)
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+        counts["queued_depth"] = self._queue.qsize()
+        return counts
+
+    def _check_timeout(self, job: Dict[str, Any], now: float) -> None:
+        """Mark a job that ran past the timeout (lock held)."""
+        if job["status"] == "running" and now - job["started"] > self.timeout:
+            self._expire(job, now)
+
+    def _expire(self, job: Dict[str, Any], now: float) -> None:
+        """Mark a job as timed out, keeping any items it published (lock held)."""
+        job["status"] = "timeout"
+        job["error"] = f"Job exceeded {self.timeout:g} seconds"
+        job["finished"] = now
+        self._changed.notify_all()
+
+    def _prune(self) -> None:
+        """Drop finished jobs older than the result TTL."""
+        cutoff = time.time() - self.result_ttl
+        with self._lock:
+            expired = [
+                job_id
+                for job_id, job in self._jobs.items()
+                if job["finished"] is not None and job["finished"] < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def _work(self) -> None:
+        """Worker loop: run queued jobs and record their outcome."""
+        while True:
+            job_id = self._queue.get()
+            with self._lock:
+                func = self._funcs.pop(job_id, None)
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    job["status"] = "running"
+                    job["started"] = time.time()
+
+            if func is None or job is None:
+                continue
+
+            deadline = Deadline(self.timeout)
+            try:
+                result, error = func(deadline), None
+                if isinstance(result, Iterator):
+                    result = self._consume(job, result, deadline)
+            except Exception as e:
+                logger.exception("Job %s failed: %s", job_id, e)
+                result, error = None, str(e)
+
+            with self._lock:
+                if deadline.expired() and job["status"] == "running":
+                    self._expire(job, time.time())
+                self._check_timeout(job, time.time())
+                if job["status"] == "running":
+                    job["status"] = "failed" if error else "done"
+                    job["result"] = result
+                    job["error"] = error
+                    job["finished"] = time.time()
+                    self._changed.notify_all()
+
+    def _consume(
+        self, job: Dict[str, Any], items: Iterator[Any], deadline: Deadline
+    ) -> Any:
+        """Publish a streaming job's items until it ends or its deadline expires."""
+        published: list = []
+        with self._lock:
+            job["result"] = published
+        try:
+            for item in items:
+                with self._lock:
+                    published.append(item)
+                    self._changed.notify_all()
+                if deadline.expired():
+                    logger.warning("Job %s stopped at its deadline", job["id"])
+                    break
+        finally:
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+        return list(published)
@@ -1,10 +1,15 @@
 """Main entry point for AI Advisor - Student Schedule Planner."""
 
+import argparse
 import logging
 import sys
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-from src.utils import call_api
+from src.batch import run_batch
+from src.catalog_index import get_catalog_index
+from src.config import BATCH_MAX_WORKERS, BATCH_RATE_LIMIT_PER_SECOND
+from src.metrics import get_metrics
+from src.utils import call_api, stream_call_api
 
 # Configure logging
 logging.basicConfig(
@@ -14,7 +19,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def get_user_input() -> Dict[str, any]:
+def get_user_input() -> Dict[str, Any]:
     """
     Collect student information from user input.
 
@@ -73,39 +78,171 @@ def get_user_input() -> Dict[str, any]:
     return student
 
 
+def display_eligible_courses(student: Dict[str, Any]) -> None:
+    """
+    Show the courses the student meets the prerequisites for.
+
+    Args:
+        student: Student dictionary from get_user_input
+    """
+    eligible = get_catalog_index().eligible(
+        student["completed_courses"], student["current_courses"]
+    )
+    if not eligible:
+        return
+
+    print("\n📋 You meet the prerequisites for:")
+    print("   " + ", ".join(eligible))
+
+
 def display_recommendations(
-    student_name: str, recommendations: Optional[List[str]]
-) -> None:
+    student_name: str, recommendations: Optional[Iterable[str]]
+) -> int:
     """
     Display the schedule recommendations to the user.
 
+    Each course is printed as soon as it is produced, so a streaming
+    iterator (see stream_call_api) shows results while the model is still
+    generating.
+
     Args:
         student_name: Name of the student
-        recommendations: List of recommended courses, or None if failed
+        recommendations: Recommended courses (list or iterator), or None if failed
+
+    Returns:
+        Number of courses displayed
     """
     print("\n" + "=" * 60)
     print(f"Schedule Recommendations for {student_name}")
     print("=" * 60)
 
-    if not recommendations:
+    count = 0
+    for count, course in enumerate(recommendations or [], 1):
+        if count == 1:
+            print("\nRecommended Schedule:\n")
+        print(f"{count}. {course}", flush=True)
+
+    if not count:
         print("\n⚠️  Unable to generate recommendations at this time.")
         print("Please check the logs for more details.")
+        return 0
+
+    print("\n" + "=" * 60)
+    return count
+
+
+def display_timings() -> None:
+    """Print the time spent in each pipeline stage during this run."""
+    timings = get_metrics().timings()
+    if not timings:
         return
 
-    print("\nRecommended Schedule:\n")
-    for i, course in enumerate(recommendations, 1):
-        print(f"{i}. {course}")
+    print("\n⏱️  Stage timings:")
+    print(
+        f"   {'stage':<30} {'calls':>6} {'total ms':>10} "
+        f"{'mean ms':>10} {'max ms':>10}"
+    )
+    for stage, stats in sorted(timings.items(), key=lambda item: -item[1]["total_ms"]):
+        print(
+            f"   {stage:<30} {stats['count']:>6} {stats['total_ms']:>10.1f} "
+            f"{stats['mean_ms']:>10.1f} {stats['max_ms']:>10.1f}"
+        )
+
 
-    print("\n" + "=" * 60)
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command-line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
 
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="AI Advisor - Student Schedule Planner"
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="STUDENTS_JSONL",
+        help="Process students from a JSONL file instead of prompting",
+    )
+    parser.add_argument(
+        "--out",
+        metavar="RESULTS_JSONL",
+        default="results.jsonl",
+        help="Output file for --batch results (appended to; resumable)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=BATCH_MAX_WORKERS,
+        help="Concurrent requests in --batch mode",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=BATCH_RATE_LIMIT_PER_SECOND,
+        help="Maximum requests started per second in --batch mode (0 = no limit)",
+    )
+    parser.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="Wait for the full recommendation instead of streaming courses",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print the time spent in each pipeline stage before exiting",
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    return args
 
-def main() -> int:
+
+def main(argv: Optional[List[str]] = None) -> int:
     """
     Main application entry point.
 
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+
     Returns:
         Exit code (0 for success, 1 for failure)
     """
+    args = parse_args(argv)
+    try:
+        return run(args)
+    finally:
+        if args.timings:
+            display_timings()
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Run the batch or interactive mode selected by the arguments.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    if args.batch:
+        try:
+            counts = run_batch(args.batch, args.out, args.workers, args.rate)
+        except FileNotFoundError as e:
+            logger.error("Batch input not found: %s", e)
+            return 1
+        print(
+            f"✅ Processed {counts['processed']} students "
+            f"({counts['failed']} failed, {counts['partial']} partial, "
+            f"{counts['skipped']} already done)"
+        )
+        print(f"   Results saved to: {args.out}")
+        return 1 if counts["failed"] else 0
+
     try:
         # Collect student information
         student = get_user_input()
@@ -115,16 +252,21 @@ def main() -> int:
         logger.debug("Completed courses: %d", len(student["completed_courses"]))
         logger.debug("Current courses: %d", len(student["current_courses"]))
 
+        # Show prerequisite-eligible courses (computed locally)
+        display_eligible_courses(student)
+
         # Call API to get recommendations
         print("\n🔄 Generating schedule recommendations...")
         print("This may take a moment...\n")
 
-        recommendations = call_api(student)
+        recommendations = (
+            call_api(student) if args.no_stream else stream_call_api(student)
+        )
 
-        # Display results
-        display_recommendations(student["name"], recommendations)
+        # Display results (printed as they arrive when streaming)
+        shown = display_recommendations(student["name"], recommendations)
 
-        return 0 if recommendations else 1
+        return 0 if shown else 1
 
     except KeyboardInterrupt:
         print("\n\n⚠️  Operation cancelled by user.")
@@ -0,0 +1,274 @@
+"""In-process latency histograms and counters with Prometheus text export.
+
+Pipeline stages are timed with ``span``, which records wall time into the
+``ai_advisor_stage_seconds`` histogram labeled by stage; ``time_iter`` does
+the same for the waits of a stream, leaving out the consumer's time. Counters cover
+Bedrock requests, errors and bytes sent, and cache hits and misses. The
+registry is thread-safe and rendered in the Prometheus text exposition
+format by the Flask app's /metrics endpoint; the CLI prints a per-stage
+summary with --timings.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Generator, Iterable, Iterator, List, Sequence, Tuple, TypeVar
+
+from src.config import METRICS_LATENCY_BUCKETS
+
+STAGE_SECONDS = "ai_advisor_stage_seconds"
+STAGE_FAILURES = "ai_advisor_stage_failures_total"
+BEDROCK_REQUESTS = "ai_advisor_bedrock_requests_total"
+BEDROCK_ERRORS = "ai_advisor_bedrock_errors_total"
+BEDROCK_BYTES_SENT = "ai_advisor_bedrock_bytes_sent_total"
+CACHE_HITS = "ai_advisor_cache_hits_total"
+CACHE_MISSES = "ai_advisor_cache_misses_total"
+JOBS = "ai_advisor_jobs"
+BEDROCK_RETRIES = "ai_advisor_bedrock_retries_total"
+BEDROCK_HEDGES = "ai_advisor_bedrock_hedges_total"
+BEDROCK_HEDGES_WASTED = "ai_advisor_bedrock_hedges_wasted_total"
+BREAKER_REJECTIONS = "ai_advisor_breaker_rejections_total"
+BREAKER_OPEN = "ai_advisor_breaker_open"
+
+HELP = {
+    STAGE_SECONDS: "Wall time spent in each pipeline stage",
+    STAGE_FAILURES: "Pipeline stages that raised an exception",
+    BEDROCK_REQUESTS: "Bedrock API requests sent",
+    BEDROCK_ERRORS: "Bedrock API requests that failed, by error code",
+    BEDROCK_BYTES_SENT: "Request payload bytes sent to Bedrock",
+    CACHE_HITS: "Cache lookups answered from the cache",
+    CACHE_MISSES: "Cache lookups that missed",
+    JOBS: "Background recommendation jobs by status",
+    BEDROCK_RETRIES: "Bedrock requests retried after a transient error",
+    BEDROCK_HEDGES: "Hedged duplicate Bedrock requests sent",
+    BEDROCK_HEDGES_WASTED: "Requests whose answer was discarded because the other won",
+    BREAKER_REJECTIONS: "Calls rejected by an open circuit breaker",
+    BREAKER_OPEN: "Whether an operation's circuit breaker is open",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+T = TypeVar("T")
+
+
+class Histogram:
+    """Cumulative-bucket histogram of observed values."""
+
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+
+class MetricsRegistry:
+    """Thread-safe collection of labeled counters, gauges and histograms."""
+
+    def __init__(self, buckets: Sequence[float] = METRICS_LATENCY_BUCKETS) -> None:
+        """
+        Create an empty registry.
+
+        Args:
+            buckets: Upper bounds in seconds for latency histograms
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._gauges: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        """Add to a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """Set a gauge to its current value."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record a value in a histogram."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """
+        Time a pipeline stage.
+
+        The elapsed time is recorded even if the block raises, in which case
+        the stage's failure counter is incremented too. A generator closed
+        early by its consumer (GeneratorExit) is not a failure.
+
+        Args:
+            stage: Stage name used as the "stage" label
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except GeneratorExit:
+            raise
+        except BaseException:
+            self.inc(STAGE_FAILURES, stage=stage)
+            raise
+        finally:
+            self.observe(STAGE_SECONDS, time.perf_counter() - start, stage=stage)
+
+    def time_iter(self, stage: str, items: Iterable[T]) -> Generator[T, None, None]:
+        """
+        Time how long an iterator takes to produce its items.
+
+        Only the waits for each next item are counted, not the time the
+        consumer spends between items, and the total is recorded as one
+        observation when iteration ends or is abandoned.
+
+        Args:
+            stage: Stage name used as the "stage" label
+            items: Iterable to pass through, e.g. a response stream
+
+        Yields:
+            The items of ``items``
+        """
+        iterator = iter(items)
+        waited = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                except BaseException:
+                    self.inc(STAGE_FAILURES, stage=stage)
+                    raise
+                finally:
+                    waited += time.perf_counter() - start
+                yield item
+        finally:
+            self.observe(STAGE_SECONDS, waited, stage=stage)
+
+    def counter(self, name: str, **labels: str) -> float:
+        """Current value of a counter (0 if never incremented)."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def timings(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize stage latencies.
+
+        Returns:
+            Dictionary of stage to count, total_ms, mean_ms and max_ms
+        """
+        with self._lock:
+            stages = {
+                dict(labels).get("stage", ""): histogram
+                for (name, labels), histogram in self._histograms.items()
+                if name == STAGE_SECONDS
+            }
+            return {
+                stage: {
+                    "count": h.count,
+                    "total_ms": h.sum * 1000.0,
+                    "mean_ms": h.sum / h.count * 1000.0 if h.count else 0.0,
+                    "max_ms": h.max * 1000.0,
+                }
+                for stage, h in stages.items()
+            }
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            Exposition text (content type "text/plain; version=0.0.4")
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            histograms = sorted(
+                (key, (list(h.counts), h.count, h.sum))
+                for key, h in self._histograms.items()
+            )
+
+        lines: List[str] = []
+        described = set()
+
+        def describe(name: str, kind: str) -> None:
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in counters:
+            describe(name, "counter")
+            lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        for (name, labels), value in gauges:
+            describe(name, "gauge")
+            lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        for (name, labels), (counts, count, total) in histograms:
+            describe(name, "histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                bucket_labels = labels + (("le", f"{bound:g}"),)
+                lines.append(
+                    f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}"
+                )
+            inf_labels = labels + (("le", "+Inf"),)
+            lines.append(f"{name}_bucket{_format_labels(inf_labels)} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Drop every recorded value."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+def _format_labels(labels: Labels) -> str:
+    """Format labels as {a="x",b="y"}, escaping values."""
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        escaped = (
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        )
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+@lru_cache(maxsize=1)
+def get_metrics() -> MetricsRegistry:
+    """
+    Get the process-wide metrics registry.
+
+    Returns:
+        MetricsRegistry created on first use and shared afterwards
+    """
+    return MetricsRegistry()
@@ -1,24 +1,156 @@
 """Preprocessing utilities for extracting and structuring course catalog data."""
 
+import hashlib
 import json
 import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from src.catalog_parser import parse_degree_pages, structure_path, write_structure
+from src.config import DATA_DIR, PDF_CHUNK_PAGES, PDF_MAX_WORKERS, PDF_PAGE_CACHE_PATH
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
-def extract_text_from_pdf(pdf_path: str, output_path: Optional[str] = None) -> str:
+class ExtractedPages(Iterator[str]):
+    """Page texts of a catalog PDF, with the pages that changed since last time."""
+
+    def __init__(self, pages: Iterator[str], changed_pages: List[int]) -> None:
+        """
+        Wrap the page iterator.
+
+        Args:
+            pages: Text of each page, in page order
+            changed_pages: 0-based numbers of the pages that were not in the
+                page cache (every page when no cache is used)
+        """
+        self._pages = pages
+        self.changed_pages = changed_pages
+
+    def __next__(self) -> str:
+        return next(self._pages)
+
+
+def extract_text_from_pdf(
+    pdf_path: str,
+    output_path: Optional[str] = None,
+    max_workers: Optional[int] = PDF_MAX_WORKERS,
+    chunk_pages: int = PDF_CHUNK_PAGES,
+    cache_path: Optional[str] = PDF_PAGE_CACHE_PATH,
+) -> ExtractedPages:
     """
-    Extract text content from a PDF catalog file.
+    Extract text content from a PDF catalog file, page by page.
+
+    Each page is identified by a hash of its raw content streams; pages
+    whose hash is already in the page cache are served from it, so
+    re-running on a new catalog edition only extracts the pages that
+    changed. The remaining pages are extracted in parallel by a process
+    pool in chunks of ``chunk_pages``. Pages are yielded (and written to
+    ``output_path``) in page order as soon as every earlier page is done, so
+    the whole catalog is never held in memory. Throughput in pages/sec is
+    logged at the end.
 
     Args:
         pdf_path: Path to the PDF file
         output_path: Optional path to save extracted text
+        max_workers: Extraction processes (None uses every CPU)
+        chunk_pages: Pages per extraction task
+        cache_path: SQLite page cache, or None to extract every page
 
     Returns:
-        Extracted text content
+        Iterator over the text of each page ("" for pages without text);
+        its ``changed_pages`` lists the pages that were not cached, as found
+        before this run adds them to the cache
+
+    Raises:
+        ImportError: If pdfplumber is not installed
+        FileNotFoundError: If PDF file doesn't exist
+    """
+    hashes = page_hashes(pdf_path)
+    cache = PageTextCache(cache_path) if cache_path else None
+    cached = cache.known(hashes) if cache is not None else set()
+
+    missing = [i for i, digest in enumerate(hashes) if digest not in cached]
+    logger.info(
+        "%d of %d pages unchanged since the last extraction",
+        len(hashes) - len(missing),
+        len(hashes),
+    )
+
+    chunks = [
+        missing[start : start + chunk_pages]
+        for start in range(0, len(missing), chunk_pages)
+    ]
+    extracted = _extract_chunks(pdf_path, chunks, max_workers)
+    pages = _merge_cached(pdf_path, hashes, cached, extracted, cache)
+    return ExtractedPages(_write_pages(pages, len(hashes), output_path), missing)
+
+
+def refresh_catalog_structures(
+    pdf_path: str,
+    out_dir: str = DATA_DIR,
+    text_path: Optional[str] = None,
+    cache_path: Optional[str] = PDF_PAGE_CACHE_PATH,
+) -> List[Path]:
+    """
+    Re-extract a catalog PDF and regenerate only the affected structures.
+
+    Pages come from extract_text_from_pdf, so unchanged pages are served
+    from the page cache. When no page changed, the catalog is not parsed
+    again. Otherwise the text is parsed by src.catalog_parser and only the
+    degrees whose listing spans a changed page (or whose structure file is
+    missing) are written; the others keep their existing files.
+
+    Args:
+        pdf_path: Path to the catalog PDF
+        out_dir: Directory for the course_structure_<degree>.json files
+        text_path: Optional path to save the extracted text
+        cache_path: SQLite page cache, or None to regenerate every degree
+
+    Returns:
+        Paths of the structure files written
+    """
+    pages = extract_text_from_pdf(pdf_path, text_path, cache_path=cache_path)
+    changed = set(pages.changed_pages)
+    if not changed:
+        logger.info("Catalog unchanged; keeping the existing course structures")
+        if text_path:
+            for _ in pages:
+                pass
+        return []
+
+    written = []
+    for name, structure, spanned in parse_degree_pages(
+        pages, default_degree=Path(pdf_path).stem
+    ):
+        output_file = structure_path(name, out_dir)
+        if spanned & changed or not output_file.exists():
+            written.append(write_structure(name, structure, out_dir))
+    logger.info(
+        "Regenerated %d course structures for %d changed pages",
+        len(written),
+        len(changed),
+    )
+    return written
+
+
+def page_hashes(pdf_path: str) -> List[str]:
+    """
+    Hash every page of a PDF by its raw content streams and page box.
+
+    Parsing the page tree is far cheaper than text extraction, so this is
+    used to find the pages that changed between catalog editions.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        Hex SHA-256 digest of each page, in page order
 
     Raises:
         ImportError: If pdfplumber is not installed
@@ -26,6 +158,7 @@ def extract_text_from_pdf(pdf_path: str, output_path: Optional[str] = None) -> s
     """
     try:
         import pdfplumber
+        from pdfminer.pdftypes import resolve1
     except ImportError:
         raise ImportError(
             "pdfplumber is required for PDF processing. "
@@ -36,26 +169,195 @@ def extract_text_from_pdf(pdf_path: str, output_path: Optional[str] = None) -> s
     if not pdf_file.exists():
         raise FileNotFoundError(f"PDF file not found: {pdf_path}")
 
-    logger.info("Extracting text from PDF: %s", pdf_path)
+    hashes = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            digest = hashlib.sha256(repr(page.bbox).encode("utf-8"))
+            for stream in page.page_obj.contents or []:
+                digest.update(resolve1(stream).get_rawdata())
+            hashes.append(digest.hexdigest())
+    return hashes
+
+
+class PageTextCache:
+    """SQLite cache of extracted page text keyed by page content hash."""
+
+    def __init__(self, db_path: str) -> None:
+        """
+        Open (and create if needed) the cache.
+
+        Args:
+            db_path: SQLite database file
+        """
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(db_path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages "
+            "(hash TEXT PRIMARY KEY, text TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+    def known(self, hashes: List[str]) -> Set[str]:
+        """
+        Find which pages are cached, without reading their text.
+
+        Args:
+            hashes: Page hashes from page_hashes
+
+        Returns:
+            The hashes that have cached text
+        """
+        found: Set[str] = set()
+        unique = list(dict.fromkeys(hashes))
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(unique), 500):
+            batch = unique[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            found.update(
+                row[0]
+                for row in self._db.execute(
+                    f"SELECT hash FROM pages WHERE hash IN ({placeholders})",
+                    batch,
+                )
+            )
+        return found
+
+    def get(self, digest: str) -> Optional[str]:
+        """
+        Read one cached page text.
+
+        Args:
+            digest: Page hash from page_hashes
+
+        Returns:
+            The page text, or None if it is not cached
+        """
+        row = self._db.execute(
+            "SELECT text FROM pages WHERE hash = ?", (digest,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put_many(self, pages: List[Tuple[str, str]]) -> None:
+        """
+        Store page texts.
+
+        Args:
+            pages: (hash, text) pairs
+        """
+        self._db.executemany("INSERT OR REPLACE INTO pages VALUES (?, ?)", pages)
+        self._db.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+
+def _merge_cached(
+    pdf_path: str,
+    hashes: List[str],
+    cached: Set[str],
+    extracted: Iterator[str],
+    cache: Optional[PageTextCache],
+) -> Iterator[str]:
+    """
+    Interleave cached and freshly extracted pages, caching the new ones.
+
+    Cached text is read one page at a time as it is yielded, so only the
+    current page is held in memory. A page that disappeared from the cache
+    since the lookup is extracted on the spot.
+    """
+    new_pages: List[Tuple[str, str]] = []
+    try:
+        for i, digest in enumerate(hashes):
+            if digest in cached and cache is not None:
+                page_text = cache.get(digest)
+                if page_text is None:
+                    logger.warning("Page %d left the cache; extracting it", i + 1)
+                    page_text = _extract_pages(pdf_path, [i])[0]
+                yield page_text
+                continue
+            page_text = next(extracted)
+            if cache is not None:
+                new_pages.append((digest, page_text))
+                if len(new_pages) >= 100:
+                    cache.put_many(new_pages)
+                    new_pages = []
+            yield page_text
+    finally:
+        if cache is not None:
+            if new_pages:
+                cache.put_many(new_pages)
+            cache.close()
+
+
+def _extract_pages(pdf_path: str, page_numbers: List[int]) -> List[str]:
+    """Extract the text of the given 0-based pages (runs in a worker process)."""
+    import pdfplumber
 
-    text_content = ""
     with pdfplumber.open(pdf_path) as pdf:
-        for i, page in enumerate(pdf.pages, 1):
-            page_text = page.extract_text()
-            if page_text:
-                text_content += page_text + "\n"
-            if i % 10 == 0:
-                logger.debug("Processed %d pages", i)
-
-    # Save to file if output path specified
+        return [pdf.pages[i].extract_text() or "" for i in page_numbers]
+
+
+def _extract_chunks(
+    pdf_path: str,
+    chunks: List[List[int]],
+    max_workers: Optional[int],
+) -> Iterator[str]:
+    """Extract page chunks in parallel and yield page texts in order."""
+    if len(chunks) <= 1 or max_workers == 1:
+        for chunk in chunks:
+            yield from _extract_pages(pdf_path, chunk)
+        return
+
+    workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep a bounded window of chunks in flight ahead of the next to yield
+        pending = {}
+        next_submit = 0
+        for index in range(len(chunks)):
+            while next_submit < len(chunks) and next_submit < index + 2 * workers:
+                pending[next_submit] = executor.submit(
+                    _extract_pages, pdf_path, chunks[next_submit]
+                )
+                next_submit += 1
+            yield from pending.pop(index).result()
+
+
+def _write_pages(
+    pages: Iterator[str],
+    page_count: int,
+    output_path: Optional[str],
+) -> Iterator[str]:
+    """Pass pages through, writing them to the output file and logging speed."""
+    output = None
     if output_path:
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
-        output_file.write_text(text_content, encoding="utf-8")
-        logger.info("Saved extracted text to: %s", output_path)
+        output = output_file.open("w", encoding="utf-8")
+
+    started = time.perf_counter()
+    characters = 0
+    try:
+        for i, page_text in enumerate(pages, 1):
+            if page_text and output is not None:
+                output.write(page_text + "\n")
+            characters += len(page_text)
+            if i % 100 == 0:
+                logger.debug("Processed %d/%d pages", i, page_count)
+            yield page_text
+    finally:
+        if output is not None:
+            output.close()
+            logger.info("Saved extracted text to: %s", output_path)
 
-    logger.info("Text extraction complete. Total characters: %d", len(text_content))
-    return text_content
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "Text extraction complete: %d pages, %d characters in %.1fs (%.1f pages/sec)",
+        page_count,
+        characters,
+        elapsed,
+        page_count / elapsed if elapsed else 0.0,
+    )
 
 
 def create_course_structure() -> Dict[str, Any]:
@@ -392,9 +694,10 @@ def main() -> None:
     """Main preprocessing workflow."""
     logging.basicConfig(level=logging.INFO)
 
-    # Example: Extract text from PDF (uncomment and update path as needed)
+    # Example: Extract text from PDF and regenerate the course structures of
+    # degrees on changed pages (uncomment and update path as needed)
     # pdf_path = "path/to/catalog2425.pdf"
-    # extract_text_from_pdf(pdf_path, "data/catalog_text.txt")
+    # refresh_catalog_structures(pdf_path, text_path="data/catalog_text.txt")
 
     # Generate and save course structure
     save_course_structure()
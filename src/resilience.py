@@ -0,0 +1,456 @@
+"""Retries, hedged requests and circuit breaking for Bedrock calls.
+
+Every Bedrock operation goes through a ``ResilientCaller``:
+
+- throttling and transient errors are retried with full-jitter exponential
+  backoff instead of failing the recommendation outright
+- optionally, a duplicate (hedged) request is sent when the first one
+  outlasts the operation's recent p95 latency, and whichever answers first
+  wins; both run on a small shared pool, and calls beyond its capacity run
+  unhedged on the caller's thread instead of queueing
+- a circuit breaker rejects calls immediately for a cooldown after repeated
+  failed calls (one failure per call, once its retries are exhausted), so a
+  degraded service is not hammered and callers can fall back quickly; one
+  probe call is let through to detect recovery
+
+All limits come from src/config.py.
+"""
+
+import logging
+import math
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Any, Callable, List, Optional
+
+from botocore.exceptions import ClientError, HTTPClientError
+from botocore.exceptions import ConnectionError as BotocoreConnectionError
+
+from src.config import (
+    BEDROCK_BACKOFF_BASE_SECONDS,
+    BEDROCK_BACKOFF_MAX_SECONDS,
+    BEDROCK_BREAKER_FAILURE_THRESHOLD,
+    BEDROCK_BREAKER_RESET_SECONDS,
+    BEDROCK_HEDGE_ENABLED,
+    BEDROCK_HEDGE_MAX_WORKERS,
+    BEDROCK_HEDGE_MIN_SAMPLES,
+    BEDROCK_LATENCY_WINDOW,
+    BEDROCK_MAX_ATTEMPTS,
+    BEDROCK_RETRYABLE_ERRORS,
+)
+from src.metrics import (
+    BEDROCK_HEDGES,
+    BEDROCK_HEDGES_WASTED,
+    BEDROCK_RETRIES,
+    BREAKER_OPEN,
+    BREAKER_REJECTIONS,
+    get_metrics,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_executor_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+# One slot per concurrently hedged call (two pool workers: primary and
+# hedge); a call finding none free runs unhedged rather than queueing
+_hedge_slots = threading.BoundedSemaphore(BEDROCK_HEDGE_MAX_WORKERS)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a service whose circuit breaker is open."""
+
+
+class DeadlineExceeded(RuntimeError):
+    """Raised when a call is skipped or cut short because its deadline ran out."""
+
+
+class Deadline:
+    """Point in time by which a request (or one of its stages) must finish."""
+
+    __slots__ = ("expires",)
+
+    def __init__(self, seconds: float) -> None:
+        """
+        Start the clock.
+
+        Args:
+            seconds: Time allowed from now
+        """
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self) -> bool:
+        """Whether no time is left."""
+        return self.remaining() <= 0.0
+
+    def share(self, fraction: float) -> "Deadline":
+        """
+        Budget a stage with part of the remaining time.
+
+        Args:
+            fraction: Share of the remaining time, between 0 and 1
+
+        Returns:
+            Deadline for the stage, never later than this one
+        """
+        return Deadline(self.remaining() * fraction)
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Decide whether an error is worth retrying.
+
+    Args:
+        error: Exception raised by a botocore call
+
+    Returns:
+        True for throttling and other retryable service errors, connection
+        failures and timeouts; False for everything else
+    """
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code", "")
+        return code in BEDROCK_RETRYABLE_ERRORS
+    return isinstance(error, (BotocoreConnectionError, HTTPClientError))
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = BEDROCK_BACKOFF_BASE_SECONDS,
+    cap: float = BEDROCK_BACKOFF_MAX_SECONDS,
+) -> float:
+    """
+    Full-jitter exponential backoff.
+
+    Args:
+        attempt: Number of the failed attempt, starting at 0
+        base: Delay ceiling after the first failure in seconds
+        cap: Largest delay ceiling in seconds
+
+    Returns:
+        Random delay between 0 and min(cap, base * 2 ** attempt)
+    """
+    return random.uniform(0.0, min(cap, base * 2**attempt))
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BEDROCK_BREAKER_FAILURE_THRESHOLD,
+        reset_seconds: float = BEDROCK_BREAKER_RESET_SECONDS,
+    ) -> None:
+        """
+        Create a closed breaker.
+
+        Args:
+            name: Operation name, used in logs and metrics
+            failure_threshold: Consecutive failures that open the breaker
+            reset_seconds: Cooldown before a probe call is allowed
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may proceed.
+
+        Returns:
+            True when closed, or for the one probe call after the cooldown
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_seconds:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful (or non-transient) result."""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("Circuit for %s closed", self.name)
+                get_metrics().set_gauge(BREAKER_OPEN, 0, operation=self.name)
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                logger.warning(
+                    "Circuit for %s opened after %d failures; cooling down %gs",
+                    self.name,
+                    self._failures,
+                    self.reset_seconds,
+                )
+                get_metrics().set_gauge(BREAKER_OPEN, 1, operation=self.name)
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+
+class LatencyWindow:
+    """Sliding window of recent call latencies."""
+
+    def __init__(self, size: int = BEDROCK_LATENCY_WINDOW) -> None:
+        self._samples: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        """Record one latency."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Nearest-rank percentile of the window.
+
+        Args:
+            q: Percentile between 0 and 100
+            min_samples: Samples required before an estimate is given
+
+        Returns:
+            Latency in seconds, or None with too few samples
+        """
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered or len(ordered) < min_samples:
+            return None
+        rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+        return ordered[rank - 1]
+
+
+def _hedge_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for hedged requests, created on first use."""
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=2 * BEDROCK_HEDGE_MAX_WORKERS,
+                thread_name_prefix="bedrock-hedge",
+            )
+        return _executor
+
+
+class ResilientCaller:
+    """Runs calls to one Bedrock operation with retries, hedging and a breaker."""
+
+    def __init__(
+        self,
+        name: str,
+        max_attempts: int = BEDROCK_MAX_ATTEMPTS,
+        hedge: bool = BEDROCK_HEDGE_ENABLED,
+        hedge_min_samples: int = BEDROCK_HEDGE_MIN_SAMPLES,
+    ) -> None:
+        """
+        Create the caller.
+
+        Args:
+            name: Operation name (e.g. "retrieve_and_generate")
+            max_attempts: Attempts per call, including the first
+            hedge: Whether slow calls get a hedged duplicate request
+            hedge_min_samples: Latencies observed before hedging starts
+        """
+        self.name = name
+        self.max_attempts = max(1, max_attempts)
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = CircuitBreaker(name)
+        self.latency = LatencyWindow()
+
+    def call(
+        self,
+        func: Callable[..., Any],
+        hedge: bool = True,
+        deadline: Optional[Deadline] = None,
+        attempt_seconds: float = 0.0,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Call func(**kwargs) resiliently.
+
+        Transient errors are retried with backoff; the breaker records one
+        failure for the call once its retries are exhausted, not one per
+        attempt, so a brief throttle cannot open it on its own.
+
+        Args:
+            func: Client method to call
+            hedge: Allow a hedged duplicate for this call (disable for
+                requests that must not be sent twice, such as streams)
+            deadline: Deadline of the call; a retry is only made if its
+                backoff plus attempt_seconds still fits before it, and after
+                one hedged request fails the other is waited for no longer
+                than it
+            attempt_seconds: Longest an attempt can take (the client timeout)
+            kwargs: Request parameters
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+            Exception: The last error once retries are exhausted, or any
+                non-transient error immediately
+        """
+        metrics = get_metrics()
+        if not self.breaker.allow():
+            metrics.inc(BREAKER_REJECTIONS, operation=self.name)
+            raise CircuitOpenError(f"Circuit for {self.name} is open")
+
+        for attempt in range(self.max_attempts):
+            start = time.perf_counter()
+            try:
+                threshold = (
+                    self.latency.percentile(95, self.hedge_min_samples)
+                    if self.hedge and hedge
+                    else None
+                )
+                if threshold is None:
+                    result = func(**kwargs)
+                else:
+                    result = self._hedged(func, threshold, deadline, kwargs)
+            except Exception as e:
+                if not is_transient(e):
+                    # The service answered, so it is not degraded
+                    self.breaker.record_success()
+                    raise
+                delay = backoff_delay(attempt)
+                if (
+                    attempt + 1 >= self.max_attempts
+                    or self.breaker.state == CircuitBreaker.OPEN
+                    or (
+                        deadline is not None
+                        and deadline.remaining() < delay + attempt_seconds
+                    )
+                ):
+                    self.breaker.record_failure()
+                    raise
+                logger.warning(
+                    "%s failed (%s); retry %d/%d in %.2fs",
+                    self.name,
+                    e,
+                    attempt + 1,
+                    self.max_attempts - 1,
+                    delay,
+                )
+                metrics.inc(BEDROCK_RETRIES, operation=self.name)
+                time.sleep(delay)
+                continue
+
+            self.latency.add(time.perf_counter() - start)
+            self.breaker.record_success()
+            return result
+
+    def _hedged(
+        self,
+        func: Callable[..., Any],
+        threshold: float,
+        deadline: Optional[Deadline],
+        kwargs: Any,
+    ) -> Any:
+        """
+        Run func on the hedge pool, racing a duplicate against a slow call.
+
+        The duplicate is sent once the primary has run for threshold
+        seconds, and the first successful answer is returned at once. If
+        one request fails, the other is waited for no longer than the
+        deadline. When no hedge slot is free, func runs unhedged on this
+        thread. The losing request cannot be interrupted; it is counted as
+        wasted and its answer discarded.
+        """
+        if not _hedge_slots.acquire(blocking=False):
+            return func(**kwargs)
+
+        metrics = get_metrics()
+        executor = _hedge_executor()
+        futures = [executor.submit(func, **kwargs)]
+        try:
+            done, _ = wait(futures, timeout=threshold)
+            if not done:
+                futures.append(executor.submit(func, **kwargs))
+                metrics.inc(BEDROCK_HEDGES, operation=self.name)
+        finally:
+            _release_slot_when_done(futures)
+
+        pending = set(futures)
+        errors: List[BaseException] = []
+        while pending:
+            timeout = None
+            if errors and deadline is not None:
+                timeout = deadline.remaining()
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                error = future.exception()
+                if error is not None:
+                    errors.append(error)
+                    continue
+                if len(futures) > 1:
+                    # The other request's answer is discarded
+                    metrics.inc(BEDROCK_HEDGES_WASTED, operation=self.name)
+                return future.result()
+        if pending:
+            # Out of time: give up on the request still running
+            metrics.inc(BEDROCK_HEDGES_WASTED, operation=self.name)
+        raise errors[0]
+
+
+def _release_slot_when_done(futures: List[Future]) -> None:
+    """Free a hedge slot once every request of a hedged call has finished."""
+    left = [len(futures)]
+    lock = threading.Lock()
+
+    def finished(_: Future) -> None:
+        with lock:
+            left[0] -= 1
+            if left[0]:
+                return
+        _hedge_slots.release()
+
+    for future in futures:
+        future.add_done_callback(finished)
+
+
+@lru_cache(maxsize=None)
+def get_caller(operation: str) -> ResilientCaller:
+    """
+    Get the shared caller (and circuit breaker) for an operation.
+
+    Args:
+        operation: Operation name (e.g. "invoke_model")
+
+    Returns:
+        ResilientCaller created on first use and shared afterwards
+    """
+    return ResilientCaller(operation)
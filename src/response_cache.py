@@ -0,0 +1,304 @@
+"""Content-addressed cache for schedule recommendations.
+
+Students with the same completed/current courses and constraints get the
+same recommendation, so call_api results are cached under a hash of the
+canonicalized student profile. Lookups go through an in-process LRU with a
+TTL backed by a SQLite file, and everything is invalidated when the catalog
+data files change. Each write also prunes expired rows and the oldest rows
+beyond a row limit, so the file does not grow without bound.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.catalog_index import course_code
+from src.config import (
+    CLASS_SCHEDULE_PATH,
+    COURSE_STRUCTURE_PATH,
+    RESPONSE_CACHE_MAX_DISK_ENTRIES,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_PATH,
+    RESPONSE_CACHE_TTL_SECONDS,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def _normalize_courses(courses: Iterable[str]) -> List[str]:
+    """Normalize course references to sorted, de-duplicated codes."""
+    normalized = set()
+    for course in courses or []:
+        text = str(course).strip()
+        if text:
+            normalized.add(course_code(text) or " ".join(text.upper().split()))
+    return sorted(normalized)
+
+
+def profile_key(student: Dict[str, Any]) -> str:
+    """
+    Build the content address of a student profile.
+
+    The name and any other personal fields are ignored; only completed
+    courses, current courses and time constraints affect the key.
+
+    Args:
+        student: Student dictionary as passed to call_api
+
+    Returns:
+        Hex SHA-256 digest of the canonical profile
+    """
+    canonical = {
+        "completed": _normalize_courses(student.get("completed_courses", [])),
+        "current": _normalize_courses(student.get("current_courses", [])),
+        "constraints": " ".join(
+            (student.get("time_constraints") or "").lower().split()
+        ),
+    }
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def data_fingerprint(paths: Iterable[str]) -> str:
+    """
+    Fingerprint the catalog data files by size and modification time.
+
+    Args:
+        paths: Data file paths
+
+    Returns:
+        Short hex digest that changes whenever any file changes
+    """
+    parts = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            parts.append(f"{path}:{stat.st_size}:{stat.st_mtime_ns}")
+        except OSError:
+            parts.append(f"{path}:missing")
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+class ResponseCache:
+    """Two-level (memory LRU + SQLite) cache of call_api results."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = RESPONSE_CACHE_PATH,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS,
+        data_paths: Iterable[str] = (COURSE_STRUCTURE_PATH, CLASS_SCHEDULE_PATH),
+        max_disk_entries: int = RESPONSE_CACHE_MAX_DISK_ENTRIES,
+    ) -> None:
+        """
+        Create the cache.
+
+        Args:
+            db_path: SQLite file for the persistent layer, or None for
+                memory only; the cache continues in memory if the file
+                becomes unusable (e.g. locked by another process)
+            max_entries: Maximum entries kept in memory
+            ttl_seconds: Entry lifetime in seconds
+            data_paths: Files whose changes invalidate every entry
+            max_disk_entries: Maximum rows kept in the SQLite file
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.data_paths = tuple(data_paths)
+        self.max_disk_entries = max_disk_entries
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+        self._fingerprint = data_fingerprint(self.data_paths)
+        self._stats = {
+            "hits": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "disk_evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            try:
+                os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                # WAL lets CLI and batch processes read while another writes
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+                    "created REAL NOT NULL, value TEXT NOT NULL)"
+                )
+                self._db.execute(
+                    "CREATE INDEX IF NOT EXISTS responses_created "
+                    "ON responses (created)"
+                )
+                self._db.execute(
+                    "DELETE FROM responses WHERE fingerprint != ?",
+                    (self._fingerprint,),
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning("Response cache disk layer disabled: %s", e)
+                self._db = None
+
+    def _disable_disk(self, error: sqlite3.Error) -> None:
+        """Fall back to the memory layer after a SQLite error (lock held)."""
+        logger.warning("Response cache disk layer disabled: %s", error)
+        if self._db is not None:
+            try:
+                self._db.close()
+            except sqlite3.Error:
+                pass
+        self._db = None
+
+    def _check_data(self) -> None:
+        """Drop every entry if the catalog data files changed (lock held)."""
+        fingerprint = data_fingerprint(self.data_paths)
+        if fingerprint == self._fingerprint:
+            return
+
+        logger.info("Catalog data changed; invalidating response cache")
+        self._fingerprint = fingerprint
+        self._memory.clear()
+        self._stats["invalidations"] += 1
+        if self._db is not None:
+            try:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+            except sqlite3.Error as e:
+                self._disable_disk(e)
+
+    def _remember(self, key: str, created: float, value: List[str]) -> None:
+        """Insert into the memory LRU, evicting the oldest entry (lock held)."""
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _prune_disk(self, db: sqlite3.Connection, now: float) -> None:
+        """Delete expired rows and the oldest rows over the limit (lock held)."""
+        expired = db.execute(
+            "DELETE FROM responses WHERE created <= ?", (now - self.ttl_seconds,)
+        ).rowcount
+        evicted = db.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+            "ORDER BY created DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,),
+        ).rowcount
+        self._stats["expirations"] += max(expired, 0)
+        self._stats["disk_evictions"] += max(evicted, 0)
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """
+        Look up a cached recommendation.
+
+        Args:
+            key: Profile key from profile_key
+
+        Returns:
+            Cached recommendation lines, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            self._check_data()
+
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self._stats["hits"] += 1
+                    self._stats["memory_hits"] += 1
+                    return list(entry[1])
+                del self._memory[key]
+                self._stats["expirations"] += 1
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT created, value FROM responses WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None:
+                        created, value = row[0], json.loads(row[1])
+                        if now - created < self.ttl_seconds:
+                            self._remember(key, created, value)
+                            self._stats["hits"] += 1
+                            self._stats["disk_hits"] += 1
+                            return list(value)
+                        self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                        self._db.commit()
+                        self._stats["expirations"] += 1
+                except sqlite3.Error as e:
+                    self._disable_disk(e)
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, value: List[str]) -> None:
+        """
+        Store a recommendation, pruning the SQLite file.
+
+        Args:
+            key: Profile key from profile_key
+            value: Recommendation lines returned by call_api
+        """
+        now = time.time()
+        with self._lock:
+            self._check_data()
+            self._remember(key, now, list(value))
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                        (key, self._fingerprint, now, json.dumps(value)),
+                    )
+                    self._prune_disk(self._db, now)
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    self._disable_disk(e)
+
+    def clear(self) -> None:
+        """Remove every entry from both layers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM responses")
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    self._disable_disk(e)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+
+        Returns:
+            Hits (total, memory, disk), misses, evictions (memory, disk),
+            expirations, invalidations and current memory size
+        """
+        with self._lock:
+            return dict(self._stats, size=len(self._memory))
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> ResponseCache:
+    """
+    Get the process-wide response cache.
+
+    Returns:
+        ResponseCache configured from src.config
+    """
+    return ResponseCache()
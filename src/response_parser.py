@@ -0,0 +1,199 @@
+"""Deterministic parsing of schedule recommendations from model output.
+
+Extracts course code, title and meeting pattern for each recommended course
+from free-form retrieve_and_generate text, using the known courses and
+sections in the class schedule to recognize and validate them.
+"""
+
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.catalog_walker import COURSE_CODE_PATTERN
+from src.config import CLASS_SCHEDULE_PATH
+from src.response_cache import data_fingerprint
+from src.scheduler import load_class_schedule
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MWF_PATTERN = re.compile(
+    r"\b(?:MWF|M/W/F|M-W-F|"
+    r"Mon(?:day)?[,/ ]+Wed(?:nesday)?[,/ ]+(?:and\s+)?Fri(?:day)?)\b",
+    re.IGNORECASE,
+)
+TTH_PATTERN = re.compile(
+    r"\b(?:TTh|TR|T/Th|Tu/Th|Tue(?:s|sday)?[,/ ]+(?:and\s+)?Thu(?:rs|rsday)?)\b",
+    re.IGNORECASE,
+)
+TIME_RANGE_PATTERN = re.compile(
+    r"(\d{1,2}):(\d{2})\s*([AaPp])?\.?[Mm]?\.?\s*(?:-|–|—|to)\s*"
+    r"(\d{1,2}):(\d{2})\s*([AaPp])\.?[Mm]\.?"
+)
+SECTION_PATTERN = re.compile(r"\bSection\s*#?\s*(\d+)", re.IGNORECASE)
+
+
+def known_courses(
+    file_path: str = CLASS_SCHEDULE_PATH,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Index the class schedule by course code.
+
+    The index is rebuilt whenever the file's size or modification time
+    changes, like the response cache.
+
+    Args:
+        file_path: Path to the class schedule JSON file
+
+    Returns:
+        Dictionary mapping course code to its first schedule entry
+    """
+    return _index_courses(file_path, data_fingerprint((file_path,)))
+
+
+@lru_cache(maxsize=4)
+def _index_courses(file_path: str, fingerprint: str) -> Dict[str, Dict[str, Any]]:
+    """Index one version of the class schedule (fingerprint keys the cache)."""
+    courses: Dict[str, Dict[str, Any]] = {}
+    for offering in load_class_schedule(file_path):
+        match = COURSE_CODE_PATTERN.search(offering.get("course", ""))
+        if match:
+            courses.setdefault(f"{match.group(1)} {match.group(2)}", offering)
+    return courses
+
+
+def _format_time_range(match: "re.Match[str]") -> str:
+    """Normalize a matched time range to "H:MM AM - H:MM PM"."""
+    start_hour, start_min, start_ampm, end_hour, end_min, end_ampm = match.groups()
+    end_ampm = end_ampm.upper()
+    if start_ampm:
+        start_ampm = start_ampm.upper()
+    elif int(start_hour) % 12 > int(end_hour) % 12 and end_ampm == "P":
+        # "11:15 - 12:05 PM" starts in the morning
+        start_ampm = "A"
+    else:
+        start_ampm = end_ampm
+    return (
+        f"{int(start_hour)}:{start_min} {start_ampm}M - "
+        f"{int(end_hour)}:{end_min} {end_ampm}M"
+    )
+
+
+def _parse_segment(segment: str) -> Dict[str, Any]:
+    """Pull day pattern, time slot and section number out of a text segment."""
+    details: Dict[str, Any] = {}
+
+    mwf = MWF_PATTERN.search(segment)
+    tth = TTH_PATTERN.search(segment)
+    if mwf and (not tth or mwf.start() < tth.start()):
+        details["day_type"] = "MWF"
+    elif tth:
+        details["day_type"] = "TTh"
+
+    time_match = TIME_RANGE_PATTERN.search(segment)
+    if time_match:
+        details["time_slot"] = _format_time_range(time_match)
+
+    section_match = SECTION_PATTERN.search(segment)
+    if section_match:
+        details["section_id"] = int(section_match.group(1))
+
+    return details
+
+
+def parse_recommendations(
+    text: str,
+    courses: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Tuple[List[Dict[str, Any]], float]:
+    """
+    Extract recommended courses and their meeting times from model output.
+
+    Each known course code starts a segment that runs until the next known
+    code; the segment is searched for a day pattern, time range and section
+    number. A course mentioned several times keeps the first mention that
+    carries a meeting time. When any course has a meeting time, courses
+    without one are treated as passing mentions (e.g. completed
+    prerequisites) and dropped.
+
+    Confidence is the share of returned courses whose day pattern and time
+    slot match a section actually offered in the class schedule, so invented
+    or garbled times lower it.
+
+    Args:
+        text: Raw retrieve_and_generate response text
+        courses: Known courses by code; loaded from the class schedule if omitted
+
+    Returns:
+        Tuple of (recommendation records, confidence between 0 and 1). Each
+        record has "code", "course", "day_type", "time_slot", "section_id"
+        and "verified" keys (missing details are None).
+    """
+    if courses is None:
+        courses = known_courses()
+
+    matches = [
+        (match, f"{match.group(1)} {match.group(2)}")
+        for match in COURSE_CODE_PATTERN.finditer(text)
+    ]
+    matches = [(match, code) for match, code in matches if code in courses]
+
+    by_code: Dict[str, Dict[str, Any]] = {}
+    for i, (match, code) in enumerate(matches):
+        end = matches[i + 1][0].start() if i + 1 < len(matches) else len(text)
+        details = _parse_segment(text[match.end() : end])
+        offering = courses[code]
+        record = {
+            "code": code,
+            "course": offering["course"],
+            "day_type": details.get("day_type"),
+            "time_slot": details.get("time_slot"),
+            "section_id": details.get("section_id"),
+            "verified": False,
+        }
+
+        for section in offering.get("sections", []):
+            if (
+                section.get("day_type") == record["day_type"]
+                and section.get("time_slot") == record["time_slot"]
+            ):
+                record["section_id"] = section.get("section_id")
+                record["verified"] = True
+                break
+
+        # Keep one record per course, preferring a mention that has a time
+        previous = by_code.get(code)
+        if previous is None or (record["time_slot"] and not previous["time_slot"]):
+            by_code.pop(code, None)
+            by_code[code] = record
+
+    records = list(by_code.values())
+    timed = [r for r in records if r["time_slot"]]
+    if not timed:
+        return records, 0.0
+
+    records = timed
+    confidence = sum(r["verified"] for r in records) / len(records)
+    logger.debug(
+        "Parsed %d recommendations locally (confidence %.2f)", len(records), confidence
+    )
+    return records, confidence
+
+
+def format_recommendations(records: List[Dict[str, Any]]) -> List[str]:
+    """
+    Render parsed recommendations as one display line per course.
+
+    Args:
+        records: Records from parse_recommendations
+
+    Returns:
+        Lines such as "CPSC 2070 - Discrete Structures | MWF 10:10 AM - 11:00 AM"
+    """
+    lines = []
+    for record in records:
+        meeting = " ".join(
+            part for part in (record["day_type"], record["time_slot"]) if part
+        )
+        lines.append(f"{record['course']} | {meeting}" if meeting else record["course"])
+    return lines
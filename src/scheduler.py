@@ -0,0 +1,297 @@
+"""Deterministic, in-process schedule builder for AI Advisor.
+
+Picks non-overlapping sections for the courses a student is eligible to take
+so that the total lands in the target credit window, without a model call.
+"""
+
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.config import (
+    CLASS_SCHEDULE_PATH,
+    SOLVER_MAX_NODES,
+    TARGET_MAX_CREDITS,
+    TARGET_MIN_CREDITS,
+)
+from src.catalog_index import CatalogIndex, course_code, get_catalog_index
+from src.time_slots import CLOCK_PATTERN, clock_to_minutes, section_mask, window_mask
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def load_class_schedule(file_path: str = CLASS_SCHEDULE_PATH) -> List[Dict[str, Any]]:
+    """
+    Load the generated class schedule.
+
+    Accepts both the bare list written by ``class_timings.save_schedule`` and
+    the ``{"classes": [...]}`` layout used by the knowledge base export.
+
+    Args:
+        file_path: Path to the class schedule JSON file
+
+    Returns:
+        List of courses with their sections
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    path = Path(file_path)
+
+    if not path.exists():
+        raise FileNotFoundError(f"Class schedule file not found: {file_path}")
+
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if isinstance(data, dict):
+        data = data.get("classes", [])
+
+    return data
+
+
+def _parse_time_constraints(time_constraints: Optional[str]) -> Tuple[int, int]:
+    """
+    Derive an allowed daily window from free-text constraints.
+
+    Understands phrases like "no classes before 10am" and "nothing after 3pm";
+    anything else is left to the model.
+
+    Returns:
+        Tuple of (earliest start minute, latest end minute)
+    """
+    earliest, latest = 0, 24 * 60
+    if not time_constraints:
+        return earliest, latest
+
+    text = time_constraints.lower()
+    for keyword, clock in re.findall(
+        r"(before|after)\s+(\d{1,2}(?::\d{2})?\s*[ap]m)", text
+    ):
+        match = CLOCK_PATTERN.search(clock)
+        if match is None:
+            continue
+        minutes = clock_to_minutes(match)
+        if keyword == "before":
+            earliest = max(earliest, minutes)
+        else:
+            latest = min(latest, minutes)
+
+    return earliest, latest
+
+
+def time_window_mask(time_constraints: Optional[str]) -> int:
+    """
+    Build the weekday mask a section must fit inside to meet the constraints.
+
+    Args:
+        time_constraints: Free-text time constraints (see _parse_time_constraints)
+
+    Returns:
+        Integer bitmask as produced by window_mask
+    """
+    return window_mask(*_parse_time_constraints(time_constraints))
+
+
+def eligible_courses(
+    completed: Iterable[str],
+    current: Iterable[str],
+    index: CatalogIndex,
+    offerings: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Filter offerings down to courses the student may take next semester.
+
+    Args:
+        completed: Completed course references
+        current: Currently enrolled course references
+        index: Prerequisite index for the catalog
+        offerings: Courses with sections from the class schedule
+
+    Returns:
+        One offering per eligible course code, in schedule order
+    """
+    eligible_codes = set(index.eligible(completed, current))
+
+    eligible = []
+    seen: Set[str] = set()
+    for offering in offerings:
+        code = course_code(offering.get("course", ""))
+        if code in eligible_codes and code not in seen:
+            seen.add(code)
+            eligible.append(offering)
+
+    return eligible
+
+
+def solve_schedule(
+    student: Dict[str, Any],
+    offerings: Optional[List[Dict[str, Any]]] = None,
+    course_structure: Optional[Dict[str, Any]] = None,
+    min_credits: int = TARGET_MIN_CREDITS,
+    max_credits: int = TARGET_MAX_CREDITS,
+    max_nodes: int = SOLVER_MAX_NODES,
+) -> Optional[Dict[str, Any]]:
+    """
+    Build a conflict-free schedule using backtracking with pruning.
+
+    Courses on a prerequisite chain are considered first, then the rest in
+    catalog-level order (lower numbers first), so degree progress is preferred.
+    A branch is abandoned as soon as it exceeds ``max_credits`` or can no
+    longer beat the best schedule found so far. If no schedule reaches
+    ``min_credits`` within ``max_nodes`` search steps, the largest
+    conflict-free schedule found is returned instead.
+
+    Args:
+        student: Student dictionary (completed_courses, current_courses,
+            time_constraints)
+        offerings: Courses with sections; loaded from disk if omitted
+        course_structure: Course structure; the shared catalog index is used
+            if omitted
+        min_credits: Lower bound of the target credit window
+        max_credits: Upper bound of the target credit window
+        max_nodes: Search step budget
+
+    Returns:
+        Dictionary with "courses" (chosen sections) and "total_credits",
+        or None if no eligible course has a usable section
+    """
+    if offerings is None:
+        offerings = load_class_schedule()
+    catalog = (
+        get_catalog_index()
+        if course_structure is None
+        else CatalogIndex.from_structure(course_structure)
+    )
+    outside = ~time_window_mask(student.get("time_constraints"))
+
+    candidates = []
+    for offering in eligible_courses(
+        student.get("completed_courses", []) or [],
+        student.get("current_courses", []) or [],
+        catalog,
+        offerings,
+    ):
+        code = course_code(offering["course"])
+        if code is None:
+            continue
+        credits = offering.get("credits", catalog.credits.get(code))
+        if not credits:
+            continue
+
+        sections = []
+        for section in offering.get("sections", []):
+            try:
+                mask = section_mask(section["day_type"], section["time_slot"])
+            except (KeyError, ValueError):
+                logger.debug("Skipping unparseable section of %s", code)
+                continue
+            if not mask & outside:
+                sections.append((section, mask))
+
+        if sections:
+            candidates.append((code, offering, credits, sections))
+
+    if not candidates:
+        return None
+
+    # Courses on a prerequisite chain first, then by catalog level
+    candidates.sort(
+        key=lambda c: (not catalog.prerequisites(c[0]), c[0].split()[1], c[0])
+    )
+
+    # remaining[i] = credits still available from candidates[i:]
+    remaining = [0] * (len(candidates) + 1)
+    for i in range(len(candidates) - 1, -1, -1):
+        remaining[i] = remaining[i + 1] + candidates[i][2]
+
+    best: List[Tuple[int, Dict[str, Any]]] = []
+    best_credits = 0
+    nodes = 0
+
+    # Depth-first search with an explicit stack, so a long candidate list
+    # cannot exceed the interpreter's recursion limit. Each frame holds a
+    # candidate position, the running total and busy mask before it, the
+    # iterator over its remaining options and the section currently chosen.
+    stack: List[List[Any]] = []
+
+    def visit(position: int, total: int, busy: int) -> bool:
+        """Enter a search node; True once the schedule reaches min_credits."""
+        nonlocal best, best_credits, nodes
+        nodes += 1
+
+        if total > best_credits:
+            best = [(f[0], f[4]) for f in stack if f[4] is not None]
+            best_credits = total
+        if total >= min_credits:
+            return True
+        if (
+            position == len(candidates)
+            or nodes >= max_nodes
+            or total + remaining[position] <= best_credits
+        ):
+            return False
+
+        stack.append([position, total, busy, choices(position, total, busy), None])
+        return False
+
+    def choices(
+        position: int, total: int, busy: int
+    ) -> Iterator[Tuple[Optional[Dict[str, Any]], int]]:
+        """Sections of a candidate that fit, then skipping the candidate."""
+        _, _, credits, sections = candidates[position]
+        if total + credits <= max_credits:
+            for section, mask in sections:
+                if not busy & mask:
+                    yield section, mask
+        yield None, 0
+
+    found = visit(0, 0, 0)
+    while stack and not found:
+        frame = stack[-1]
+        position, total, busy, options, _ = frame
+        section, mask = next(options, (None, -1))
+        if mask < 0:
+            stack.pop()
+            continue
+        frame[4] = section
+        credits = candidates[position][2] if section is not None else 0
+        found = visit(position + 1, total + credits, busy | mask)
+
+    logger.debug(
+        "Schedule search visited %d nodes, best total %d credits", nodes, best_credits
+    )
+
+    courses = []
+    for position, section in best:
+        _, offering, credits, _ = candidates[position]
+        courses.append(
+            {
+                "course": offering["course"],
+                "credits": credits,
+                "section_id": section.get("section_id"),
+                "day_type": section["day_type"],
+                "time_slot": section["time_slot"],
+            }
+        )
+
+    return {"courses": courses, "total_credits": best_credits}
+
+
+def format_schedule(schedule: Dict[str, Any]) -> List[str]:
+    """
+    Render a solved schedule as one display line per course.
+
+    Args:
+        schedule: Result of solve_schedule
+
+    Returns:
+        Lines such as "CPSC 2070 - Discrete Structures | MWF 10:10 AM - 11:00 AM"
+    """
+    return [
+        f"{c['course']} | {c['day_type']} {c['time_slot']}"
+        for c in schedule.get("courses", [])
+    ]
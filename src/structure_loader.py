@@ -0,0 +1,252 @@
+"""Load course structure files of any known shape in one canonical form.
+
+The structure files in ``data/`` come in two shapes:
+
+- "flat": each top-level category maps straight to its groups, as written by
+  create_course_structure (``course_structure.json``)
+- "wrapped": a category wraps a key of the same name, either around all of
+  its content or only its first group (``course_structure1.json`` and
+  ``course_structure2.json``)
+
+Both are normalized to the flat layout. Objects that repeat a key, such as an
+OR-path list written as one object with several ``path_name``/``courses``
+pairs, are split into one object per repetition instead of silently keeping
+only the last pair, and stray closing brackets after the document are
+ignored. Normalized structures are cached on disk keyed by the file's
+modification time and content hash, so later process starts skip parsing and
+validation entirely.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.catalog_walker import walk_catalog
+from src.config import STRUCTURE_CACHE_DIR
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+FLAT = "flat"
+WRAPPED = "wrapped"
+
+
+class _RepeatedKeys(dict):
+    """JSON object whose keys repeat; ``parts`` holds one dict per repetition."""
+
+    __slots__ = ("parts",)
+
+    parts: List[Dict[str, Any]]
+
+
+def _object_pairs(pairs: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    """Build a JSON object, starting a new part whenever a key repeats."""
+    parts: List[Dict[str, Any]] = [{}]
+    for key, value in pairs:
+        if key in parts[-1]:
+            parts.append({})
+        parts[-1][key] = value
+    if len(parts) == 1:
+        return parts[0]
+
+    merged = _RepeatedKeys()
+    for part in parts:
+        merged.update(part)
+    merged.parts = parts
+    return merged
+
+
+def parse_structure_text(text: str) -> Dict[str, Any]:
+    """
+    Parse course structure JSON, tolerating repeated keys and stray brackets.
+
+    Args:
+        text: JSON document
+
+    Returns:
+        Parsed structure; objects with repeated keys are kept as
+        ``_RepeatedKeys`` for normalize_structure to split
+
+    Raises:
+        json.JSONDecodeError: If the text is not valid JSON
+        ValueError: If the document is not a JSON object
+    """
+    text = text.strip()
+    decoder = json.JSONDecoder(object_pairs_hook=_object_pairs)
+    data, end = decoder.raw_decode(text)
+
+    rest = text[end:].strip()
+    if rest:
+        if rest.strip("}] \t\r\n"):
+            raise json.JSONDecodeError("Extra data", text, end)
+        logger.warning("Ignoring trailing data after course structure: %r", rest)
+
+    if not isinstance(data, dict):
+        raise ValueError("Course structure must be a JSON object")
+    return data
+
+
+def detect_variant(course_structure: Dict[str, Any]) -> str:
+    """
+    Detect the layout of a course structure.
+
+    Args:
+        course_structure: Parsed course structure
+
+    Returns:
+        WRAPPED if any category wraps a key of its own name, else FLAT
+    """
+    for category, details in course_structure.items():
+        if isinstance(details, dict) and isinstance(details.get(category), dict):
+            return WRAPPED
+    return FLAT
+
+
+def _split_repeated(value: Any) -> Any:
+    """Recursively replace repeated-key objects by their parts."""
+    if isinstance(value, list):
+        items: List[Any] = []
+        for item in value:
+            if isinstance(item, _RepeatedKeys):
+                logger.warning("Splitting entry with repeated keys: %s", list(item))
+                items.extend(_split_repeated(part) for part in item.parts)
+            else:
+                items.append(_split_repeated(item))
+        return items
+    if isinstance(value, dict):
+        # A repeated-key object outside a list has nowhere to split into,
+        # so it keeps the last value of each key like json.load would
+        return {key: _split_repeated(item) for key, item in value.items()}
+    return value
+
+
+def normalize_structure(course_structure: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a course structure of any known variant to the flat layout.
+
+    Args:
+        course_structure: Parsed course structure
+
+    Returns:
+        New structure in the layout written by create_course_structure
+
+    Raises:
+        ValueError: If the structure contains no courses
+    """
+    normalized: Dict[str, Any] = {}
+    for category, details in course_structure.items():
+        details = _split_repeated(details)
+        if isinstance(details, dict) and isinstance(details.get(category), dict):
+            unwrapped = dict(details[category])
+            for key, value in details.items():
+                if key == category:
+                    continue
+                if key in unwrapped:
+                    logger.warning("Duplicate group %s in %s", key, category)
+                    continue
+                unwrapped[key] = value
+            details = unwrapped
+        normalized[category] = details
+
+    if next(walk_catalog(normalized), None) is None:
+        raise ValueError("Course structure contains no courses")
+    return normalized
+
+
+def _cache_file(file_path: str, cache_dir: str) -> str:
+    """Cache file path for a structure file."""
+    key = hashlib.sha256(os.path.abspath(file_path).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{key[:16]}.pickle")
+
+
+def _read_cache(cache_path: str) -> Optional[Dict[str, Any]]:
+    """Read a cache entry, or None if it is missing or unusable."""
+    try:
+        with open(cache_path, "rb") as f:
+            entry = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring unreadable structure cache %s: %s", cache_path, e)
+        return None
+    if not isinstance(entry, dict) or entry.get("version") != CACHE_VERSION:
+        return None
+    return entry
+
+
+def _write_cache(cache_path: str, entry: Dict[str, Any]) -> None:
+    """Write a cache entry atomically."""
+    try:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning("Could not save structure cache: %s", e)
+
+
+def load_structure(
+    file_path: str,
+    cache_dir: Optional[str] = STRUCTURE_CACHE_DIR,
+) -> Dict[str, Any]:
+    """
+    Load a course structure file of any known variant in the flat layout.
+
+    The cache is checked by modification time and size first, so an
+    unchanged file is not even read; a file that was only touched is
+    recognized by its content hash and not parsed again.
+
+    Args:
+        file_path: Path to the course structure JSON file
+        cache_dir: Directory for normalized structures, or None to disable
+
+    Returns:
+        Normalized course structure
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If the file is not valid JSON
+        ValueError: If the file is not a course structure
+    """
+    stat = os.stat(file_path)
+    cache_path = _cache_file(file_path, cache_dir) if cache_dir else None
+    entry = _read_cache(cache_path) if cache_path else None
+    if (
+        entry is not None
+        and entry["mtime_ns"] == stat.st_mtime_ns
+        and entry["size"] == stat.st_size
+    ):
+        return entry["structure"]
+
+    with open(file_path, "rb") as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+
+    if entry is not None and entry["sha256"] == digest:
+        structure = entry["structure"]
+        variant = entry["variant"]
+    else:
+        raw = parse_structure_text(content.decode("utf-8-sig"))
+        variant = detect_variant(raw)
+        structure = normalize_structure(raw)
+        logger.info("Loaded %s course structure from: %s", variant, file_path)
+
+    if cache_path:
+        _write_cache(
+            cache_path,
+            {
+                "version": CACHE_VERSION,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": digest,
+                "variant": variant,
+                "structure": structure,
+            },
+        )
+    return structure
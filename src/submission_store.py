@@ -0,0 +1,161 @@
+"""Append-only store for web form submissions.
+
+Replaces rewriting one JSON file per submission with inserts into a SQLite
+database in WAL mode, which several web server processes can append to
+concurrently. Each submission is committed before add returns, so nothing
+is lost when a worker is killed or recycled; in WAL mode with
+synchronous=NORMAL a commit is an append to the log, not a full fsync.
+
+The store itself is safe for several processes, but the web app's
+recommendation jobs (src/job_queue.py) live in one process's memory, so the
+app is served as a single process with several threads
+(``gunicorn -w 1 --threads 8``).
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, Dict, Iterator, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS submissions ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+    "name TEXT NOT NULL, "
+    "classes TEXT NOT NULL, "
+    "submitted_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS submissions_name ON submissions (name)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+)
+
+
+class SubmissionStore:
+    """SQLite-backed, concurrency-safe submission log."""
+
+    def __init__(self, db_path: str) -> None:
+        """
+        Open (and create if needed) the store.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = db_path
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection that waits for other writers instead of failing."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def add(self, name: str, classes: str) -> None:
+        """
+        Record a submission.
+
+        Args:
+            name: Student name
+            classes: Submitted classes text
+
+        Raises:
+            sqlite3.Error: If the submission could not be written
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO submissions (name, classes, submitted_at) "
+                "VALUES (?, ?, ?)",
+                (name, classes, time.time()),
+            )
+
+    def iter_submissions(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over stored submissions, oldest first.
+
+        Yields:
+            Dictionaries with "id", "name", "classes" and "submitted_at"
+        """
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "SELECT id, name, classes, submitted_at FROM submissions ORDER BY id"
+            )
+            for row in cursor:
+                yield dict(zip(("id", "name", "classes", "submitted_at"), row))
+
+    def latest(self, name: str) -> Optional[str]:
+        """
+        Get the most recent classes submitted under a name.
+
+        Args:
+            name: Student name
+
+        Returns:
+            Submitted classes text, or None if the name has no submissions
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT classes FROM submissions WHERE name = ? "
+                "ORDER BY id DESC LIMIT 1",
+                (name,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def migrate_json(self, json_path: str) -> int:
+        """
+        Import the legacy submitted_data.json layout once.
+
+        The legacy file maps names under "Name" and classes under "Classes".
+        A marker in the database makes repeated calls (from any process) a
+        no-op; the JSON file itself is left untouched.
+
+        Args:
+            json_path: Path to the legacy JSON file
+
+        Returns:
+            Number of submissions imported
+        """
+        if not os.path.exists(json_path):
+            return 0
+
+        marker = f"migrated:{os.path.abspath(json_path)}"
+        with closing(self._connect()) as conn:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                if conn.execute(
+                    "SELECT 1 FROM meta WHERE key = ?", (marker,)
+                ).fetchone():
+                    conn.rollback()
+                    return 0
+
+                with open(json_path, "r", encoding="utf-8") as f:
+                    legacy = json.load(f)
+
+                migrated_at = time.time()
+                rows = [
+                    (name, str(classes), migrated_at)
+                    for name, classes in (legacy.get("Classes") or {}).items()
+                ]
+                conn.executemany(
+                    "INSERT INTO submissions (name, classes, submitted_at) "
+                    "VALUES (?, ?, ?)",
+                    rows,
+                )
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES (?, ?)",
+                    (marker, str(migrated_at)),
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        logger.info("Migrated %d submissions from %s", len(rows), json_path)
+        return len(rows)
@@ -0,0 +1,125 @@
+"""Compiled bitmask representation of class meeting times.
+
+Each section's day pattern and time slot is compiled into an integer whose
+bits are 5-minute ticks across the weekdays, so two sections overlap exactly
+when ``mask_a & mask_b`` is non-zero.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from src.config import MWF_TIME_SLOTS, TTH_TIME_SLOTS
+
+TICK_MINUTES = 5
+TICKS_PER_DAY = 24 * 60 // TICK_MINUTES
+WEEKDAYS = ("M", "T", "W", "Th", "F")
+DAY_INDEX = {day: i for i, day in enumerate(WEEKDAYS)}
+
+DAY_PATTERN = re.compile(r"Th|M|T|W|F")
+CLOCK_PATTERN = re.compile(r"(\d{1,2})(?::(\d{2}))?\s*([AaPp][Mm])")
+
+
+def clock_to_minutes(match: "re.Match[str]") -> int:
+    """Convert a matched CLOCK_PATTERN time to minutes after midnight."""
+    hour = int(match.group(1)) % 12
+    minute = int(match.group(2) or 0)
+    if match.group(3).upper() == "PM":
+        hour += 12
+    return hour * 60 + minute
+
+
+def parse_days(day_type: str) -> List[int]:
+    """
+    Parse a day pattern into weekday indices.
+
+    Args:
+        day_type: Day pattern such as "MWF" or "TTh"
+
+    Returns:
+        Sorted weekday indices (Monday is 0)
+    """
+    return sorted({DAY_INDEX[day] for day in DAY_PATTERN.findall(day_type)})
+
+
+def parse_time_range(time_slot: str) -> Tuple[int, int]:
+    """
+    Parse a time slot into start and end minutes after midnight.
+
+    Args:
+        time_slot: Time range such as "10:10 AM - 11:00 AM"
+
+    Returns:
+        Tuple of (start minute, end minute)
+
+    Raises:
+        ValueError: If the time slot cannot be parsed
+    """
+    times = [clock_to_minutes(m) for m in CLOCK_PATTERN.finditer(time_slot)]
+    if len(times) != 2 or times[0] >= times[1]:
+        raise ValueError(f"Unrecognized time slot: {time_slot!r}")
+    return times[0], times[1]
+
+
+def _day_mask(start: int, end: int) -> int:
+    """Build the single-day tick mask covering [start, end) minutes."""
+    first = start // TICK_MINUTES
+    last = -(-end // TICK_MINUTES)
+    return ((1 << (last - first)) - 1) << first
+
+
+@lru_cache(maxsize=None)
+def section_mask(day_type: str, time_slot: str) -> int:
+    """
+    Compile a section's meeting pattern into a weekly tick bitmask.
+
+    Args:
+        day_type: Day pattern such as "MWF" or "TTh"
+        time_slot: Time range such as "10:10 AM - 11:00 AM"
+
+    Returns:
+        Integer bitmask with one bit per occupied 5-minute weekday tick
+
+    Raises:
+        ValueError: If the time slot cannot be parsed
+    """
+    day_mask = _day_mask(*parse_time_range(time_slot))
+    mask = 0
+    for day in parse_days(day_type):
+        mask |= day_mask << (day * TICKS_PER_DAY)
+    return mask
+
+
+def window_mask(earliest: int = 0, latest: int = 24 * 60) -> int:
+    """
+    Build a mask of every weekday tick inside a daily time window.
+
+    A section fits the window when ``mask & ~window_mask(...) == 0``.
+
+    Args:
+        earliest: Window start in minutes after midnight
+        latest: Window end in minutes after midnight
+
+    Returns:
+        Integer bitmask covering [earliest, latest) on each weekday
+    """
+    if earliest >= latest:
+        return 0
+    day_mask = _day_mask(earliest, latest)
+    mask = 0
+    for day in range(len(WEEKDAYS)):
+        mask |= day_mask << (day * TICKS_PER_DAY)
+    return mask
+
+
+def _compile_config_slots() -> Dict[Tuple[str, str], int]:
+    """Precompile every configured MWF/TTh slot."""
+    compiled = {}
+    for day_type, slots in (("MWF", MWF_TIME_SLOTS), ("TTh", TTH_TIME_SLOTS)):
+        for time_slot in slots:
+            compiled[(day_type, time_slot)] = section_mask(day_type, time_slot)
+    return compiled
+
+
+# Masks for every slot in src.config, keyed by (day_type, time_slot)
+COMPILED_SLOTS = _compile_config_slots()
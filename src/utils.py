@@ -2,72 +2,420 @@
 
 import json
 import logging
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, Generator, Iterable, Iterator, List, Optional, Set
 
-import boto3
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, ConnectTimeoutError, ReadTimeoutError
 
 from src.config import (
     AWS_REGION,
+    BEDROCK_FALLBACK_TO_LOCAL,
+    CALL_API_DEADLINE_SECONDS,
+    CALL_API_RETRIEVE_SHARE,
     FORMAT_MODEL_ID,
     KNOWLEDGE_BASE_ID,
     MAX_GENERATION_LENGTH,
+    PARSER_MIN_CONFIDENCE,
+    PROMPT_CHARS_PER_TOKEN,
+    PROMPT_OFFERINGS_TOKEN_BUDGET,
+    RESPONSE_CACHE_ENABLED,
     RETRIEVE_MODEL_ARN,
     TARGET_MAX_CREDITS,
     TARGET_MIN_CREDITS,
     TEMPERATURE,
     TOP_P,
 )
+from src.aws_clients import get_client, timeout_bucket
+from src.catalog_index import get_catalog_index
+from src.catalog_walker import COURSE_CODE_PATTERN, walk_catalog
+from src.metrics import (
+    BEDROCK_BYTES_SENT,
+    BEDROCK_ERRORS,
+    BEDROCK_REQUESTS,
+    CACHE_HITS,
+    CACHE_MISSES,
+    get_metrics,
+)
+from src.preprocess import create_course_structure
+from src.resilience import CircuitOpenError, Deadline, DeadlineExceeded, get_caller
+from src.response_cache import get_response_cache, profile_key
+from src.response_parser import (
+    TIME_RANGE_PATTERN,
+    format_recommendations,
+    known_courses,
+    parse_recommendations,
+)
+from src.scheduler import format_schedule, solve_schedule, time_window_mask
+from src.time_slots import parse_time_range, section_mask
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
-def call_api(student: Dict[str, Any]) -> Optional[List[str]]:
+def call_api(
+    student: Dict[str, Any],
+    use_model: bool = True,
+    deadline: Optional[float] = CALL_API_DEADLINE_SECONDS,
+) -> Optional[List[str]]:
     """
     Generate class schedule recommendations for a student.
 
+    A conflict-free schedule is first solved locally (see src.scheduler).
+    With ``use_model`` it is handed to Bedrock as the candidate set;
+    without it the local schedule is returned directly. Model results are
+    cached per canonical student profile (see src.response_cache). Bedrock
+    calls are retried and circuit-broken by src.resilience; if they still
+    fail, the local schedule is returned when BEDROCK_FALLBACK_TO_LOCAL is set.
+
+    With a deadline, retrieve_and_generate gets CALL_API_RETRIEVE_SHARE of
+    the time left after prompt building and the formatting model gets the
+    rest, each call using client timeouts that fit its budget. If the
+    formatting model is skipped or times out for lack of time, the
+    unformatted model text is returned as a PartialRecommendation instead
+    of blocking past the deadline; partial results are not cached.
+
     Args:
         student: Dictionary containing student information with keys:
             - completed_courses: List of completed course codes
             - current_courses: List of currently enrolled course codes
             - time_constraints: Optional time slot constraints
+        use_model: Whether to call Bedrock or return the local schedule
+        deadline: Total seconds allowed, or None to wait for every stage
+
+    Returns:
+        List of recommended classes with scheduling info (a
+        PartialRecommendation if cut short by the deadline), or None on
+        failure
+    """
+    budget = Deadline(deadline) if deadline is not None else None
+    if not use_model:
+        local_schedule = solve_local_schedule(student)
+        if not local_schedule or not local_schedule["courses"]:
+            logger.error("Local schedule solver found no schedule")
+            return None
+        return format_schedule(local_schedule)
+
+    # Serve repeated profiles from the response cache
+    cache = get_response_cache() if RESPONSE_CACHE_ENABLED else None
+    cache_key = profile_key(student)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            get_metrics().inc(CACHE_HITS, cache="response")
+            logger.info("Serving recommendation from response cache")
+            return cached
+        get_metrics().inc(CACHE_MISSES, cache="response")
+
+    # Build comprehensive prompt around a locally solved schedule
+    local_schedule = solve_local_schedule(student)
+    input_text = build_student_prompt(student, local_schedule)
+
+    # Get recommendation from Bedrock
+    response_text = retrieve_and_generate(
+        input_text,
+        KNOWLEDGE_BASE_ID,
+        deadline=(
+            budget.share(CALL_API_RETRIEVE_SHARE) if budget is not None else None
+        ),
+    )
+    if not response_text:
+        logger.error("No response from retrieve_and_generate")
+        return local_fallback(local_schedule)
+
+    logger.debug("Raw Bedrock response: %s", response_text)
+
+    # Format response into structured list
+    try:
+        parsed = create_list(response_text, deadline=budget)
+    except DeadlineExceeded as e:
+        # The unformatted answer beats nothing at the deadline
+        logger.warning("Returning unformatted recommendation: %s", e)
+        return PartialRecommendation(_raw_lines(response_text)) or None
+
+    if not parsed:
+        logger.error("Could not format the Bedrock response")
+        return local_fallback(local_schedule)
+    if cache is not None:
+        cache.put(cache_key, parsed)
+    return parsed
+
+
+def stream_call_api(
+    student: Dict[str, Any],
+    deadline: Optional[float] = CALL_API_DEADLINE_SECONDS,
+) -> Iterator[str]:
+    """
+    Streaming variant of call_api that yields courses as they arrive.
+
+    Uses the streaming retrieve_and_generate API and parses the partial
+    output locally, so the first course can be shown long before the model
+    finishes. Cached profiles are replayed immediately. The stream stops at
+    the deadline, and a formatting fallback that runs out of time yields
+    the unformatted text instead; a result cut short is not cached.
+
+    Args:
+        student: Student dictionary (see call_api)
+        deadline: Total seconds allowed, or None to read the whole stream
+
+    Yields:
+        Recommended classes with scheduling info, one line at a time
+    """
+    budget = Deadline(deadline) if deadline is not None else None
+    cache = get_response_cache() if RESPONSE_CACHE_ENABLED else None
+    cache_key = profile_key(student)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            get_metrics().inc(CACHE_HITS, cache="response")
+            logger.info("Serving recommendation from response cache")
+            yield from cached
+            return
+        get_metrics().inc(CACHE_MISSES, cache="response")
+
+    local_schedule = solve_local_schedule(student)
+    input_text = build_student_prompt(student, local_schedule)
+
+    lines: List[str] = []
+    chunks = retrieve_and_generate_stream(
+        input_text, KNOWLEDGE_BASE_ID, deadline=budget
+    )
+    cut_short = yield from _recorded(
+        stream_recommendation_lines(chunks, deadline=budget), lines
+    )
+
+    if not lines:
+        logger.error("No recommendations from retrieve_and_generate_stream")
+        yield from local_fallback(local_schedule) or []
+    elif cache is not None and not cut_short:
+        if budget is None or not budget.expired():
+            cache.put(cache_key, lines)
+
+
+def _recorded(
+    lines: Generator[str, None, bool], into: List[str]
+) -> Generator[str, None, bool]:
+    """Pass lines through while keeping a copy, returning the generator's value."""
+    cut_short = False
+    try:
+        while True:
+            line = next(lines)
+            into.append(line)
+            yield line
+    except StopIteration as stop:
+        cut_short = bool(stop.value)
+    finally:
+        lines.close()
+    return cut_short
+
+
+def _raw_lines(text: str) -> List[str]:
+    """Non-empty lines of unformatted model text."""
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+class PartialRecommendation(List[str]):
+    """Unformatted recommendation lines returned because the deadline ran out."""
+
+    partial = True
+
+
+def local_fallback(local_schedule: Optional[Dict[str, Any]]) -> Optional[List[str]]:
+    """Lines of the local schedule when Bedrock failed, if fallback is enabled."""
+    if not BEDROCK_FALLBACK_TO_LOCAL or not local_schedule:
+        return None
+    if not local_schedule["courses"]:
+        return None
+    logger.warning("Bedrock unavailable; serving the locally solved schedule")
+    return format_schedule(local_schedule)
+
+
+def solve_local_schedule(student: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Solve a conflict-free schedule for a student without calling a model.
+
+    Args:
+        student: Student dictionary as passed to call_api
+
+    Returns:
+        Result of src.scheduler.solve_schedule, or None if the class schedule
+        is unavailable
+    """
+    try:
+        with get_metrics().span("solve"):
+            return solve_schedule(student)
+    except FileNotFoundError as e:
+        logger.warning("Local schedule solver unavailable: %s", e)
+        return None
+
+
+def build_student_prompt(
+    student: Dict[str, Any],
+    local_schedule: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Build the Bedrock prompt for a student.
+
+    Args:
+        student: Student dictionary as passed to call_api
+        local_schedule: Locally solved schedule to offer as the candidate set
 
     Returns:
-        List of recommended classes with scheduling info, or None on failure
+        Prompt text for retrieve_and_generate
     """
+    with get_metrics().span("prompt"):
+        return _student_prompt(student, local_schedule)
+
+
+def _student_prompt(
+    student: Dict[str, Any],
+    local_schedule: Optional[Dict[str, Any]],
+) -> str:
+    """Build the Bedrock prompt for a student (see build_student_prompt)."""
     completed = student.get("completed_courses", []) or []
     current = student.get("current_courses", []) or []
-    time_constraints = student.get("time_constraints")
 
     # Format course lists for prompt
     completed_text = "\n".join(f"- {c}" for c in completed) if completed else "None"
     current_text = "\n".join(f"- {c}" for c in current) if current else "None"
+    eligible = get_catalog_index().eligible(completed, current)
+    offerings_text = _format_offerings(eligible, student.get("time_constraints"))
+    eligible_text = ", ".join(eligible) if eligible and not offerings_text else None
+    candidate_text = (
+        "\n".join(f"- {line}" for line in format_schedule(local_schedule))
+        if local_schedule and local_schedule["courses"]
+        else None
+    )
 
-    # Build comprehensive prompt
-    input_text = _build_schedule_prompt(
-        completed_text, current_text, time_constraints
+    return _build_schedule_prompt(
+        completed_text,
+        current_text,
+        student.get("time_constraints"),
+        candidate_text,
+        eligible_text,
+        offerings_text,
     )
 
-    # Get recommendation from Bedrock
-    response_text = retrieve_and_generate(input_text, KNOWLEDGE_BASE_ID)
-    if not response_text:
-        logger.error("No response from retrieve_and_generate")
-        return None
 
-    logger.debug("Raw Bedrock response: %s", response_text)
+@lru_cache(maxsize=1)
+def _course_groups() -> Dict[str, str]:
+    """Map each course code to the first requirement group or year listing it."""
+    groups: Dict[str, str] = {}
+    for record in walk_catalog(create_course_structure()):
+        if record["code"] and record["group"]:
+            groups.setdefault(record["code"], record["group"])
+    return groups
 
-    # Format response into structured list
-    parsed = create_list(response_text)
-    return parsed
+
+def _format_offerings(
+    eligible: List[str],
+    time_constraints: Optional[str] = None,
+    token_budget: int = PROMPT_OFFERINGS_TOKEN_BUDGET,
+) -> Optional[str]:
+    """
+    Encode the sections of eligible courses compactly for the prompt.
+
+    One line per course, e.g. "CPSC 2070 Discrete Structures for Computing
+    (3cr, sophomore_year) | 1 MWF 0800-0850 | ...", where the label is the
+    requirement group or year the catalog lists the course under.
+    Sections outside the window the time constraints allow are left out,
+    as the local solver does, and so are courses with no section left.
+    Courses on a prerequisite chain come first; lines that would exceed the
+    token budget (estimated at PROMPT_CHARS_PER_TOKEN characters per token)
+    are dropped and counted in a trailing note.
+
+    Args:
+        eligible: Eligible course codes
+        time_constraints: Free-text time constraints of the student
+        token_budget: Approximate token limit for the whole block
+
+    Returns:
+        Offerings block, or None if no eligible course has sections
+    """
+    try:
+        courses = known_courses()
+    except FileNotFoundError as e:
+        logger.warning("Class offerings unavailable for prompt: %s", e)
+        return None
+
+    index = get_catalog_index()
+    groups = _course_groups()
+    outside = ~time_window_mask(time_constraints)
+    header = (
+        "(one course per line: code title (credits, group) | section days start-end)"
+    )
+    char_budget = token_budget * PROMPT_CHARS_PER_TOKEN - len(header)
+
+    lines = [header]
+    omitted = 0
+    for code in sorted(
+        eligible, key=lambda c: (not index.prerequisites(c), c.split()[1], c)
+    ):
+        offering = courses.get(code)
+        if not offering or not offering.get("sections"):
+            continue
+
+        title = offering["course"].split(" - ", 1)[-1]
+        credits = offering.get("credits", index.credits.get(code))
+        labels = [f"{credits}cr" if credits else "", groups.get(code, "")]
+        labels_text = ", ".join(label for label in labels if label)
+        parts = [f"{code} {title}" + (f" ({labels_text})" if labels_text else "")]
+        for section in offering["sections"]:
+            try:
+                start, end = parse_time_range(section["time_slot"])
+                mask = section_mask(section["day_type"], section["time_slot"])
+            except (KeyError, ValueError):
+                continue
+            if mask & outside:
+                continue
+            parts.append(
+                f"{section.get('section_id', '?')} {section.get('day_type', '')} "
+                f"{start // 60:02d}{start % 60:02d}-{end // 60:02d}{end % 60:02d}"
+            )
+
+        if len(parts) == 1:
+            continue
+        line = " | ".join(parts)
+        if len(line) + 1 > char_budget:
+            omitted += 1
+            continue
+        char_budget -= len(line) + 1
+        lines.append(line)
+
+    if len(lines) == 1:
+        return None
+    if omitted:
+        lines.append(f"(+{omitted} more eligible courses omitted)")
+    return "\n".join(lines)
 
 
 def _build_schedule_prompt(
     completed_text: str,
     current_text: str,
     time_constraints: Optional[str],
+    candidate_text: Optional[str] = None,
+    eligible_text: Optional[str] = None,
+    offerings_text: Optional[str] = None,
 ) -> str:
     """Build the scheduling prompt for Bedrock."""
+    offerings_block = (
+        f"\n{offerings_text}"
+        if offerings_text
+        else " [Provide the list of available courses in JSON format]"
+    )
+    eligible_block = (
+        "**Courses I Am Eligible For (prerequisites already verified):** "
+        f"{eligible_text}\n\n"
+        if eligible_text
+        else ""
+    )
+    candidate_block = (
+        "**Pre-checked Conflict-Free Schedule:** These sections were verified "
+        "against prerequisites and class times. Start from this schedule and "
+        "only change it if a requirement below demands it:\n"
+        f"{candidate_text}\n\n"
+        if candidate_text
+        else ""
+    )
     return (
         "I am currently planning my class schedule for the next semester. "
         "Here is a list of courses I have already completed or am currently enrolled in. "
@@ -75,8 +423,9 @@ def _build_schedule_prompt(
         f"**Completed Courses:**\n{completed_text}\n\n"
         f"**Currently Enrolled Courses:**\n{current_text}\n\n"
         f"**Time Constraints:** {time_constraints or 'None'}\n\n"
-        "**Class Offerings for the Next Semester:** "
-        "[Provide the list of available courses in JSON format]\n\n"
+        f"{eligible_block}"
+        f"**Class Offerings for the Next Semester:**{offerings_block}\n\n"
+        f"{candidate_block}"
         "**Task:** Based on the courses I have already completed and the available "
         "class offerings for the next semester, create a class schedule for me. "
         "Please make sure to:\n"
@@ -95,10 +444,52 @@ def _build_schedule_prompt(
     )
 
 
+def _retrieve_payload(input_text: str, kb_id: str) -> Dict[str, Any]:
+    """Build the retrieve_and_generate request payload."""
+    return {
+        "input": {"text": input_text},
+        "retrieveAndGenerateConfiguration": {
+            "type": "KNOWLEDGE_BASE",
+            "knowledgeBaseConfiguration": {
+                "knowledgeBaseId": kb_id,
+                "modelArn": RETRIEVE_MODEL_ARN,
+            },
+        },
+    }
+
+
+def _stage_timeout(operation: str, deadline: Optional[Deadline]) -> Optional[float]:
+    """Client timeout fitting a stage's remaining budget (None if none fits)."""
+    if deadline is None:
+        return None
+    timeout = timeout_bucket(deadline.remaining())
+    if timeout is None:
+        logger.warning("Skipping %s: deadline budget exhausted", operation)
+        get_metrics().inc(BEDROCK_ERRORS, operation=operation, code="DeadlineExceeded")
+    return timeout
+
+
+def _record_request(operation: str, payload_bytes: int) -> None:
+    """Count a Bedrock request and its payload size."""
+    metrics = get_metrics()
+    metrics.inc(BEDROCK_REQUESTS, operation=operation)
+    metrics.inc(BEDROCK_BYTES_SENT, payload_bytes, operation=operation)
+
+
+def _record_error(operation: str, error: Exception) -> None:
+    """Count a failed Bedrock request by error code."""
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code", "Unknown")
+    else:
+        code = type(error).__name__
+    get_metrics().inc(BEDROCK_ERRORS, operation=operation, code=code)
+
+
 def retrieve_and_generate(
     input_text: str,
     kb_id: str,
     region: str = AWS_REGION,
+    deadline: Optional[Deadline] = None,
 ) -> Optional[str]:
     """
     Call AWS Bedrock Agent Runtime retrieve_and_generate API.
@@ -107,25 +498,28 @@ def retrieve_and_generate(
         input_text: The prompt text for the knowledge base query
         kb_id: Knowledge base ID
         region: AWS region name
+        deadline: Time budget for the call and its retries, or None for the
+            default client timeouts
 
     Returns:
         Generated text response or None on failure
     """
-    try:
-        client = boto3.client("bedrock-agent-runtime", region_name=region)
-
-        payload = {
-            "input": {"text": input_text},
-            "retrieveAndGenerateConfiguration": {
-                "type": "KNOWLEDGE_BASE",
-                "knowledgeBaseConfiguration": {
-                    "knowledgeBaseId": kb_id,
-                    "modelArn": RETRIEVE_MODEL_ARN,
-                },
-            },
-        }
+    timeout = _stage_timeout("retrieve_and_generate", deadline)
+    if deadline is not None and timeout is None:
+        return None
 
-        response = client.retrieve_and_generate(**payload)
+    try:
+        client = get_client("bedrock-agent-runtime", region, timeout)
+        payload = _retrieve_payload(input_text, kb_id)
+        _record_request("retrieve_and_generate", len(input_text.encode("utf-8")))
+
+        with get_metrics().span("retrieve_and_generate"):
+            response = get_caller("retrieve_and_generate").call(
+                client.retrieve_and_generate,
+                deadline=deadline,
+                attempt_seconds=timeout or 0.0,
+                **payload,
+            )
 
         # Navigate response structure safely
         output = response.get("output") or {}
@@ -136,34 +530,306 @@ def retrieve_and_generate(
 
         return text
 
+    except CircuitOpenError as e:
+        _record_error("retrieve_and_generate", e)
+        logger.warning("Skipping retrieve_and_generate: %s", e)
+        return None
     except ClientError as e:
+        _record_error("retrieve_and_generate", e)
         logger.exception("AWS ClientError in retrieve_and_generate: %s", e)
         return None
     except Exception as e:
+        _record_error("retrieve_and_generate", e)
         logger.exception("Unexpected error in retrieve_and_generate: %s", e)
         return None
 
 
+def retrieve_and_generate_stream(
+    input_text: str,
+    kb_id: str,
+    region: str = AWS_REGION,
+    deadline: Optional[Deadline] = None,
+) -> Iterator[str]:
+    """
+    Call the streaming retrieve_and_generate API and yield text as it arrives.
+
+    Errors are logged and end the stream early. Opening the stream and
+    waiting for its events are timed as separate stages; the time the
+    caller spends between chunks is not counted.
+
+    Args:
+        input_text: The prompt text for the knowledge base query
+        kb_id: Knowledge base ID
+        region: AWS region name
+        deadline: Time budget for the whole stream, or None for the default
+            client timeouts; the client timeout is picked to fit it and the
+            stream is closed once it expires
+
+    Yields:
+        Generated text chunks in order
+    """
+    timeout = _stage_timeout("retrieve_and_generate_stream", deadline)
+    if deadline is not None and timeout is None:
+        return
+
+    try:
+        client = get_client("bedrock-agent-runtime", region, timeout)
+        _record_request("retrieve_and_generate_stream", len(input_text.encode("utf-8")))
+        metrics = get_metrics()
+        with metrics.span("retrieve_and_generate_stream"):
+            # A stream cannot be hedged: the duplicate would be wasted work
+            response = get_caller("retrieve_and_generate_stream").call(
+                client.retrieve_and_generate_stream,
+                hedge=False,
+                deadline=deadline,
+                attempt_seconds=timeout or 0.0,
+                **_retrieve_payload(input_text, kb_id),
+            )
+
+        # Time only the waits for Bedrock, not the consumer of each chunk
+        stream = response.get("stream") or []
+        events = metrics.time_iter("retrieve_and_generate_stream_read", stream)
+        try:
+            for event in events:
+                text = (event.get("output") or {}).get("text")
+                if text:
+                    yield text
+                if deadline is not None and deadline.expired():
+                    logger.warning("Closing retrieve_and_generate_stream at deadline")
+                    metrics.inc(
+                        BEDROCK_ERRORS,
+                        operation="retrieve_and_generate_stream",
+                        code="DeadlineExceeded",
+                    )
+                    break
+        finally:
+            events.close()
+            if hasattr(stream, "close"):
+                stream.close()
+
+    except CircuitOpenError as e:
+        _record_error("retrieve_and_generate_stream", e)
+        logger.warning("Skipping retrieve_and_generate_stream: %s", e)
+    except ClientError as e:
+        _record_error("retrieve_and_generate_stream", e)
+        logger.exception("AWS ClientError in retrieve_and_generate_stream: %s", e)
+    except Exception as e:
+        _record_error("retrieve_and_generate_stream", e)
+        logger.exception("Unexpected error in retrieve_and_generate_stream: %s", e)
+
+
+def stream_recommendation_lines(
+    chunks: Iterable[str],
+    deadline: Optional[Deadline] = None,
+) -> Generator[str, None, bool]:
+    """
+    Turn streamed model text into recommendation lines as early as possible.
+
+    Text is split into complete lines, and only the open segment (the lines
+    since the last one mentioning a known course) is parsed again when a
+    line with a meeting time arrives, so the work stays linear in the
+    response length. Courses whose
+    meeting time matches a real section are yielded as soon as their line is
+    complete. Unverified courses are held back, because a line cannot be
+    retracted once sent, and are only yielded at the end if the share of
+    verified courses reaches PARSER_MIN_CONFIDENCE, as in create_list. If
+    nothing could be yielded, the full text goes through create_list
+    (including its model fallback) instead; if that model call runs out of
+    time, the unformatted lines are yielded.
+
+    Args:
+        chunks: Text chunks, e.g. from retrieve_and_generate_stream
+        deadline: Time budget for the formatting fallback, or None for the
+            default client timeouts
+
+    Yields:
+        Formatted recommendation lines
+
+    Returns:
+        True if the formatting fallback was cut short by the deadline
+    """
+    try:
+        courses: Optional[Dict[str, Dict[str, Any]]] = known_courses()
+    except FileNotFoundError as e:
+        logger.warning("Local response parser unavailable: %s", e)
+        courses = None
+
+    received: List[str] = []
+    partial = ""
+    segment: List[str] = []
+    seen: Set[str] = set()
+    held: List[Dict[str, Any]] = []
+    verified_count = 0
+
+    def parse_segment(final: bool) -> List[str]:
+        nonlocal verified_count
+        if courses is None or not segment:
+            return []
+        records, _ = parse_recommendations("\n".join(segment), courses)
+        fresh = [r for r in records if r["time_slot"] and r["code"] not in seen]
+        verified = [r for r in fresh if r["verified"]]
+        seen.update(r["code"] for r in verified)
+        verified_count += len(verified)
+        if final:
+            # Later lines can no longer add a verified time to these
+            held.extend(r for r in fresh if not r["verified"])
+            seen.update(r["code"] for r in fresh)
+            segment.clear()
+        return format_recommendations(verified)
+
+    def add_line(line: str) -> List[str]:
+        ready = []
+        if _mentions_course(line, courses):
+            ready = parse_segment(final=True)
+            segment.append(line)
+        elif segment:
+            segment.append(line)
+        if segment and TIME_RANGE_PATTERN.search(line):
+            # Only a line with a meeting time can complete a course
+            ready += parse_segment(final=False)
+        return ready
+
+    for chunk in chunks:
+        received.append(chunk)
+        partial += chunk
+        if "\n" in chunk:
+            *lines, partial = partial.split("\n")
+            for line in lines:
+                yield from add_line(line)
+
+    if partial:
+        yield from add_line(partial)
+    yield from parse_segment(final=True)
+
+    shown = verified_count
+    if held:
+        confidence = verified_count / (verified_count + len(held))
+        if confidence >= PARSER_MIN_CONFIDENCE:
+            yield from format_recommendations(held)
+            shown += len(held)
+        else:
+            logger.info(
+                "Dropping %d unverified streamed courses (confidence %.2f below %.2f)",
+                len(held),
+                confidence,
+                PARSER_MIN_CONFIDENCE,
+            )
+
+    if not shown and received:
+        text = "".join(received)
+        try:
+            formatted = create_list(text, deadline=deadline)
+        except DeadlineExceeded as e:
+            logger.warning("Yielding unformatted recommendation: %s", e)
+            yield from _raw_lines(text)
+            return True
+        yield from formatted or []
+    return False
+
+
+def _mentions_course(line: str, courses: Optional[Dict[str, Dict[str, Any]]]) -> bool:
+    """Whether a line mentions a course from the class schedule."""
+    if courses is None:
+        return False
+    return any(
+        f"{match.group(1)} {match.group(2)}" in courses
+        for match in COURSE_CODE_PATTERN.finditer(line)
+    )
+
+
+def create_structured_list(response: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Parse the Bedrock response locally into structured course records.
+
+    Args:
+        response: Raw text response from Bedrock
+
+    Returns:
+        Records with code, course, day_type, time_slot and section_id keys,
+        or None if the response could not be parsed with enough confidence
+    """
+    try:
+        records, confidence = parse_recommendations(response)
+    except FileNotFoundError as e:
+        logger.warning("Local response parser unavailable: %s", e)
+        return None
+
+    if not records or confidence < PARSER_MIN_CONFIDENCE:
+        logger.info(
+            "Local parse confidence %.2f below %.2f", confidence, PARSER_MIN_CONFIDENCE
+        )
+        return None
+
+    return records
+
+
 def create_list(
     response: str,
     region: str = AWS_REGION,
+    deadline: Optional[Deadline] = None,
 ) -> Optional[List[str]]:
     """
     Format the Bedrock response into a structured list of classes.
 
+    The response is parsed locally first (see src.response_parser); the
+    FORMAT_MODEL_ID model is only called when parsing confidence is below
+    PARSER_MIN_CONFIDENCE, and only if it fits in the deadline.
+
     Args:
         response: Raw text response from Bedrock
         region: AWS region name
+        deadline: Time budget for the formatting model call, or None for the
+            default client timeouts
 
     Returns:
         List of formatted class entries (one per line) or None on failure
+
+    Raises:
+        DeadlineExceeded: If the formatting model was needed but skipped or
+            timed out because the deadline ran out
     """
     if not response:
         logger.warning("Empty response provided to create_list")
         return None
 
+    with get_metrics().span("parse"):
+        records = create_structured_list(response)
+    if records:
+        return format_recommendations(records)
+
+    return format_with_model(response, region, deadline)
+
+
+def format_with_model(
+    response: str,
+    region: str = AWS_REGION,
+    deadline: Optional[Deadline] = None,
+) -> Optional[List[str]]:
+    """
+    Ask the FORMAT_MODEL_ID model to list the classes in a response.
+
+    This is the fallback create_list uses when local parsing is not
+    confident enough.
+
+    Args:
+        response: Raw text response from Bedrock
+        region: AWS region name
+        deadline: Time budget for the call, or None for the default client
+            timeouts
+
+    Returns:
+        List of formatted class entries (one per line) or None on failure
+
+    Raises:
+        DeadlineExceeded: If the call was skipped or timed out because the
+            deadline ran out
+    """
+    timeout = _stage_timeout("invoke_model", deadline)
+    if deadline is not None and timeout is None:
+        raise DeadlineExceeded("No time left for the formatting model")
+
     try:
-        client = boto3.client("bedrock-runtime", region_name=region)
+        client = get_client("bedrock-runtime", region, timeout)
 
         # Build formatting prompt
         prompt = (
@@ -187,17 +853,22 @@ def create_list(
 
         # Invoke formatting model
         body = json.dumps(native_request).encode("utf-8")
-        response_obj = client.invoke_model(
-            modelId=FORMAT_MODEL_ID,
-            body=body,
-            contentType="application/json",
-            accept="application/json",
-        )
-
-        # Parse response body
-        raw = response_obj.get("body")
-        if hasattr(raw, "read"):
-            raw = raw.read()
+        _record_request("invoke_model", len(body))
+        with get_metrics().span("format_model"):
+            response_obj = get_caller("invoke_model").call(
+                client.invoke_model,
+                deadline=deadline,
+                attempt_seconds=timeout or 0.0,
+                modelId=FORMAT_MODEL_ID,
+                body=body,
+                contentType="application/json",
+                accept="application/json",
+            )
+
+            # Parse response body
+            raw = response_obj.get("body")
+            if hasattr(raw, "read"):
+                raw = raw.read()
         if isinstance(raw, (bytes, bytearray)):
             raw = raw.decode("utf-8")
 
@@ -223,9 +894,21 @@ def create_list(
 
         return lines
 
+    except CircuitOpenError as e:
+        _record_error("invoke_model", e)
+        logger.warning("Skipping the formatting model: %s", e)
+        return None
     except ClientError as e:
-        logger.exception("AWS ClientError in create_list: %s", e)
+        _record_error("invoke_model", e)
+        logger.exception("AWS ClientError in format_with_model: %s", e)
+        return None
+    except (ConnectTimeoutError, ReadTimeoutError) as e:
+        _record_error("invoke_model", e)
+        if deadline is not None:
+            raise DeadlineExceeded(f"Formatting model timed out: {e}") from e
+        logger.exception("Timeout in format_with_model: %s", e)
         return None
     except Exception as e:
-        logger.exception("Unexpected error in create_list: %s", e)
+        _record_error("invoke_model", e)
+        logger.exception("Unexpected error in format_with_model: %s", e)
         return None
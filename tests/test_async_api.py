@@ -0,0 +1,94 @@
+"""Tests for the asyncio pipeline wrappers."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src import async_api
+from src.resilience import Deadline
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    seen = []
+
+    def fake_call_api(student, use_model, deadline):
+        seen.append((student["id"], use_model, deadline, threading.current_thread()))
+        time.sleep(student.get("delay", 0))
+        if student.get("fail"):
+            raise RuntimeError("boom")
+        return [f"{student['id']} course"]
+
+    monkeypatch.setattr(async_api, "call_api", fake_call_api)
+    return seen
+
+
+def test_call_api_async_runs_call_api_off_the_loop(calls):
+    result = asyncio.run(async_api.call_api_async({"id": "a"}, timeout=5))
+
+    assert result == ["a course"]
+    ((student_id, use_model, deadline, thread),) = calls
+    assert (student_id, use_model, deadline) == ("a", True, 5)
+    assert thread is not threading.main_thread()
+
+
+def test_default_deadline_without_timeout(calls):
+    asyncio.run(async_api.call_api_async({"id": "a"}, use_model=False))
+
+    assert calls[0][1:3] == (False, async_api.CALL_API_DEADLINE_SECONDS)
+
+
+def test_timeout_raises(calls):
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(async_api.call_api_async({"id": "a", "delay": 0.5}, timeout=0.05))
+
+
+def test_call_api_many_keeps_order_and_isolates_failures(calls):
+    students = [
+        {"id": "a", "delay": 0.05},
+        {"id": "b", "fail": True},
+        {"id": "c", "delay": 0.5},
+        {"id": "d"},
+    ]
+
+    results = asyncio.run(async_api.call_api_many(students, timeout=0.3))
+
+    assert results == [["a course"], None, None, ["d course"]]
+
+
+@pytest.fixture
+def deadlines(monkeypatch):
+    seen = {}
+
+    def fake_retrieve_and_generate(input_text, kb_id, region, deadline=None):
+        seen["retrieve_and_generate"] = deadline
+        return "CPSC 2120"
+
+    def fake_create_list(response, region, deadline=None):
+        seen["create_list"] = deadline
+        return [response]
+
+    monkeypatch.setattr(async_api, "retrieve_and_generate", fake_retrieve_and_generate)
+    monkeypatch.setattr(async_api, "create_list", fake_create_list)
+    return seen
+
+
+def test_timeout_reaches_bedrock_calls_as_a_deadline(deadlines):
+    async def pipeline():
+        text = await async_api.retrieve_and_generate_async("p", "kb", timeout=5)
+        return await async_api.create_list_async(text, timeout=3)
+
+    assert asyncio.run(pipeline()) == ["CPSC 2120"]
+    assert isinstance(deadlines["retrieve_and_generate"], Deadline)
+    assert 4 < deadlines["retrieve_and_generate"].remaining() <= 5
+    assert isinstance(deadlines["create_list"], Deadline)
+    assert 2 < deadlines["create_list"].remaining() <= 3
+
+
+def test_no_timeout_means_no_deadline(deadlines):
+    asyncio.run(async_api.retrieve_and_generate_async("p", "kb"))
+    asyncio.run(async_api.create_list_async("CPSC 2120"))
+
+    assert deadlines == {"retrieve_and_generate": None, "create_list": None}
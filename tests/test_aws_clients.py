@@ -0,0 +1,50 @@
+"""Tests for the shared boto3 client pool."""
+
+import threading
+
+import pytest
+
+from src import aws_clients
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    aws_clients.reset_clients()
+    yield
+    aws_clients.reset_clients()
+
+
+def test_client_is_created_once_and_reused():
+    first = aws_clients.get_client("bedrock-runtime", "us-west-2")
+    second = aws_clients.get_client("bedrock-runtime", "us-west-2")
+
+    assert first is second
+    stats = aws_clients.client_stats()["bedrock-runtime@us-west-2"]
+    assert stats == {"created": 1, "lookups": 2, "api_calls": 0}
+
+
+def test_lookups_are_counted_exactly_under_concurrency():
+    aws_clients.get_client("bedrock-runtime", "us-west-2")
+    threads, lookups = 8, 2000
+
+    def look_up():
+        for _ in range(lookups):
+            aws_clients.get_client("bedrock-runtime", "us-west-2")
+
+    workers = [threading.Thread(target=look_up) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    stats = aws_clients.client_stats()["bedrock-runtime@us-west-2"]
+    assert stats["created"] == 1
+    assert stats["lookups"] == threads * lookups + 1
+
+
+def test_installed_client_replaces_pooled_one():
+    fake = object()
+    aws_clients.set_client("bedrock-runtime", fake, "us-west-2")
+
+    assert aws_clients.get_client("bedrock-runtime", "us-west-2") is fake
+    assert aws_clients.get_client("bedrock-runtime", "us-west-2", timeout=5) is fake
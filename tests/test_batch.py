@@ -0,0 +1,122 @@
+"""Tests for resumable batch processing."""
+
+import json
+
+import pytest
+
+from src import batch
+from src.utils import PartialRecommendation
+
+
+def write_jsonl(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+
+def read_jsonl(path):
+    return [json.loads(line) for line in path.read_text().splitlines() if line]
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    seen = []
+
+    def fake_call_api(student):
+        seen.append(student["id"])
+        if student.get("fail"):
+            return None
+        return [f"{student['id']} course"]
+
+    monkeypatch.setattr(batch, "call_api", fake_call_api)
+    return seen
+
+
+def test_processes_every_student(tmp_path, calls):
+    students = tmp_path / "students.jsonl"
+    out = tmp_path / "out" / "results.jsonl"
+    write_jsonl(students, [{"id": "a"}, {"id": "b"}, {"id": "c", "fail": True}])
+
+    counts = batch.run_batch(str(students), str(out), max_workers=2, rate_limit=0)
+
+    assert counts == {"processed": 3, "failed": 1, "partial": 0, "skipped": 0}
+    results = {r["id"]: r for r in read_jsonl(out)}
+    assert results["a"]["recommendations"] == ["a course"]
+    assert results["c"]["error"]
+
+
+def test_resume_skips_successes_and_retries_failures(tmp_path, calls):
+    students = tmp_path / "students.jsonl"
+    out = tmp_path / "results.jsonl"
+    write_jsonl(students, [{"id": "a"}, {"id": "b"}, {"id": "c"}])
+    write_jsonl(
+        out,
+        [
+            {"id": "a", "recommendations": ["x"], "error": None},
+            {"id": "b", "recommendations": None, "error": "boom"},
+        ],
+    )
+    with out.open("a") as f:
+        f.write('{"id": "c", "recomm')
+
+    counts = batch.run_batch(str(students), str(out), max_workers=2, rate_limit=0)
+
+    assert sorted(calls) == ["b", "c"]
+    assert counts == {"processed": 2, "failed": 0, "partial": 0, "skipped": 1}
+    assert batch.completed_ids(str(out)) == {"a", "b", "c"}
+
+
+def test_partial_results_are_recorded_and_retried(tmp_path, monkeypatch):
+    students = tmp_path / "students.jsonl"
+    out = tmp_path / "results.jsonl"
+    write_jsonl(students, [{"id": "a"}, {"id": "b"}])
+
+    def fake_call_api(student):
+        if student["id"] == "a":
+            return PartialRecommendation(["unformatted answer"])
+        return ["b course"]
+
+    monkeypatch.setattr(batch, "call_api", fake_call_api)
+    counts = batch.run_batch(str(students), str(out), max_workers=2, rate_limit=0)
+
+    assert counts == {"processed": 2, "failed": 0, "partial": 1, "skipped": 0}
+    results = {r["id"]: r for r in read_jsonl(out)}
+    assert results["a"]["partial"] and not results["b"]["partial"]
+    assert batch.completed_ids(str(out)) == {"b"}
+
+
+def test_read_students_skips_bad_lines(tmp_path):
+    students = tmp_path / "students.jsonl"
+    students.write_text('{"id": 1}\n\nnot json\n[1, 2]\n"text"\n{"name": "x"}\n')
+
+    assert list(batch.read_students(str(students))) == [
+        ("1", {"id": 1}),
+        ("line-6", {"name": "x"}),
+    ]
+
+
+def test_completed_ids_ignores_non_objects(tmp_path):
+    out = tmp_path / "results.jsonl"
+    out.write_text('[1]\n{"id": "a", "error": null}\n42\n')
+
+    assert batch.completed_ids(str(out)) == {"a"}
+
+
+def test_rejects_zero_workers(tmp_path, calls):
+    students = tmp_path / "students.jsonl"
+    write_jsonl(students, [{"id": "a"}])
+
+    with pytest.raises(ValueError):
+        batch.run_batch(str(students), str(tmp_path / "out.jsonl"), max_workers=0)
+    assert calls == []
+
+
+def test_rate_limiter_spaces_calls(monkeypatch):
+    now = [0.0]
+    sleeps = []
+    monkeypatch.setattr(batch.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(batch.time, "sleep", sleeps.append)
+    limiter = batch.RateLimiter(4.0)
+
+    for _ in range(3):
+        limiter.acquire()
+
+    assert sleeps == [0.25, 0.5]
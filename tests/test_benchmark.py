@@ -0,0 +1,28 @@
+"""Tests for the offline pipeline benchmark."""
+
+from src.benchmark import run_benchmark, summarize
+
+
+def test_summarize_reports_float_statistics():
+    summary = summarize([0.001, 0.002, 0.004])
+
+    assert summary["count"] == 3
+    assert summary["p50_ms"] == 2.0
+    assert summary["max_ms"] == 4.0
+
+
+def test_formatting_model_is_timed_as_its_own_stage():
+    results = run_benchmark(
+        students=6,
+        concurrency=2,
+        retrieve_latency_ms=0,
+        format_latency_ms=0,
+        fallback_rate=1.0,
+        alloc_samples=1,
+    )
+
+    stages = results["stages"]
+    assert stages["parse"]["count"] == 6
+    assert stages["format_model"]["count"] == 6
+    assert "format_model" in results["allocations"]
+    assert results["stage_failures"] == 0
@@ -0,0 +1,193 @@
+"""Tests for the prerequisite DAG index."""
+
+import pytest
+
+from src import catalog_index, catalog_model
+from src.catalog_index import CatalogIndex, build_course_catalog, build_or_paths
+
+CREDITS = {
+    "CPSC 1010": 4,
+    "CPSC 1020": 4,
+    "CPSC 2120": 4,
+    "CPSC 2150": 3,
+    "MATH 1060": 4,
+    "CPSC 3220": 3,
+}
+PREREQS = {
+    "CPSC 1020": ["CPSC 1010"],
+    "CPSC 2120": ["CPSC 1020", "MATH 1060"],
+    "CPSC 2150": ["CPSC 1020"],
+    "CPSC 3220": ["CPSC 2120", "CPSC 2150"],
+}
+
+
+@pytest.fixture
+def index():
+    return CatalogIndex(CREDITS, PREREQS)
+
+
+def test_topological_order(index):
+    position = {code: i for i, code in enumerate(index.codes)}
+    for code, required in PREREQS.items():
+        for prereq in required:
+            assert position[prereq] < position[code]
+
+
+def test_direct_and_transitive_prerequisites(index):
+    assert set(index.prerequisites("CPSC 3220")) == {"CPSC 2120", "CPSC 2150"}
+    assert set(index.prerequisites("CPSC 3220", transitive=True)) == {
+        "CPSC 1010",
+        "CPSC 1020",
+        "MATH 1060",
+        "CPSC 2120",
+        "CPSC 2150",
+    }
+    assert index.prerequisites("CPSC 1010") == []
+    assert index.prerequisites("UNKN 9999") == []
+
+
+def test_prerequisites_accept_titles(index):
+    assert index.prerequisites("cpsc 1020 - Computer Science II") == ["CPSC 1010"]
+
+
+def test_eligible_for_new_student(index):
+    assert set(index.eligible([])) == {"CPSC 1010", "MATH 1060"}
+
+
+def test_current_courses_count_toward_eligibility(index):
+    eligible = set(index.eligible(["CPSC 1010"], ["CPSC 1020"]))
+
+    assert eligible == {"MATH 1060", "CPSC 2150"}
+
+
+def test_every_direct_prerequisite_is_required(index):
+    eligible = index.eligible(["CPSC 1010", "CPSC 1020", "CPSC 2150"])
+
+    assert "CPSC 2120" not in eligible
+    assert "CPSC 3220" not in eligible
+
+
+def test_missing_prerequisites_in_takeable_order(index):
+    missing = index.missing_prerequisites("CPSC 3220", ["CPSC 1010"])
+
+    assert set(missing) == {"CPSC 1020", "MATH 1060", "CPSC 2120", "CPSC 2150"}
+    assert missing.index("CPSC 1020") < missing.index("CPSC 2120")
+    assert index.missing_prerequisites("UNKN 9999", []) == []
+
+
+def test_cycle_is_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        CatalogIndex({}, {"CPSC 1010": ["CPSC 1020"], "CPSC 1020": ["CPSC 1010"]})
+
+
+def test_build_course_catalog_from_structure():
+    structure = {
+        "major": {
+            "sophomore_year": [
+                {
+                    "course": "CPSC 2120 - Algorithms",
+                    "credits": 4,
+                    "prereq": ["CPSC 1020 - Computer Science II", "CPSC 1020"],
+                },
+                {"course": "Natural Science Requirement", "credits": 4},
+            ]
+        }
+    }
+
+    credits, prereqs = build_course_catalog(structure)
+
+    assert credits == {"CPSC 2120": 4}
+    assert prereqs == {"CPSC 2120": ["CPSC 1020"]}
+    assert CatalogIndex.from_structure(structure).eligible([]) == ["CPSC 1020"]
+
+
+PATH_STRUCTURE = {
+    "major": {
+        "freshman_year": [
+            {
+                "course": "Computer Science Foundations",
+                "paths": [
+                    {
+                        "path_name": "Path A",
+                        "courses": [
+                            {"course": "CPSC 1010", "credits": 4},
+                            {"course": "CPSC 1020", "credits": 4},
+                        ],
+                    },
+                    {
+                        "path_name": "Path B",
+                        "courses": [
+                            {"course": "CPSC 1060", "credits": 4},
+                            {"course": "CPSC 1070", "credits": 4},
+                        ],
+                    },
+                ],
+            },
+            {
+                "course": "Systems Elective",
+                "paths": [
+                    {"courses": [{"course": "CPSC 3220", "credits": 3}]},
+                    {"courses": [{"course": "CPSC 3600", "credits": 3}]},
+                ],
+            },
+            {"course": "CPSC 3220", "credits": 3},
+        ]
+    }
+}
+
+
+def test_build_or_paths_from_structure():
+    or_paths, path_only = build_or_paths(PATH_STRUCTURE)
+
+    assert or_paths == [
+        [["CPSC 1010", "CPSC 1020"], ["CPSC 1060", "CPSC 1070"]],
+        [["CPSC 3220"], ["CPSC 3600"]],
+    ]
+    assert path_only == {
+        "CPSC 1010",
+        "CPSC 1020",
+        "CPSC 1060",
+        "CPSC 1070",
+        "CPSC 3600",
+    }
+
+
+def test_satisfied_or_path_alternatives_are_not_eligible():
+    index = CatalogIndex.from_structure(PATH_STRUCTURE)
+
+    assert {"CPSC 1060", "CPSC 1070"} <= set(index.eligible([]))
+    assert {"CPSC 1060", "CPSC 1070"} <= set(index.eligible(["CPSC 1010"]))
+    eligible = index.eligible(["CPSC 1010", "CPSC 1020"])
+    assert "CPSC 1060" not in eligible
+    assert "CPSC 1070" not in eligible
+
+
+def test_alternatives_listed_elsewhere_stay_eligible():
+    index = CatalogIndex.from_structure(PATH_STRUCTURE)
+
+    eligible = index.eligible(["CPSC 3600"])
+
+    assert "CPSC 3220" in eligible
+
+
+def test_shared_index_is_rebuilt_when_the_catalog_changes(monkeypatch):
+    fingerprint = ["a"]
+    built = []
+
+    def fake_catalog():
+        built.append(fingerprint[0])
+        return catalog_model.Catalog([], [])
+
+    monkeypatch.setattr(catalog_model, "catalog_fingerprint", lambda: fingerprint[0])
+    monkeypatch.setattr(catalog_model, "get_catalog", fake_catalog)
+    catalog_index._shared_index.cache_clear()
+
+    try:
+        first = catalog_index.get_catalog_index()
+        assert catalog_index.get_catalog_index() is first
+        fingerprint[0] = "b"
+        assert catalog_index.get_catalog_index() is not first
+    finally:
+        catalog_index._shared_index.cache_clear()
+
+    assert built == ["a", "b"]
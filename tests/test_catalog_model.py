@@ -0,0 +1,49 @@
+"""Tests for the catalog model snapshot."""
+
+import os
+
+from src import catalog_model
+from src.catalog_model import load_catalog
+
+
+def test_snapshot_is_reused_until_the_model_module_changes(tmp_path, monkeypatch):
+    snapshot = str(tmp_path / "catalog.pickle")
+    schedule = str(tmp_path / "missing_schedule.json")
+    module = tmp_path / "catalog_model.py"
+    module.write_text("# v1")
+    monkeypatch.setattr(catalog_model, "__file__", str(module))
+
+    load_catalog(schedule, snapshot)
+    saved = os.stat(snapshot).st_mtime_ns
+    load_catalog(schedule, snapshot)
+    assert os.stat(snapshot).st_mtime_ns == saved
+
+    module.write_text("# v2, new slots")
+    load_catalog(schedule, snapshot)
+    assert os.stat(snapshot).st_mtime_ns != saved
+
+
+def test_prerequisites_resolve_to_course_ids():
+    catalog = load_catalog(snapshot_path=None)
+
+    for course in catalog.courses:
+        assert all(isinstance(i, int) for i in course.prereq_ids)
+
+
+def test_each_structure_source_keeps_its_own_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog_model, "load_structure", lambda path: {})
+    snapshot = str(tmp_path / "catalog.pickle")
+    schedule = str(tmp_path / "missing_schedule.json")
+    first = tmp_path / "first.json"
+    second = tmp_path / "second.json"
+    first.write_text("{}")
+    second.write_text("{}")
+
+    load_catalog(schedule, snapshot, str(first))
+    load_catalog(schedule, snapshot, str(second))
+
+    first_snapshot = catalog_model.source_snapshot_path(snapshot, str(first))
+    second_snapshot = catalog_model.source_snapshot_path(snapshot, str(second))
+    assert first_snapshot != second_snapshot
+    assert os.path.exists(first_snapshot) and os.path.exists(second_snapshot)
+    assert not os.path.exists(snapshot)
@@ -0,0 +1,60 @@
+"""Tests for the plain-text degree path parser."""
+
+from src.catalog_parser import (
+    expand_course_codes,
+    parse_degree_pages,
+    parse_degree_paths,
+)
+from src.catalog_walker import walk_catalog
+
+
+def parse(text):
+    ((_, structure),) = parse_degree_paths(text.splitlines())
+    return structure["requirements"]
+
+
+def test_slash_suffix_expands_to_companion_course():
+    assert expand_course_codes("CPSC 1010/11") == ["CPSC 1010", "CPSC 1011"]
+    assert expand_course_codes("BIOL 1030/BIOL 1050") == ["BIOL 1030", "BIOL 1050"]
+    assert expand_course_codes("CPSC 1010/1020") == ["CPSC 1010", "CPSC 1020"]
+
+
+def test_slash_suffix_that_is_not_a_companion_keeps_base_code():
+    assert expand_course_codes("COMM 1500/51") == ["COMM 1500"]
+
+
+def test_count_is_kept_when_courses_are_listed():
+    groups = parse("Departmental Natural Science: 2 classes\nENSP 2000\nGEOL 1010\n")
+
+    (requirement,) = groups["departmental_natural_science"]
+    assert requirement["count"] == 2
+    assert [c["course"] for c in requirement["courses"]] == ["ENSP 2000", "GEOL 1010"]
+    assert [r["code"] for r in walk_catalog({"requirements": groups})] == [
+        "ENSP 2000",
+        "GEOL 1010",
+    ]
+
+
+def test_count_without_courses_is_a_placeholder():
+    groups = parse("LIT: 1 class\nCore:\nCPSC 2070\n")
+
+    assert groups["lit"] == [{"course": "LIT Requirement", "count": 1}]
+    assert groups["core"] == [{"course": "CPSC 2070"}]
+
+
+def test_lines_before_any_heading_go_to_general():
+    groups = parse("MATH 1060\nMATH 1080\n")
+
+    assert [c["course"] for c in groups["general"]] == ["MATH 1060", "MATH 1080"]
+
+
+def test_degree_pages_include_pages_shared_with_the_next_listing():
+    pages = [
+        "Computer Science, BS\nCore:\nCPSC 1010\n",
+        "CPSC 1020\nMathematics, BS\nCore:\nMATH 1060\n",
+        "MATH 1080\n",
+    ]
+
+    spans = {name: spanned for name, _, spanned in parse_degree_pages(pages)}
+
+    assert spans == {"Computer Science BS": {0, 1}, "Mathematics BS": {1, 2}}
@@ -0,0 +1,264 @@
+"""Tests for section-time generation, catalog merging and timetabling."""
+
+import json
+from collections import Counter
+
+import pytest
+
+from src import class_timings
+from src.preprocess import create_course_structure
+
+
+def test_numpy_and_pure_python_draws_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    vectorized = class_timings._draw_sections(42, 10, 500)
+    monkeypatch.setattr(class_timings, "np", None)
+
+    assert class_timings._draw_sections(42, 10, 500) == vectorized
+
+
+def save_with(backend, monkeypatch, path, course_data, seed, **kwargs):
+    monkeypatch.setattr(class_timings, "np", backend)
+    schedule = class_timings.generate_schedule_with_times(
+        course_data, seed=seed, **kwargs
+    )
+    class_timings.save_schedule(schedule, str(path))
+    return path.read_bytes()
+
+
+def test_numpy_and_pure_python_schedules_are_byte_identical(monkeypatch, tmp_path):
+    numpy = pytest.importorskip("numpy")
+    course_data = create_course_structure()
+
+    vectorized = save_with(numpy, monkeypatch, tmp_path / "a.json", course_data, 42)
+    pure = save_with(None, monkeypatch, tmp_path / "b.json", course_data, 42)
+
+    assert vectorized == pure
+    assert b'"time_slot"' in vectorized
+
+
+def test_large_catalog_schedules_agree_across_backends_and_chunks(monkeypatch):
+    numpy = pytest.importorskip("numpy")
+    courses = [
+        {"course": f"CPSC {1000 + i} - Course {i}", "credits": 3} for i in range(5000)
+    ]
+
+    def generate(backend, chunk_size):
+        monkeypatch.setattr(class_timings, "np", backend)
+        return list(
+            class_timings.iter_courses_with_sections(
+                courses, num_sections=3, seed=7, chunk_size=chunk_size
+            )
+        )
+
+    vectorized = generate(numpy, 1000)
+
+    assert len(vectorized) == 5000
+    assert all(len(course["sections"]) == 3 for course in vectorized)
+    assert generate(None, 1000) == vectorized
+    assert generate(numpy, 333) == vectorized
+    assert "sections" not in courses[0]
+
+
+def test_draws_are_independent_of_chunking(monkeypatch):
+    monkeypatch.setattr(class_timings, "np", None)
+    days, slots = class_timings._draw_sections(7, 0, 20)
+    first = class_timings._draw_sections(7, 0, 8)
+    rest = class_timings._draw_sections(7, 8, 12)
+
+    assert (first[0] + rest[0], first[1] + rest[1]) == (days, slots)
+
+
+DUPLICATED = {
+    "major": {
+        "freshman_year": [
+            {"course": "CPSC 1010 - Computer Science I", "credits": 4},
+            {"course": "MATH 1060 - Calculus I", "credits": 4},
+        ],
+        "sophomore_year": [
+            {
+                "course": "CPSC 1010",
+                "credits": 3,
+                "semester": "Fall",
+                "prereq": ["MATH 1060"],
+                "sections": [{"section_id": 9}],
+            },
+            {
+                "course": "CPSC 2120 - Algorithms",
+                "credits": 4,
+                "prereq": ["CPSC 1010"],
+            },
+            {
+                "course": "CPSC 2120",
+                "prereq": ["CPSC 1010", "MATH 1060"],
+                "sections": [{"section_id": 1}],
+            },
+        ],
+    },
+}
+
+
+def test_merge_keeps_one_record_per_code_in_first_listed_order():
+    courses = class_timings.merge_catalog_courses(DUPLICATED)
+
+    assert [course["course"] for course in courses] == [
+        "CPSC 1010 - Computer Science I",
+        "MATH 1060 - Calculus I",
+        "CPSC 2120 - Algorithms",
+    ]
+
+
+def test_merge_keeps_first_fields_and_fills_in_missing_ones():
+    cpsc1010, _, cpsc2120 = class_timings.merge_catalog_courses(DUPLICATED)
+
+    assert cpsc1010["credits"] == 4
+    assert cpsc1010["semester"] == "Fall"
+    assert cpsc1010["sections"] == [{"section_id": 9}]
+    assert cpsc1010["categories"] == ["freshman_year", "sophomore_year"]
+    assert cpsc2120["prereq"] == ["CPSC 1010", "MATH 1060"]
+    assert cpsc2120["sections"] == [{"section_id": 1}]
+    assert cpsc2120["categories"] == ["sophomore_year"]
+
+
+def test_merge_does_not_modify_the_structure():
+    before = repr(DUPLICATED)
+
+    class_timings.merge_catalog_courses(DUPLICATED)
+
+    assert repr(DUPLICATED) == before
+
+
+def test_merge_without_duplicates_keeps_every_course():
+    structure = {
+        "general_education": {
+            "class_options": {
+                "mathematics": [
+                    {"course": "MATH 1080 - Calculus II", "credits": 4},
+                    {"course": "STAT 3090 - Statistics", "credits": 3},
+                ]
+            }
+        },
+        "major": {
+            "freshman_year": [
+                {"course": "Natural Science Requirement", "credits": 4},
+                {"course": "CPSC 1010 - Computer Science I", "credits": 4},
+            ]
+        },
+    }
+
+    courses = class_timings.merge_catalog_courses(structure)
+
+    assert courses == [
+        {
+            "course": "MATH 1080 - Calculus II",
+            "credits": 4,
+            "categories": ["mathematics"],
+        },
+        {
+            "course": "STAT 3090 - Statistics",
+            "credits": 3,
+            "categories": ["mathematics"],
+        },
+        {
+            "course": "CPSC 1010 - Computer Science I",
+            "credits": 4,
+            "categories": ["freshman_year"],
+        },
+    ]
+
+
+def electives(count):
+    return {
+        "general_education": {
+            "class_options": {
+                "electives": [
+                    {"course": f"ELEC {1000 + i} - Elective", "credits": 3}
+                    for i in range(count)
+                ]
+            }
+        }
+    }
+
+
+def section_slots(schedule):
+    return [
+        (section["day_type"], section["time_slot"])
+        for course in schedule
+        for section in course["sections"]
+    ]
+
+
+def overlap(first, second):
+    return bool(
+        class_timings.COMPILED_SLOTS[first] & class_timings.COMPILED_SLOTS[second]
+    )
+
+
+def test_balanced_schedule_never_books_a_room_twice():
+    schedule = class_timings.generate_balanced_schedule(
+        electives(20), num_sections=2, rooms_per_slot=4, seed=3
+    )
+
+    used = Counter(section_slots(schedule))
+    assert sum(used.values()) == 40
+    assert max(used.values()) <= 4
+
+
+def test_balanced_schedule_only_uses_slots_with_rooms():
+    rooms = {slot: 2 for slot in list(class_timings.COMPILED_SLOTS)[:3]}
+
+    schedule = class_timings.generate_balanced_schedule(
+        electives(3), num_sections=2, rooms_per_slot=rooms, seed=3
+    )
+
+    used = Counter(section_slots(schedule))
+    assert set(used) <= set(rooms)
+    assert all(count <= rooms[slot] for slot, count in used.items())
+
+
+def test_balanced_schedule_rejects_more_sections_than_rooms():
+    with pytest.raises(ValueError, match="do not fit"):
+        class_timings.generate_balanced_schedule(
+            electives(10), num_sections=3, rooms_per_slot=2, seed=3
+        )
+
+
+def test_balanced_schedule_spreads_load_across_slots():
+    schedule = class_timings.generate_balanced_schedule(
+        electives(20), num_sections=2, rooms_per_slot=12, seed=3
+    )
+
+    used = Counter(section_slots(schedule))
+    assert len(used) == len(class_timings.COMPILED_SLOTS)
+    assert max(used.values()) - min(used.values()) <= 1
+
+
+def test_balanced_schedule_keeps_sections_and_year_courses_apart():
+    # Shared staff teaches every section of a course and a year's required
+    # courses, so none of those may meet at the same time when slots allow
+    structure = {
+        "major": {
+            "freshman_year": [
+                {"course": f"CPSC {1000 + i} - Required", "credits": 3}
+                for i in range(4)
+            ]
+        }
+    }
+
+    schedule = class_timings.generate_balanced_schedule(
+        structure, num_sections=2, rooms_per_slot=12, seed=5
+    )
+
+    slots = section_slots(schedule)
+    for i, first in enumerate(slots):
+        for second in slots[i + 1 :]:
+            assert not overlap(first, second)
+
+
+def test_balanced_schedule_is_deterministic_for_a_seed():
+    def generate(seed):
+        return class_timings.generate_balanced_schedule(
+            electives(15), num_sections=3, rooms_per_slot=6, seed=seed
+        )
+
+    assert json.dumps(generate(11)) == json.dumps(generate(11))
@@ -0,0 +1,219 @@
+"""Tests for the end-to-end deadline of call_api and the streaming path."""
+
+import time
+
+import pytest
+from botocore.exceptions import ClientError, ReadTimeoutError
+
+from src import aws_clients, utils
+from src.resilience import Deadline, DeadlineExceeded, ResilientCaller
+
+RAW_ANSWER = "Take the algorithms class\n\nand a writing class"
+
+
+class FakeCache:
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, value):
+        self.entries[key] = value
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = FakeCache()
+    monkeypatch.setattr(utils, "get_response_cache", lambda: cache)
+    monkeypatch.setattr(utils, "RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(utils, "solve_local_schedule", lambda student: {"local": 1})
+    monkeypatch.setattr(utils, "build_student_prompt", lambda student, local: "p")
+    monkeypatch.setattr(utils, "local_fallback", lambda local: ["local schedule"])
+    monkeypatch.setattr(
+        utils, "retrieve_and_generate", lambda text, kb_id, deadline: RAW_ANSWER
+    )
+    return cache
+
+
+@pytest.fixture
+def slow_model(monkeypatch):
+    """A formatting model that never answers before its client times out."""
+
+    class SlowClient:
+        def __init__(self, timeout):
+            self.timeout = timeout
+
+        def invoke_model(self, **kwargs):
+            time.sleep(self.timeout)
+            raise ReadTimeoutError(endpoint_url="https://bedrock")
+
+    monkeypatch.setattr(utils, "known_courses", lambda: {})
+    monkeypatch.setattr(
+        utils, "timeout_bucket", lambda budget: 0.1 if budget >= 0.1 else None
+    )
+    monkeypatch.setattr(
+        utils, "get_caller", lambda operation: ResilientCaller(operation, hedge=False)
+    )
+    monkeypatch.setattr(
+        utils, "get_client", lambda service, region, timeout: SlowClient(timeout)
+    )
+
+
+def failing_create_list(error):
+    def create_list(response, deadline):
+        raise error
+
+    return create_list
+
+
+def test_formatting_cut_short_returns_partial_uncached_text(monkeypatch, cache):
+    monkeypatch.setattr(
+        utils, "create_list", failing_create_list(DeadlineExceeded("no time"))
+    )
+
+    result = utils.call_api({"id": "a"}, deadline=30)
+
+    assert result == ["Take the algorithms class", "and a writing class"]
+    assert isinstance(result, utils.PartialRecommendation) and result.partial
+    assert cache.entries == {}
+
+
+def test_formatting_failure_falls_back_to_local_schedule(monkeypatch, cache):
+    monkeypatch.setattr(utils, "create_list", lambda response, deadline: None)
+
+    result = utils.call_api({"id": "a"}, deadline=30)
+
+    assert result == ["local schedule"]
+    assert not getattr(result, "partial", False)
+    assert cache.entries == {}
+
+
+def test_zero_deadline_is_a_deadline(monkeypatch, cache):
+    seen = []
+
+    def create_list(response, deadline):
+        seen.append(deadline)
+        return ["CPSC 2120"]
+
+    monkeypatch.setattr(utils, "create_list", create_list)
+    utils.call_api({"completed_courses": ["CPSC 1010"]}, deadline=0)
+    utils.call_api({"completed_courses": ["CPSC 1020"]}, deadline=None)
+
+    assert isinstance(seen[0], Deadline) and seen[0].expired()
+    assert seen[1] is None
+
+
+def test_format_with_model_raises_when_no_timeout_fits(monkeypatch):
+    monkeypatch.setattr(
+        utils, "get_client", lambda *args: pytest.fail("client requested")
+    )
+
+    with pytest.raises(DeadlineExceeded):
+        utils.format_with_model("text", deadline=Deadline(1))
+
+
+@pytest.mark.parametrize(
+    "error, deadline, expected",
+    [
+        (ReadTimeoutError(endpoint_url="https://bedrock"), Deadline(30), "raise"),
+        (ReadTimeoutError(endpoint_url="https://bedrock"), None, None),
+        (
+            ClientError({"Error": {"Code": "ValidationException"}}, "InvokeModel"),
+            Deadline(30),
+            None,
+        ),
+    ],
+)
+def test_format_with_model_reports_only_deadline_timeouts(
+    monkeypatch, error, deadline, expected
+):
+    class FakeClient:
+        def invoke_model(self, **kwargs):
+            raise error
+
+    class FailingCaller:
+        def call(self, func, **kwargs):
+            return func(**kwargs)
+
+    monkeypatch.setattr(utils, "get_client", lambda *args: FakeClient())
+    monkeypatch.setattr(utils, "get_caller", lambda operation: FailingCaller())
+
+    if expected == "raise":
+        with pytest.raises(DeadlineExceeded):
+            utils.format_with_model("text", deadline=deadline)
+    else:
+        assert utils.format_with_model("text", deadline=deadline) is None
+
+
+def test_stream_uses_deadline_timeout_and_stops_when_it_expires(monkeypatch):
+    requested = []
+    deadline = Deadline(20)
+
+    class FakeClient:
+        def retrieve_and_generate_stream(self, **kwargs):
+            def events():
+                yield {"output": {"text": "CPSC 2120\n"}}
+                deadline.expires = 0.0
+                yield {"output": {"text": "MATH 2060\n"}}
+                yield {"output": {"text": "never read\n"}}
+
+            return {"stream": events()}
+
+    def fake_get_client(service, region, timeout):
+        requested.append(timeout)
+        return FakeClient()
+
+    monkeypatch.setattr(utils, "get_client", fake_get_client)
+
+    chunks = list(utils.retrieve_and_generate_stream("p", "kb", deadline=deadline))
+
+    assert chunks == ["CPSC 2120\n", "MATH 2060\n"]
+    assert requested == [10]
+
+
+def test_stream_is_skipped_without_budget(monkeypatch):
+    monkeypatch.setattr(
+        utils, "get_client", lambda *args: pytest.fail("client requested")
+    )
+
+    assert (
+        list(utils.retrieve_and_generate_stream("p", "kb", deadline=Deadline(1))) == []
+    )
+
+
+def test_slow_formatting_fallback_yields_raw_lines_by_the_deadline(slow_model):
+    lines = utils.stream_recommendation_lines([RAW_ANSWER], deadline=Deadline(0.35))
+
+    start = time.perf_counter()
+    received = []
+    with pytest.raises(StopIteration) as stop:
+        while True:
+            received.append(next(lines))
+
+    assert time.perf_counter() - start < 0.5
+    assert received == ["Take the algorithms class", "and a writing class"]
+    assert stop.value.value is True
+
+
+def test_stream_call_api_does_not_cache_unformatted_lines(
+    monkeypatch, cache, slow_model
+):
+    monkeypatch.setattr(
+        utils,
+        "retrieve_and_generate_stream",
+        lambda text, kb_id, deadline: iter([RAW_ANSWER]),
+    )
+
+    start = time.perf_counter()
+    lines = list(utils.stream_call_api({"id": "a"}, deadline=0.35))
+
+    assert time.perf_counter() - start < 0.5
+    assert lines == ["Take the algorithms class", "and a writing class"]
+    assert cache.entries == {}
+
+
+def test_timeout_bucket_picks_largest_fitting_bucket():
+    assert aws_clients.timeout_bucket(45) == 30
+    assert aws_clients.timeout_bucket(600) == max(aws_clients.AWS_TIMEOUT_BUCKETS)
+    assert aws_clients.timeout_bucket(1) is None
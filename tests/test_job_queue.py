@@ -0,0 +1,159 @@
+"""Tests for the in-process background job queue."""
+
+import threading
+import time
+
+import pytest
+from botocore.exceptions import ReadTimeoutError
+
+from frontend.API.utils import streamAPI
+from src import utils
+from src.job_queue import JobQueue, QueueFullError
+from src.resilience import ResilientCaller
+
+
+def wait_for(queue, job_id, statuses=("done", "failed", "timeout"), seconds=5.0):
+    """Poll a job until it reaches one of the given statuses."""
+    stop = time.monotonic() + seconds
+    while time.monotonic() < stop:
+        info = queue.status(job_id)
+        if info["status"] in statuses:
+            return info
+        time.sleep(0.01)
+    raise AssertionError(f"job stayed {queue.status(job_id)['status']}")
+
+
+def test_job_result_and_failure():
+    jobs = JobQueue(max_workers=1)
+
+    def add(a, b, deadline):
+        return a + b
+
+    def fail(deadline):
+        raise ValueError("boom")
+
+    done = wait_for(jobs, jobs.submit(add, 2, 3))
+    failed = wait_for(jobs, jobs.submit(fail))
+
+    assert (done["status"], done["result"]) == ("done", 5)
+    assert (failed["status"], failed["error"]) == ("failed", "boom")
+
+
+def test_job_receives_deadline_from_timeout():
+    jobs = JobQueue(max_workers=1, timeout=30)
+
+    info = wait_for(jobs, jobs.submit(lambda deadline: deadline.remaining()))
+
+    assert 29 < info["result"] <= 30
+
+
+def test_streaming_job_publishes_items_while_running():
+    jobs = JobQueue(max_workers=1)
+    release = threading.Event()
+
+    def lines(deadline):
+        yield "CPSC 1010"
+        release.wait(5)
+        yield "MATH 1060"
+
+    job_id = jobs.submit(lines)
+    stop = time.monotonic() + 5
+    while jobs.status(job_id)["result"] != ["CPSC 1010"]:
+        assert time.monotonic() < stop
+        time.sleep(0.01)
+    assert jobs.status(job_id)["status"] == "running"
+
+    release.set()
+    info = wait_for(jobs, job_id)
+    assert (info["status"], info["result"]) == ("done", ["CPSC 1010", "MATH 1060"])
+
+
+def test_wait_returns_as_soon_as_a_job_publishes_or_finishes():
+    jobs = JobQueue(max_workers=1)
+    release = threading.Event()
+
+    def lines(deadline):
+        yield "CPSC 1010"
+        release.wait(5)
+        yield "MATH 1060"
+
+    job_id = jobs.submit(lines)
+    first = jobs.wait(job_id, 0, timeout=5)
+    assert first["result"] == ["CPSC 1010"]
+
+    start = time.monotonic()
+    idle = jobs.wait(job_id, 1, timeout=0.1)
+    assert idle["status"] == "running" and time.monotonic() - start >= 0.1
+
+    release.set()
+    info = jobs.wait(job_id, 1, timeout=5)
+    while info["status"] == "running":
+        info = jobs.wait(job_id, len(info["result"]), timeout=5)
+    assert (info["status"], info["result"]) == ("done", ["CPSC 1010", "MATH 1060"])
+    assert jobs.wait("unknown", 0, timeout=0.1) is None
+
+
+def test_streaming_job_is_stopped_at_its_deadline():
+    jobs = JobQueue(max_workers=1, timeout=0.2)
+    closed = threading.Event()
+
+    def endless(deadline):
+        try:
+            while True:
+                yield "line"
+                time.sleep(0.05)
+        finally:
+            closed.set()
+
+    info = wait_for(jobs, jobs.submit(endless))
+    assert info["status"] == "timeout"
+    assert info["result"] and set(info["result"]) == {"line"}
+    assert closed.wait(1)
+
+    # The worker is free again for the next job
+    assert wait_for(jobs, jobs.submit(lambda deadline: "next"))["result"] == "next"
+
+
+def test_web_job_with_slow_formatting_fallback_ends_by_its_timeout(monkeypatch):
+    class SlowBedrock:
+        def __init__(self, timeout):
+            self.timeout = timeout
+
+        def retrieve_and_generate_stream(self, **kwargs):
+            return {"stream": [{"output": {"text": "Take the algorithms class"}}]}
+
+        def invoke_model(self, **kwargs):
+            # The formatting model never answers before the client times out
+            time.sleep(self.timeout)
+            raise ReadTimeoutError(endpoint_url="https://bedrock")
+
+    monkeypatch.setattr(utils, "known_courses", lambda: {})
+    monkeypatch.setattr(
+        utils, "timeout_bucket", lambda budget: 0.1 if budget >= 0.1 else None
+    )
+    monkeypatch.setattr(
+        utils, "get_caller", lambda operation: ResilientCaller(operation, hedge=False)
+    )
+    monkeypatch.setattr(
+        utils, "get_client", lambda service, region, timeout: SlowBedrock(timeout)
+    )
+    jobs = JobQueue(max_workers=1, timeout=0.4)
+
+    student = {"name": "a", "completed_courses": ["CPSC 1010"]}
+    info = wait_for(jobs, jobs.submit(streamAPI, student), seconds=1.0)
+
+    assert info["finished"] - info["started"] <= 0.5
+    assert info["result"] == ["Take the algorithms class"]
+    assert wait_for(jobs, jobs.submit(lambda deadline: "next"))["result"] == "next"
+
+
+def test_full_queue_refuses_jobs():
+    jobs = JobQueue(max_workers=1, max_queued=1)
+    release = threading.Event()
+    jobs.submit(lambda deadline: release.wait(5))
+    time.sleep(0.05)
+    jobs.submit(lambda deadline: None)
+
+    with pytest.raises(QueueFullError):
+        jobs.submit(lambda deadline: None)
+    release.set()
@@ -0,0 +1,64 @@
+"""Tests for the in-process metrics registry."""
+
+import time
+
+import pytest
+
+from src.metrics import STAGE_FAILURES, MetricsRegistry
+
+
+def test_span_counts_exceptions_as_failures():
+    registry = MetricsRegistry()
+
+    with pytest.raises(ValueError):
+        with registry.span("parse"):
+            raise ValueError("bad")
+
+    assert registry.counter(STAGE_FAILURES, stage="parse") == 1
+    assert registry.timings()["parse"]["count"] == 1
+
+
+def test_closing_a_generator_inside_a_span_is_not_a_failure():
+    registry = MetricsRegistry()
+
+    def lines():
+        with registry.span("recommend"):
+            yield "CPSC 1010"
+            yield "MATH 1060"
+
+    stream = lines()
+    next(stream)
+    stream.close()
+
+    assert registry.counter(STAGE_FAILURES, stage="recommend") == 0
+    assert registry.timings()["recommend"]["count"] == 1
+
+
+def test_time_iter_leaves_out_the_consumer():
+    registry = MetricsRegistry()
+
+    def slow_source():
+        time.sleep(0.02)
+        yield 1
+        time.sleep(0.02)
+        yield 2
+
+    for _ in registry.time_iter("read", slow_source()):
+        time.sleep(0.1)
+
+    total_ms = registry.timings()["read"]["total_ms"]
+    assert 30 <= total_ms < 150
+
+
+def test_time_iter_records_failures():
+    registry = MetricsRegistry()
+
+    def broken():
+        yield 1
+        raise ConnectionError("reset")
+
+    with pytest.raises(ConnectionError):
+        list(registry.time_iter("read", broken()))
+
+    assert registry.counter(STAGE_FAILURES, stage="read") == 1
+    assert registry.timings()["read"]["count"] == 1
@@ -0,0 +1,224 @@
+"""Tests for PDF catalog extraction and its page text cache."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src import preprocess
+from src.preprocess import PageTextCache, _merge_cached
+
+
+def test_known_returns_hashes_only(tmp_path):
+    cache = PageTextCache(str(tmp_path / "pages.sqlite3"))
+    cache.put_many([("a", "page a"), ("b", "page b")])
+
+    assert cache.known(["a", "c", "b", "a"]) == {"a", "b"}
+    assert cache.get("b") == "page b"
+    assert cache.get("c") is None
+    cache.close()
+
+
+def test_merge_reads_cached_pages_lazily(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "pages.sqlite3")
+    cache = PageTextCache(db_path)
+    cache.put_many([("a", "page a"), ("c", "page c")])
+    reads = []
+    get = cache.get
+    monkeypatch.setattr(
+        cache, "get", lambda digest: reads.append(digest) or get(digest)
+    )
+
+    pages = _merge_cached(
+        "catalog.pdf", ["a", "b", "c"], {"a", "c"}, iter(["page b"]), cache
+    )
+    assert next(pages) == "page a"
+    assert reads == ["a"]
+    assert list(pages) == ["page b", "page c"]
+
+    reopened = PageTextCache(db_path)
+    assert reopened.get("b") == "page b"
+    reopened.close()
+
+
+def test_page_evicted_after_lookup_is_extracted(tmp_path, monkeypatch):
+    cache = PageTextCache(str(tmp_path / "pages.sqlite3"))
+    monkeypatch.setattr(
+        preprocess, "_extract_pages", lambda path, numbers: [f"page {numbers[0]}"]
+    )
+
+    pages = _merge_cached("catalog.pdf", ["a"], {"a"}, iter([]), cache)
+
+    assert list(pages) == ["page 0"]
+
+
+CATALOG_PAGES = [
+    "Computer Science, BS\nCore:\nCPSC 1010\n",
+    "CPSC 1020\nMathematics, BS\nCore:\nMATH 1060\n",
+    "MATH 1080\n",
+]
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    """A stubbed catalog PDF whose page hashes and texts the test can edit."""
+    pages = {"hashes": ["h0", "h1", "h2"], "texts": list(CATALOG_PAGES)}
+    extracted = []
+
+    def extract_pages(path, numbers):
+        extracted.extend(numbers)
+        return [pages["texts"][i] for i in numbers]
+
+    monkeypatch.setattr(preprocess, "page_hashes", lambda path: list(pages["hashes"]))
+    monkeypatch.setattr(preprocess, "_extract_pages", extract_pages)
+    pages["extracted"] = extracted
+    return pages
+
+
+def refresh(tmp_path):
+    return preprocess.refresh_catalog_structures(
+        "catalog.pdf",
+        out_dir=str(tmp_path / "structures"),
+        cache_path=str(tmp_path / "pages.sqlite3"),
+    )
+
+
+def test_extraction_reports_pages_missing_from_the_cache(tmp_path, catalog):
+    cache_path = str(tmp_path / "pages.sqlite3")
+
+    first = preprocess.extract_text_from_pdf("catalog.pdf", cache_path=cache_path)
+    assert first.changed_pages == [0, 1, 2]
+    assert list(first) == CATALOG_PAGES
+
+    catalog["hashes"][2] = "h2-new"
+    catalog["extracted"].clear()
+    second = preprocess.extract_text_from_pdf("catalog.pdf", cache_path=cache_path)
+    assert second.changed_pages == [2]
+    assert list(second) == CATALOG_PAGES
+    assert catalog["extracted"] == [2]
+
+
+def test_only_degrees_on_changed_pages_are_regenerated(tmp_path, catalog):
+    written = refresh(tmp_path)
+    assert sorted(path.name for path in written) == [
+        "course_structure_computer_science_bs.json",
+        "course_structure_mathematics_bs.json",
+    ]
+
+    # Unchanged catalog: nothing is parsed or written
+    assert refresh(tmp_path) == []
+
+    catalog["hashes"][2] = "h2-new"
+    catalog["texts"][2] = "MATH 1080\nMATH 2060\n"
+    (path,) = refresh(tmp_path)
+    assert path.name == "course_structure_mathematics_bs.json"
+    assert "MATH 2060" in path.read_text()
+
+
+def test_missing_structure_file_is_regenerated(tmp_path, catalog):
+    for path in refresh(tmp_path):
+        if "computer_science" in path.name:
+            path.unlink()
+
+    catalog["hashes"][2] = "h2-new"
+    written = refresh(tmp_path)
+
+    assert sorted(path.name for path in written) == [
+        "course_structure_computer_science_bs.json",
+        "course_structure_mathematics_bs.json",
+    ]
+
+
+def write_pdf(path, texts):
+    """Write a minimal PDF with one line of text per page."""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for text in texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    body = "%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n"
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    body += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    body += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    )
+    path.write_bytes(body.encode("latin-1"))
+    return str(path)
+
+
+def test_chunks_finishing_out_of_order_are_yielded_in_page_order(monkeypatch):
+    def extract_pages(path, numbers):
+        # Earlier chunks finish last
+        time.sleep(0.02 * (10 - numbers[0]))
+        return [f"page {i}" for i in numbers]
+
+    monkeypatch.setattr(preprocess, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(preprocess, "_extract_pages", extract_pages)
+    chunks = [[0, 1], [2, 3], [4, 5], [6, 7], [8, 9]]
+
+    pages = list(preprocess._extract_chunks("catalog.pdf", chunks, max_workers=4))
+
+    assert pages == [f"page {i}" for i in range(10)]
+
+
+def test_parallel_extraction_keeps_page_order(tmp_path):
+    texts = [f"Page {i}" for i in range(7)]
+    pdf_path = write_pdf(tmp_path / "catalog.pdf", texts)
+    output_path = tmp_path / "catalog.txt"
+
+    pages = preprocess.extract_text_from_pdf(
+        pdf_path,
+        str(output_path),
+        max_workers=2,
+        chunk_pages=2,
+        cache_path=None,
+    )
+
+    assert list(pages) == texts
+    assert output_path.read_text().splitlines() == texts
+
+
+def test_page_cache_skips_unchanged_pages(tmp_path, monkeypatch):
+    texts = [f"Page {i}" for i in range(4)]
+    pdf_path = tmp_path / "catalog.pdf"
+    cache_path = str(tmp_path / "pages.sqlite3")
+    extracted = []
+    extract_chunks = preprocess._extract_chunks
+
+    def recording_extract_chunks(path, chunks, max_workers):
+        extracted.append([i for chunk in chunks for i in chunk])
+        return extract_chunks(path, chunks, max_workers)
+
+    monkeypatch.setattr(preprocess, "_extract_chunks", recording_extract_chunks)
+
+    def extract():
+        pages = preprocess.extract_text_from_pdf(
+            str(pdf_path), max_workers=1, chunk_pages=2, cache_path=cache_path
+        )
+        return list(pages), pages.changed_pages
+
+    write_pdf(pdf_path, texts)
+    assert extract() == (texts, [0, 1, 2, 3])
+    assert extract() == (texts, [])
+
+    texts[2] = "Page 2 revised"
+    write_pdf(pdf_path, texts)
+    assert extract() == (texts, [2])
+    assert extracted == [[0, 1, 2, 3], [], [2]]
@@ -0,0 +1,161 @@
+"""Tests for the Bedrock scheduling prompt."""
+
+import pytest
+
+from src import utils
+from src.catalog_index import CatalogIndex
+
+STRUCTURE = {
+    "major": {
+        "freshman_year": [
+            {
+                "course": "Computer Science Foundations",
+                "paths": [
+                    {
+                        "courses": [
+                            {"course": "CPSC 1010", "credits": 4},
+                            {
+                                "course": "CPSC 1020",
+                                "credits": 4,
+                                "prereq": ["CPSC 1010"],
+                            },
+                        ]
+                    },
+                    {
+                        "courses": [
+                            {"course": "CPSC 1060", "credits": 4},
+                            {
+                                "course": "CPSC 1070",
+                                "credits": 4,
+                                "prereq": ["CPSC 1060"],
+                            },
+                        ]
+                    },
+                ],
+            },
+            {"course": "MATH 1060", "credits": 4},
+            {"course": "ENGL 1030", "credits": 3},
+        ]
+    }
+}
+
+
+def offering(course, *sections):
+    return {
+        "course": course,
+        "sections": [
+            {"section_id": i + 1, "day_type": day_type, "time_slot": time_slot}
+            for i, (day_type, time_slot) in enumerate(sections)
+        ],
+    }
+
+
+OFFERINGS = {
+    "CPSC 1010": offering(
+        "CPSC 1010 - Computer Science I", ("MWF", "9:05 AM - 9:55 AM")
+    ),
+    "CPSC 1060": offering(
+        "CPSC 1060 - Accelerated Intro", ("TTh", "11:00 AM - 12:15 PM")
+    ),
+    "CPSC 1070": offering(
+        "CPSC 1070 - Accelerated Intro II", ("MWF", "1:25 PM - 2:15 PM")
+    ),
+    "MATH 1060": offering(
+        "MATH 1060 - Calculus I",
+        ("MWF", "8:00 AM - 8:50 AM"),
+        ("TTh", "12:30 PM - 1:45 PM"),
+    ),
+    "ENGL 1030": offering("ENGL 1030 - Composition", ("TTh", "8:00 AM - 9:15 AM")),
+}
+
+
+@pytest.fixture(autouse=True)
+def catalog(monkeypatch):
+    index = CatalogIndex.from_structure(STRUCTURE)
+    monkeypatch.setattr(utils, "get_catalog_index", lambda: index)
+    monkeypatch.setattr(utils, "known_courses", lambda: OFFERINGS)
+    monkeypatch.setattr(utils, "_course_groups", lambda: {})
+    return index
+
+
+def test_offerings_list_every_section_without_constraints():
+    text = utils._format_offerings(["MATH 1060", "ENGL 1030"])
+
+    assert "MATH 1060 Calculus I (4cr) | 1 MWF 0800-0850 | 2 TTh 1230-1345" in text
+    assert "ENGL 1030 Composition (3cr) | 1 TTh 0800-0915" in text
+
+
+def test_offerings_leave_out_sections_outside_the_time_window():
+    text = utils._format_offerings(
+        ["MATH 1060", "ENGL 1030"], time_constraints="no classes before 10am"
+    )
+
+    assert "MATH 1060 Calculus I (4cr) | 2 TTh 1230-1345" in text
+    assert "0800-0850" not in text
+    assert "ENGL 1030" not in text
+
+
+def test_offerings_are_none_when_no_section_fits():
+    assert (
+        utils._format_offerings(["ENGL 1030"], time_constraints="nothing after 8am")
+        is None
+    )
+
+
+def test_offerings_over_budget_are_counted():
+    text = utils._format_offerings(["MATH 1060", "ENGL 1030"], token_budget=35)
+
+    assert "ENGL 1030" in text
+    assert "MATH 1060" not in text
+    assert text.endswith("(+1 more eligible courses omitted)")
+
+
+def test_prompt_skips_satisfied_or_path_alternatives():
+    prompt = utils._student_prompt(
+        {"completed_courses": ["CPSC 1010", "CPSC 1020"]}, local_schedule=None
+    )
+
+    assert "MATH 1060" in prompt
+    assert "CPSC 1060" not in prompt
+    assert "CPSC 1070" not in prompt
+
+
+def test_prompt_filters_offerings_by_the_students_time_constraints():
+    prompt = utils._student_prompt(
+        {"completed_courses": [], "time_constraints": "no classes before 10am"},
+        local_schedule=None,
+    )
+
+    assert "**Time Constraints:** no classes before 10am" in prompt
+    assert "CPSC 1060 Accelerated Intro (4cr) | 1 TTh 1100-1215" in prompt
+    assert "CPSC 1010" not in prompt
+    assert "ENGL 1030" not in prompt
+
+
+def test_schedule_prompt_blocks():
+    prompt = utils._build_schedule_prompt(
+        "- CPSC 1010",
+        "None",
+        None,
+        candidate_text="- CPSC 1020 MWF 9:05 AM - 9:55 AM",
+        eligible_text="CPSC 1020, MATH 1060",
+    )
+
+    assert "**Completed Courses:**\n- CPSC 1010" in prompt
+    assert "**Time Constraints:** None" in prompt
+    assert "**Courses I Am Eligible For (prerequisites already verified):** " in prompt
+    assert "CPSC 1020, MATH 1060" in prompt
+    assert "[Provide the list of available courses in JSON format]" in prompt
+    assert "Start from this schedule" in prompt
+    assert f"at least {utils.TARGET_MIN_CREDITS} credits" in prompt
+
+
+def test_schedule_prompt_omits_empty_blocks():
+    prompt = utils._build_schedule_prompt(
+        "None", "None", "mornings only", offerings_text="header\nMATH 1060"
+    )
+
+    assert "**Class Offerings for the Next Semester:**\nheader\nMATH 1060" in prompt
+    assert "Eligible For" not in prompt
+    assert "Pre-checked" not in prompt
+    assert "JSON format" not in prompt
@@ -0,0 +1,200 @@
+"""Tests for retries, hedging and circuit breaking of Bedrock calls."""
+
+import threading
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+
+from src import resilience
+from src.metrics import BEDROCK_HEDGES, BEDROCK_HEDGES_WASTED, get_metrics
+from src.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Deadline,
+    ResilientCaller,
+    backoff_delay,
+)
+
+
+def throttled():
+    return ClientError(
+        {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+        "InvokeModel",
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(resilience, "backoff_delay", lambda attempt: 0.0)
+
+
+def test_backoff_delay_stays_within_the_capped_ceiling():
+    for attempt in range(10):
+        assert (
+            0.0
+            <= backoff_delay(attempt, base=0.5, cap=4.0)
+            <= min(4.0, 0.5 * 2**attempt)
+        )
+
+
+def test_breaker_opens_at_threshold_and_lets_one_probe_through():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_retried_call_counts_one_breaker_failure():
+    caller = ResilientCaller("throttled", max_attempts=4, hedge=False)
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        raise throttled()
+
+    with pytest.raises(ClientError):
+        caller.call(call)
+
+    assert len(attempts) == 4
+    assert caller.breaker._failures == 1
+    assert caller.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_opens_after_threshold_failed_calls():
+    caller = ResilientCaller("outage", max_attempts=2, hedge=False)
+    caller.breaker.failure_threshold = 2
+
+    def call():
+        raise throttled()
+
+    for _ in range(2):
+        with pytest.raises(ClientError):
+            caller.call(call)
+    with pytest.raises(CircuitOpenError):
+        caller.call(call)
+
+
+def test_retry_succeeds_and_non_transient_errors_are_not_retried():
+    caller = ResilientCaller("flaky", max_attempts=3, hedge=False)
+    results = iter([throttled(), "ok"])
+
+    def flaky():
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert caller.call(flaky) == "ok"
+
+    attempts = []
+
+    def broken():
+        attempts.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        caller.call(broken)
+    assert len(attempts) == 1
+    assert caller.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_no_retry_when_the_deadline_cannot_fit_another_attempt():
+    caller = ResilientCaller("late", max_attempts=4, hedge=False)
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        raise throttled()
+
+    with pytest.raises(ClientError):
+        caller.call(call, deadline=Deadline(1.0), attempt_seconds=5.0)
+    assert len(attempts) == 1
+
+
+def hedging_caller(name, threshold=0.02):
+    caller = ResilientCaller(name, max_attempts=1, hedge=True)
+    caller.latency.percentile = lambda q, min_samples=1: threshold
+    return caller
+
+
+def attempts_in_order(*behaviours):
+    """A call whose n-th invocation sleeps and then returns or raises."""
+    lock = threading.Lock()
+    queued = list(behaviours)
+
+    def call():
+        with lock:
+            delay, outcome = queued.pop(0)
+        time.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return call
+
+
+def test_fast_hedge_beats_slow_successful_primary():
+    caller = hedging_caller("hedge-faster")
+    metrics = get_metrics()
+    call = attempts_in_order((0.5, "primary"), (0.0, "hedge"))
+
+    start = time.perf_counter()
+    assert caller.call(call) == "hedge"
+    assert time.perf_counter() - start < 0.3
+    assert metrics.counter(BEDROCK_HEDGES, operation="hedge-faster") == 1
+    assert metrics.counter(BEDROCK_HEDGES_WASTED, operation="hedge-faster") == 1
+    assert caller.breaker._failures == 0
+
+
+def test_hedge_answers_when_the_slow_primary_fails():
+    caller = hedging_caller("hedge-wins")
+    call = attempts_in_order((0.1, throttled()), (0.2, "hedge"))
+
+    assert caller.call(call) == "hedge"
+    assert get_metrics().counter(BEDROCK_HEDGES, operation="hedge-wins") == 1
+
+
+def test_hedged_call_failing_twice_counts_one_breaker_failure():
+    caller = hedging_caller("both-fail")
+    call = attempts_in_order((0.05, throttled()), (0.0, throttled()))
+
+    with pytest.raises(ClientError):
+        caller.call(call)
+    assert caller.breaker._failures == 1
+
+
+def test_losing_hedge_is_counted_and_fast_primary_sends_none():
+    metrics = get_metrics()
+    slow = hedging_caller("primary-wins")
+
+    def call():
+        time.sleep(0.1)
+        return "ok"
+
+    assert slow.call(call) == "ok"
+    assert metrics.counter(BEDROCK_HEDGES, operation="primary-wins") == 1
+    assert metrics.counter(BEDROCK_HEDGES_WASTED, operation="primary-wins") == 1
+
+    fast = hedging_caller("no-hedge", threshold=1.0)
+    assert fast.call(lambda: "ok") == "ok"
+    assert metrics.counter(BEDROCK_HEDGES, operation="no-hedge") == 0
+
+
+def test_hedge_is_skipped_when_the_pool_is_saturated(monkeypatch):
+    monkeypatch.setattr(resilience, "_hedge_slots", threading.Semaphore(0))
+    caller = hedging_caller("saturated")
+
+    def call():
+        time.sleep(0.05)
+        return "ok"
+
+    assert caller.call(call) == "ok"
+    assert get_metrics().counter(BEDROCK_HEDGES, operation="saturated") == 0
@@ -0,0 +1,147 @@
+"""Tests for the two-level response cache."""
+
+import os
+import sqlite3
+
+import pytest
+
+from src import response_cache
+from src.response_cache import ResponseCache, profile_key
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "class_schedule.json"
+    path.write_text("[]")
+    return path
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    return now
+
+
+def make_cache(tmp_path, data_file, **kwargs):
+    options = {
+        "db_path": str(tmp_path / "cache.sqlite3"),
+        "ttl_seconds": 60,
+        "data_paths": (str(data_file),),
+    }
+    options.update(kwargs)
+    return ResponseCache(**options)
+
+
+def touch(path):
+    stat = os.stat(path)
+    path.write_text("[1]")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_profile_key_ignores_name_order_and_formatting():
+    a = {
+        "name": "A",
+        "completed_courses": ["CPSC 1010 - Computer Science I", "math 1060"],
+        "current_courses": [],
+        "time_constraints": "No classes  before 10am",
+    }
+    b = {
+        "name": "B",
+        "completed_courses": ["MATH 1060", "CPSC 1010", "CPSC 1010"],
+        "time_constraints": "no classes before 10am",
+    }
+
+    assert profile_key(a) == profile_key(b)
+    assert profile_key(a) != profile_key(dict(b, time_constraints=None))
+
+
+def test_memory_and_disk_hits(tmp_path, data_file, clock):
+    cache = make_cache(tmp_path, data_file)
+    assert cache.get("k") is None
+    cache.put("k", ["CPSC 1010 | MWF 8:00 AM - 8:50 AM"])
+
+    assert cache.get("k") == ["CPSC 1010 | MWF 8:00 AM - 8:50 AM"]
+    restarted = make_cache(tmp_path, data_file)
+    assert restarted.get("k") == ["CPSC 1010 | MWF 8:00 AM - 8:50 AM"]
+    assert restarted.stats()["disk_hits"] == 1
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_entries_expire_after_ttl(tmp_path, data_file, clock):
+    cache = make_cache(tmp_path, data_file)
+    cache.put("k", ["line"])
+
+    clock[0] += 59
+    assert cache.get("k") == ["line"]
+    clock[0] += 2
+    assert cache.get("k") is None
+    assert make_cache(tmp_path, data_file).get("k") is None
+    assert cache.stats()["expirations"] >= 1
+
+
+def test_data_change_invalidates_every_entry(tmp_path, data_file, clock):
+    cache = make_cache(tmp_path, data_file)
+    cache.put("k", ["line"])
+
+    touch(data_file)
+
+    assert cache.get("k") is None
+    assert cache.stats()["invalidations"] == 1
+    assert make_cache(tmp_path, data_file).get("k") is None
+
+
+def test_lru_eviction(tmp_path, data_file, clock):
+    cache = make_cache(tmp_path, data_file, db_path=None, max_entries=2)
+    cache.put("a", ["a"])
+    cache.put("b", ["b"])
+    cache.get("a")
+    cache.put("c", ["c"])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ["a"]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_locked_database_falls_back_to_memory(tmp_path, data_file, clock):
+    cache = make_cache(tmp_path, data_file)
+    cache._db.execute("PRAGMA busy_timeout = 0")
+    other = sqlite3.connect(str(tmp_path / "cache.sqlite3"))
+    other.execute("BEGIN EXCLUSIVE")
+    try:
+        cache.put("k", ["line"])
+        assert cache.get("k") == ["line"]
+        assert cache.get("missing") is None
+    finally:
+        other.rollback()
+        other.close()
+
+
+def disk_keys(tmp_path):
+    db = sqlite3.connect(str(tmp_path / "cache.sqlite3"))
+    try:
+        return sorted(row[0] for row in db.execute("SELECT key FROM responses"))
+    finally:
+        db.close()
+
+
+def test_put_prunes_expired_rows(tmp_path, data_file, clock):
+    cache = make_cache(tmp_path, data_file)
+    cache.put("old", ["old"])
+
+    clock[0] += 61
+    cache.put("new", ["new"])
+
+    assert disk_keys(tmp_path) == ["new"]
+    assert cache.stats()["expirations"] == 1
+
+
+def test_put_caps_disk_rows_keeping_the_newest(tmp_path, data_file, clock):
+    cache = make_cache(tmp_path, data_file, max_disk_entries=3)
+    for key in "abcde":
+        clock[0] += 1
+        cache.put(key, [key])
+
+    assert disk_keys(tmp_path) == ["c", "d", "e"]
+    assert cache.stats()["disk_evictions"] == 2
+    assert make_cache(tmp_path, data_file).get("a") is None
@@ -0,0 +1,109 @@
+"""Tests for local parsing of model recommendations."""
+
+import json
+import os
+
+from src.response_parser import (
+    format_recommendations,
+    known_courses,
+    parse_recommendations,
+)
+
+COURSES = {
+    "CPSC 2120": {
+        "course": "CPSC 2120 - Algorithms and Data Structures",
+        "sections": [
+            {"section_id": 1, "day_type": "MWF", "time_slot": "10:10 AM - 11:00 AM"},
+            {"section_id": 2, "day_type": "TTh", "time_slot": "1:30 PM - 2:45 PM"},
+        ],
+    },
+    "MATH 2060": {
+        "course": "MATH 2060 - Calculus III",
+        "sections": [
+            {"section_id": 1, "day_type": "TTh", "time_slot": "8:00 AM - 9:15 AM"},
+        ],
+    },
+}
+
+
+def test_verified_recommendations_have_full_confidence():
+    text = (
+        "Here is your schedule:\n"
+        "1. CPSC 2120 - Algorithms, Tue/Thu 1:30 - 2:45 PM\n"
+        "2. MATH 2060 - Calculus III, TTh 8:00 AM - 9:15 AM\n"
+    )
+
+    records, confidence = parse_recommendations(text, COURSES)
+
+    assert confidence == 1.0
+    assert [(r["code"], r["section_id"]) for r in records] == [
+        ("CPSC 2120", 2),
+        ("MATH 2060", 1),
+    ]
+    assert all(r["verified"] for r in records)
+
+
+def test_invented_times_lower_confidence():
+    text = "CPSC 2120: MWF 10:10 AM - 11:00 AM\n" "MATH 2060: MWF 9:05 AM - 9:55 AM\n"
+
+    records, confidence = parse_recommendations(text, COURSES)
+
+    assert confidence == 0.5
+    assert [r["verified"] for r in records] == [True, False]
+
+
+def test_passing_mentions_without_times_are_dropped():
+    text = (
+        "Since you completed MATH 2060, take CPSC 2120 on MWF " "10:10 AM - 11:00 AM."
+    )
+
+    records, confidence = parse_recommendations(text, COURSES)
+
+    assert [r["code"] for r in records] == ["CPSC 2120"]
+    assert confidence == 1.0
+
+
+def test_untimed_text_has_zero_confidence():
+    records, confidence = parse_recommendations("Consider CPSC 2120.", COURSES)
+
+    assert confidence == 0.0
+    assert [r["code"] for r in records] == ["CPSC 2120"]
+
+
+def test_unknown_courses_are_ignored():
+    records, confidence = parse_recommendations(
+        "ABCD 1234 MWF 10:10 AM - 11:00 AM", COURSES
+    )
+
+    assert records == []
+    assert confidence == 0.0
+
+
+def test_morning_start_before_noon_end():
+    records, _ = parse_recommendations("CPSC 2120 MWF 11:15 - 12:05 PM", COURSES)
+
+    assert records[0]["time_slot"] == "11:15 AM - 12:05 PM"
+
+
+def test_format_recommendations():
+    records, _ = parse_recommendations("CPSC 2120 TTh 1:30 PM - 2:45 PM", COURSES)
+
+    assert format_recommendations(records) == [
+        "CPSC 2120 - Algorithms and Data Structures | TTh 1:30 PM - 2:45 PM"
+    ]
+
+
+def test_known_courses_reloads_when_schedule_changes(tmp_path):
+    path = tmp_path / "class_schedule.json"
+    path.write_text(json.dumps([{"course": "CPSC 2120 - Algorithms"}]))
+    assert set(known_courses(str(path))) == {"CPSC 2120"}
+
+    path.write_text(
+        json.dumps(
+            [{"course": "CPSC 2120 - Algorithms"}, {"course": "MATH 2060 - Calc"}]
+        )
+    )
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert set(known_courses(str(path))) == {"CPSC 2120", "MATH 2060"}
@@ -0,0 +1,143 @@
+"""Tests for the local backtracking schedule solver."""
+
+from src.scheduler import format_schedule, solve_schedule
+from src.time_slots import section_mask
+
+STRUCTURE = {
+    "major": {
+        "freshman_year": [
+            {"course": "CPSC 1010 - Computer Science I", "credits": 4},
+            {
+                "course": "CPSC 1020 - Computer Science II",
+                "credits": 4,
+                "prereq": ["CPSC 1010"],
+            },
+            {"course": "MATH 1060 - Calculus I", "credits": 4},
+            {"course": "ENGL 1030 - Composition", "credits": 3},
+            {"course": "HIST 1010 - History", "credits": 3},
+        ]
+    }
+}
+
+
+def offering(course, *sections):
+    return {
+        "course": course,
+        "sections": [
+            {"section_id": i + 1, "day_type": day_type, "time_slot": time_slot}
+            for i, (day_type, time_slot) in enumerate(sections)
+        ],
+    }
+
+
+OFFERINGS = [
+    offering("CPSC 1010 - Computer Science I", ("MWF", "8:00 AM - 8:50 AM")),
+    offering("CPSC 1020 - Computer Science II", ("MWF", "9:05 AM - 9:55 AM")),
+    offering(
+        "MATH 1060 - Calculus I",
+        ("MWF", "8:00 AM - 8:50 AM"),
+        ("TTh", "10:30 AM - 11:45 AM"),
+    ),
+    offering("ENGL 1030 - Composition", ("TTh", "8:00 AM - 9:15 AM")),
+    offering("HIST 1010 - History", ("TTh", "1:30 PM - 2:45 PM")),
+]
+
+
+def solve(student, **kwargs):
+    return solve_schedule(
+        student, offerings=OFFERINGS, course_structure=STRUCTURE, **kwargs
+    )
+
+
+def assert_conflict_free(schedule):
+    busy = 0
+    for course in schedule["courses"]:
+        mask = section_mask(course["day_type"], course["time_slot"])
+        assert not busy & mask, course
+        busy |= mask
+
+
+def test_schedule_is_conflict_free_and_in_credit_window():
+    schedule = solve({"completed_courses": []}, min_credits=12, max_credits=14)
+
+    assert 12 <= schedule["total_credits"] <= 14
+    assert schedule["total_credits"] == sum(c["credits"] for c in schedule["courses"])
+    assert_conflict_free(schedule)
+
+
+def test_conflicting_section_is_avoided():
+    schedule = solve({"completed_courses": []}, min_credits=11, max_credits=11)
+
+    by_course = {c["course"][:9]: c for c in schedule["courses"]}
+    assert "CPSC 1010" in by_course
+    assert by_course["MATH 1060"]["day_type"] == "TTh"
+
+
+def test_unmet_prerequisite_is_excluded():
+    schedule = solve({"completed_courses": []}, min_credits=18, max_credits=18)
+
+    assert all(not c["course"].startswith("CPSC 1020") for c in schedule["courses"])
+
+
+def test_completed_courses_are_excluded_and_unlock_dependents():
+    schedule = solve({"completed_courses": ["CPSC 1010"]})
+
+    courses = [c["course"][:9] for c in schedule["courses"]]
+    assert "CPSC 1010" not in courses
+    assert "CPSC 1020" in courses
+
+
+def test_time_constraints_filter_sections():
+    schedule = solve(
+        {"completed_courses": [], "time_constraints": "no classes before 10am"}
+    )
+
+    assert {c["course"][:9] for c in schedule["courses"]} == {"MATH 1060", "HIST 1010"}
+
+
+def test_best_partial_schedule_when_window_is_unreachable():
+    schedule = solve({"completed_courses": []}, min_credits=40, max_credits=40)
+
+    assert schedule["total_credits"] == 14
+    assert_conflict_free(schedule)
+
+
+def test_no_candidates_returns_none():
+    completed = ["CPSC 1010", "CPSC 1020", "MATH 1060", "ENGL 1030", "HIST 1010"]
+
+    assert solve({"completed_courses": completed}) is None
+
+
+def test_long_candidate_list_does_not_recurse():
+    count = 3000
+    structure = {
+        "major": {
+            "freshman_year": [
+                {"course": f"ELEC {1000 + i} - Elective", "credits": 1}
+                for i in range(count)
+            ]
+        }
+    }
+    offerings = [
+        offering(f"ELEC {1000 + i} - Elective", ("MWF", "8:00 AM - 8:50 AM"))
+        for i in range(count)
+    ]
+
+    # Every section overlaps, so the search has to walk the whole list
+    schedule = solve_schedule(
+        {"completed_courses": []},
+        offerings=offerings,
+        course_structure=structure,
+        min_credits=2,
+        max_nodes=10 * count,
+    )
+
+    assert schedule["total_credits"] == 1
+
+
+def test_format_schedule():
+    schedule = solve({"completed_courses": []})
+
+    lines = format_schedule(schedule)
+    assert len(lines) == len(schedule["courses"])
+    assert all(" | " in line for line in lines)
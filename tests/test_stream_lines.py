@@ -0,0 +1,117 @@
+"""Tests for turning streamed model text into recommendation lines."""
+
+import pytest
+
+from src import utils
+
+COURSES = {
+    "CPSC 2120": {
+        "course": "CPSC 2120 - Algorithms",
+        "sections": [
+            {"section_id": 1, "day_type": "MWF", "time_slot": "10:10 AM - 11:00 AM"}
+        ],
+    },
+    "MATH 2060": {
+        "course": "MATH 2060 - Calculus III",
+        "sections": [
+            {"section_id": 1, "day_type": "TTh", "time_slot": "8:00 AM - 9:15 AM"}
+        ],
+    },
+    "ENGL 3140": {
+        "course": "ENGL 3140 - Technical Writing",
+        "sections": [
+            {"section_id": 1, "day_type": "TTh", "time_slot": "1:30 PM - 2:45 PM"}
+        ],
+    },
+}
+
+
+@pytest.fixture
+def fallback(monkeypatch):
+    calls = []
+    monkeypatch.setattr(utils, "known_courses", lambda: COURSES)
+
+    def fake_create_list(text, deadline=None):
+        calls.append(text)
+        return ["formatted by model"]
+
+    monkeypatch.setattr(utils, "create_list", fake_create_list)
+    return calls
+
+
+def chunked(text, size=7):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def test_verified_lines_stream_before_the_text_ends(fallback):
+    received = []
+
+    def chunks():
+        for chunk in chunked("Schedule:\nCPSC 2120 MWF 10:10 AM - 11:00 AM\n"):
+            received.append(chunk)
+            yield chunk
+        received.append("END")
+        yield "MATH 2060 TTh 8:00 AM - 9:15 AM"
+
+    lines = utils.stream_recommendation_lines(chunks())
+    first = next(lines)
+
+    assert first.startswith("CPSC 2120")
+    assert "END" not in received
+    assert list(lines) == ["MATH 2060 - Calculus III | TTh 8:00 AM - 9:15 AM"]
+    assert fallback == []
+
+
+def test_details_on_following_lines_belong_to_the_course(fallback):
+    text = "1. CPSC 2120 - Algorithms\n   MWF 10:10 AM - 11:00 AM\n"
+
+    assert list(utils.stream_recommendation_lines(chunked(text))) == [
+        "CPSC 2120 - Algorithms | MWF 10:10 AM - 11:00 AM"
+    ]
+
+
+def test_unverified_lines_are_held_back_below_confidence(fallback):
+    text = (
+        "CPSC 2120 MWF 10:10 AM - 11:00 AM\n"
+        "MATH 2060 MWF 9:05 AM - 9:55 AM\n"
+        "ENGL 3140 MWF 8:00 AM - 8:50 AM\n"
+    )
+
+    lines = list(utils.stream_recommendation_lines(chunked(text)))
+
+    assert lines == ["CPSC 2120 - Algorithms | MWF 10:10 AM - 11:00 AM"]
+
+
+def test_unverified_lines_follow_when_confidence_is_high(fallback):
+    text = (
+        "CPSC 2120 MWF 10:10 AM - 11:00 AM\n"
+        "MATH 2060 TTh 8:00 AM - 9:15 AM\n"
+        "ENGL 3140 MWF 8:00 AM - 8:50 AM"
+    )
+
+    lines = list(utils.stream_recommendation_lines(chunked(text)))
+
+    assert [line[:9] for line in lines] == ["CPSC 2120", "MATH 2060", "ENGL 3140"]
+
+
+def test_unparseable_text_goes_to_create_list(fallback):
+    text = "Take CPSC 2120 and MATH 2060\nsometime next term."
+
+    lines = list(utils.stream_recommendation_lines(chunked(text)))
+
+    assert lines == ["formatted by model"]
+    assert fallback == [text]
+
+
+def test_duplicate_mentions_are_yielded_once(fallback):
+    text = (
+        "CPSC 2120 MWF 10:10 AM - 11:00 AM\n"
+        "Note: CPSC 2120 MWF 10:10 AM - 11:00 AM is required.\n"
+    )
+
+    assert len(list(utils.stream_recommendation_lines(chunked(text)))) == 1
+
+
+def test_empty_stream_yields_nothing(fallback):
+    assert list(utils.stream_recommendation_lines([])) == []
+    assert fallback == []
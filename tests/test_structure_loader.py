@@ -0,0 +1,163 @@
+"""Tests for loading course structure files."""
+
+import builtins
+import os
+import shutil
+
+import pytest
+
+from src import structure_loader
+from src.catalog_walker import walk_catalog
+from src.structure_loader import (
+    FLAT,
+    WRAPPED,
+    _split_repeated,
+    detect_variant,
+    load_structure,
+    normalize_structure,
+    parse_structure_text,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+YEARS = ["first_year", "sophomore_year", "junior_year", "senior_year"]
+
+
+def test_repeated_keys_split_into_one_entry_per_repetition():
+    text = """{"paths": [{"path_name": "A", "courses": [1],
+                          "path_name": "B", "courses": [2]}]}"""
+
+    data = parse_structure_text(text)
+
+    assert _split_repeated(data["paths"]) == [
+        {"path_name": "A", "courses": [1]},
+        {"path_name": "B", "courses": [2]},
+    ]
+
+
+def test_stray_closing_brackets_are_ignored():
+    assert parse_structure_text('{"a": 1}\n}]') == {"a": 1}
+
+
+def read_data_file(name):
+    with open(os.path.join(DATA_DIR, name), encoding="utf-8-sig") as f:
+        return parse_structure_text(f.read())
+
+
+@pytest.mark.parametrize(
+    "name, variant",
+    [
+        ("course_structure.json", FLAT),
+        ("course_structure1.json", WRAPPED),
+        ("course_structure2.json", WRAPPED),
+    ],
+)
+def test_data_files_normalize_to_the_flat_layout(name, variant):
+    raw = read_data_file(name)
+
+    normalized = normalize_structure(raw)
+
+    assert detect_variant(raw) == variant
+    assert detect_variant(normalized) == FLAT
+    assert list(normalized["major_related_classes"]) == YEARS
+    assert list(normalized["general_education"]) == list(raw["general_education"])
+    assert any(record["code"] for record in walk_catalog(normalized))
+
+
+def test_wrapped_paths_keep_their_or_groups():
+    normalized = normalize_structure(read_data_file("course_structure2.json"))
+
+    assert "paths" in normalized["major_related_paths"]
+    path_codes = {
+        record["code"]
+        for record in walk_catalog(normalized)
+        if record["parent"] is not None
+    }
+    assert {"CPSC 1010", "CPSC 1060", "CPSC 3220"} <= path_codes
+
+
+@pytest.fixture
+def structure_file(tmp_path):
+    path = tmp_path / "course_structure1.json"
+    shutil.copy(os.path.join(DATA_DIR, "course_structure1.json"), path)
+    return str(path)
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    calls = []
+    parse = structure_loader.parse_structure_text
+
+    def counting_parse(text):
+        calls.append(text)
+        return parse(text)
+
+    monkeypatch.setattr(structure_loader, "parse_structure_text", counting_parse)
+    return calls
+
+
+def test_unchanged_file_is_served_without_reading_it(
+    tmp_path, monkeypatch, structure_file, parses
+):
+    cache_dir = str(tmp_path / "cache")
+    first = load_structure(structure_file, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    def guarded_open(path, *args, **kwargs):
+        assert str(path) != structure_file, "structure file was read"
+        return builtins.open(path, *args, **kwargs)
+
+    monkeypatch.setattr(structure_loader, "open", guarded_open, raising=False)
+
+    assert load_structure(structure_file, cache_dir=cache_dir) == first
+    assert len(parses) == 1
+
+
+def test_touched_file_is_recognized_by_its_content_hash(
+    tmp_path, structure_file, parses
+):
+    cache_dir = str(tmp_path / "cache")
+    first = load_structure(structure_file, cache_dir=cache_dir)
+    stat = os.stat(structure_file)
+    os.utime(structure_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert load_structure(structure_file, cache_dir=cache_dir) == first
+    assert len(parses) == 1
+
+    # The refreshed entry serves the new modification time directly
+    (entry,) = os.listdir(cache_dir)
+    cached = structure_loader._read_cache(os.path.join(cache_dir, entry))
+    assert cached["mtime_ns"] == stat.st_mtime_ns + 10**9
+
+
+def test_changed_content_is_parsed_again(tmp_path, structure_file, parses):
+    cache_dir = str(tmp_path / "cache")
+    load_structure(structure_file, cache_dir=cache_dir)
+    with open(structure_file, encoding="utf-8-sig") as f:
+        text = f.read()
+    with open(structure_file, "w", encoding="utf-8") as f:
+        f.write(text.replace("CPSC 1010", "CPSC 1011"))
+
+    structure = load_structure(structure_file, cache_dir=cache_dir)
+
+    assert len(parses) == 2
+    codes = {record["code"] for record in walk_catalog(structure)}
+    assert "CPSC 1011" in codes
+    assert "CPSC 1010" not in codes
+
+
+def test_unreadable_cache_is_ignored(tmp_path, structure_file, parses):
+    cache_dir = tmp_path / "cache"
+    first = load_structure(structure_file, cache_dir=str(cache_dir))
+    (entry,) = cache_dir.iterdir()
+    entry.write_bytes(b"not a pickle")
+
+    assert load_structure(structure_file, cache_dir=str(cache_dir)) == first
+    assert len(parses) == 2
+
+
+def test_cache_can_be_disabled(tmp_path, structure_file, parses):
+    load_structure(structure_file, cache_dir=None)
+    load_structure(structure_file, cache_dir=None)
+
+    assert len(parses) == 2
+    assert os.listdir(tmp_path) == ["course_structure1.json"]
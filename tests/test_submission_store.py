@@ -0,0 +1,61 @@
+"""Tests for the SQLite submission store."""
+
+import json
+import sqlite3
+import threading
+
+from src.submission_store import SubmissionStore
+
+
+def test_submission_is_on_disk_when_add_returns(tmp_path):
+    db_path = tmp_path / "submissions.sqlite3"
+    store = SubmissionStore(str(db_path))
+
+    store.add("Ada", "CPSC 1010, MATH 1060")
+
+    with sqlite3.connect(str(db_path)) as conn:
+        rows = conn.execute("SELECT name, classes FROM submissions").fetchall()
+    assert rows == [("Ada", "CPSC 1010, MATH 1060")]
+
+
+def test_latest_and_iteration(tmp_path):
+    store = SubmissionStore(str(tmp_path / "submissions.sqlite3"))
+    store.add("Ada", "CPSC 1010")
+    store.add("Bob", "ENGL 1030")
+    store.add("Ada", "CPSC 1020")
+
+    assert store.latest("Ada") == "CPSC 1020"
+    assert store.latest("Eve") is None
+    assert [s["name"] for s in store.iter_submissions()] == ["Ada", "Bob", "Ada"]
+
+
+def test_concurrent_stores_do_not_lose_submissions(tmp_path):
+    db_path = str(tmp_path / "submissions.sqlite3")
+    stores = [SubmissionStore(db_path) for _ in range(4)]
+
+    def submit(store, worker):
+        for i in range(25):
+            store.add(f"student-{worker}-{i}", "CPSC 1010")
+
+    threads = [
+        threading.Thread(target=submit, args=(store, worker))
+        for worker, store in enumerate(stores)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(list(stores[0].iter_submissions())) == 100
+
+
+def test_json_migration_runs_once(tmp_path):
+    legacy = tmp_path / "submitted_data.json"
+    legacy.write_text(json.dumps({"Classes": {"Ada": "CPSC 1010", "Bob": "MATH"}}))
+    store = SubmissionStore(str(tmp_path / "submissions.sqlite3"))
+
+    assert store.migrate_json(str(legacy)) == 2
+    assert store.migrate_json(str(legacy)) == 0
+    assert SubmissionStore(store.db_path).migrate_json(str(legacy)) == 0
+    assert store.latest("Bob") == "MATH"
+    assert store.migrate_json(str(tmp_path / "missing.json")) == 0
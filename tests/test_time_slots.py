@@ -0,0 +1,84 @@
+"""Tests for compiled section meeting-time bitmasks."""
+
+import pytest
+
+from src.config import MWF_TIME_SLOTS, TTH_TIME_SLOTS
+from src.time_slots import (
+    COMPILED_SLOTS,
+    TICKS_PER_DAY,
+    parse_days,
+    parse_time_range,
+    section_mask,
+    window_mask,
+)
+
+
+def test_parse_days():
+    assert parse_days("MWF") == [0, 2, 4]
+    assert parse_days("TTh") == [1, 3]
+    assert parse_days("ThT") == [1, 3]
+
+
+def test_parse_time_range():
+    assert parse_time_range("10:10 AM - 11:00 AM") == (610, 660)
+    assert parse_time_range("12:20 PM - 1:10 PM") == (740, 790)
+    assert parse_time_range("12:00 AM - 1:00 AM") == (0, 60)
+
+
+@pytest.mark.parametrize("time_slot", ["", "10:10 AM", "11:00 AM - 10:10 AM"])
+def test_parse_time_range_rejects_bad_slots(time_slot):
+    with pytest.raises(ValueError):
+        parse_time_range(time_slot)
+
+
+def test_same_slot_overlaps():
+    mask = section_mask("MWF", "8:00 AM - 8:50 AM")
+    assert mask & section_mask("MWF", "8:00 AM - 8:50 AM")
+
+
+def test_different_days_do_not_overlap():
+    assert not section_mask("MWF", "8:00 AM - 9:15 AM") & section_mask(
+        "TTh", "8:00 AM - 9:15 AM"
+    )
+
+
+def test_partial_overlap_on_shared_day():
+    assert section_mask("MWF", "9:05 AM - 9:55 AM") & section_mask(
+        "MW", "9:30 AM - 10:45 AM"
+    )
+
+
+def test_back_to_back_sections_do_not_overlap():
+    assert not section_mask("MWF", "8:00 AM - 9:00 AM") & section_mask(
+        "MWF", "9:00 AM - 9:50 AM"
+    )
+
+
+def test_mask_covers_one_block_per_meeting_day():
+    mask = section_mask("TTh", "8:00 AM - 9:15 AM")
+    days = [
+        mask >> (day * TICKS_PER_DAY) & ((1 << TICKS_PER_DAY) - 1) for day in range(5)
+    ]
+
+    assert [bool(d) for d in days] == [False, True, False, True, False]
+    assert days[1] == days[3]
+    assert bin(days[1]).count("1") == 75 // 5
+
+
+def test_window_mask():
+    outside = ~window_mask(10 * 60, 15 * 60)
+
+    assert not section_mask("MWF", "10:10 AM - 11:00 AM") & outside
+    assert section_mask("MWF", "9:05 AM - 9:55 AM") & outside
+    assert section_mask("TTh", "1:30 PM - 2:45 PM") & outside == 0
+    assert section_mask("TTh", "3:00 PM - 4:15 PM") & outside
+    assert window_mask(600, 600) == 0
+
+
+def test_configured_slots_are_precompiled_and_disjoint():
+    assert len(COMPILED_SLOTS) == len(MWF_TIME_SLOTS) + len(TTH_TIME_SLOTS)
+    for day_type, slots in (("MWF", MWF_TIME_SLOTS), ("TTh", TTH_TIME_SLOTS)):
+        masks = [COMPILED_SLOTS[(day_type, slot)] for slot in slots]
+        for i, a in enumerate(masks):
+            for b in masks[i + 1 :]:
+                assert not a & b